@@ -1,5 +1,6 @@
 
 from mobisimbench.benchmarks import DailyMobilityAgent
+from mobisimbench.utils.aoi_table import AoiTable
 from pycityproto.city.person.v2.motion_pb2 import Status
 import random
 import re
@@ -312,7 +313,8 @@ class MyDailyMobilityAgent(DailyMobilityAgent):
                 print(f"[Agent] LLM调用失败：{e}")
 
         if candidate_results:
-            target_id, intention = self.filter_and_select(candidate_results, aoi_dict, x, y, allowed_intentions)
+            aoi_table = AoiTable.from_map(self.environment.map)
+            target_id, intention = self.filter_and_select(candidate_results, aoi_dict, aoi_table, x, y, allowed_intentions)
         else:
             if allowed_intentions:
                 intention = self.sample_intention_with_constraint(allowed_intentions)
@@ -547,7 +549,7 @@ class MyDailyMobilityAgent(DailyMobilityAgent):
                 weights[intentions.index("home activity")] += 2
                 weights[intentions.index("sleep")] += 1
 
-    def filter_and_select(self, candidate_results, aoi_dict, current_x, current_y, allowed_intentions):
+    def filter_and_select(self, candidate_results, aoi_dict, aoi_table, current_x, current_y, allowed_intentions):
         for target_id, intention in candidate_results:
             aoi = aoi_dict.get(target_id)
             if not aoi:
@@ -555,8 +557,8 @@ class MyDailyMobilityAgent(DailyMobilityAgent):
             aoi_type = str(aoi.get("type", "")).lower()
             if not self.is_aoi_suitable_for_intention(aoi_type, intention):
                 continue
-            aoi_pos = aoi.get("center", {"x": 0, "y": 0})
-            dist = self.calc_distance(current_x, current_y, aoi_pos["x"], aoi_pos["y"])
+            aoi_x, aoi_y = aoi_table.xy(target_id)
+            dist = self.calc_distance(current_x, current_y, aoi_x, aoi_y)
             if dist > 5000:
                 continue
             if self.is_in_recent_history(target_id, intention):
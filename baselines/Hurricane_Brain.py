@@ -3,6 +3,7 @@ import random, json, pathlib, math, asyncio, logging, re, textwrap, os
 from typing import List, Dict, Optional, Tuple, Any, Union
 
 from mobisimbench.benchmarks import HurricaneMobilityAgent
+from mobisimbench.utils.aoi_table import AoiTable
 from pycityproto.city.person.v2.motion_pb2 import Status
 
 _LOG = logging.getLogger(__name__)
@@ -175,8 +176,9 @@ class HurricaneMobilitySmartAgent(HurricaneMobilityAgent):
 
     def _init_cache(self):
         self.aois=list(self.environment.get_aoi_ids())
+        self.aoi_table=AoiTable.from_map(self.environment.map)
         for aid in SAFE_AOIS:
-            try:self.safe_xy.append((aid,self.environment.get_aoi_xy(aid)))
+            try:self.safe_xy.append((aid,self.aoi_table.xy(aid)))
             except:pass
 
     async def _cur(self):
@@ -200,10 +202,8 @@ class HurricaneMobilitySmartAgent(HurricaneMobilityAgent):
 
     def _near(self,ref:int)->int:
         try:
-            rx,ry=self.environment.get_aoi_xy(ref); rmax=20_000 if self.car else 5_000
-            cand=[a for a in self.aois if a!=ref and
-                  ((self.environment.get_aoi_xy(a)[0]-rx)**2+
-                   (self.environment.get_aoi_xy(a)[1]-ry)**2)<rmax*rmax]
+            rx,ry=self.aoi_table.xy(ref); rmax=20_000 if self.car else 5_000
+            cand=[a for a in self.aoi_table.within(rx,ry,rmax).tolist() if a!=ref]
             return self.rng.choice(cand) if cand else self.rng.choice(self.aois)
         except:
             prefix=ref//1000
@@ -1,9 +1,28 @@
 """
 Mobisim-Bench Benchmark package
 """
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .runner import BenchmarkRunner
+    from .sweep import SweepRunner
+
+# the runners import agentsociety, which takes seconds; they are imported on first access
+# so that `mbbench --help` and the database commands start fast
+_LAZY_IMPORTS = {
+    "BenchmarkRunner": ".runner",
+    "SweepRunner": ".sweep",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .runner import BenchmarkRunner
 
 __all__ = [
-    "BenchmarkRunner"
-]
\ No newline at end of file
+    "BenchmarkRunner",
+    "SweepRunner",
+]
@@ -0,0 +1,174 @@
+import numpy as np
+
+from mobisimbench.utils.accumulator import StatusAccumulator
+from mobisimbench.utils.aoi_table import AoiTable
+from mobisimbench.utils.status_columns import AgentSlots, StatusColumns
+
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# intentions are sampled every 30 minutes of simulated time, 48 samples from the start of the simulation
+INTENTION_SAMPLE_INTERVAL = 30 * 60
+INTENTION_SAMPLE_TIMES = [i * INTENTION_SAMPLE_INTERVAL for i in range(48)]
+
+INTENTION_MAPPING = {
+    "sleep": 1,
+    "home activity": 2,
+    "other": 3,
+    "work": 4,
+    "shopping": 5,
+    "eating out": 6,
+    "leisure and entertainment": 7,
+}
+
+
+def cal_gyration_radius(trajectory_points):
+    centroid = np.mean(trajectory_points, axis=0)
+    distances = np.sqrt(((trajectory_points - centroid) ** 2).sum(axis=1))
+    gyration_radius = np.mean(distances)
+    return gyration_radius
+
+
+class DailyMobilityAccumulator(StatusAccumulator):
+    """
+    Running counters of the DailyMobility metrics.
+
+    - **Description**:
+        - Keeps, per agent, the intention at each sample time fixed so far, the intention of its last
+          status and the AOIs visited in first-visit order, so memory is O(agents), not O(rows)
+        - The intention of an agent at a sample time is the one of its latest status at or before that
+          time (its first status for sample times before it): a status fixes the sample times between the
+          previous status of the agent and itself, so missing or duplicated rows and any `ticks_per_step`
+          are handled
+        - Sample times are relative to the earliest status of the first `update`; every agent has a status
+          at the first simulation step, so this is the start of the simulation
+        - `result` only touches the per-agent state, agents are reported in order of first appearance
+
+    - **Args**:
+        - `aoi_table` (AoiTable): AOI table of the simulation map
+    """
+
+    def __init__(self, aoi_table: AoiTable):
+        self.aoi_table = aoi_table
+        self._agents = AgentSlots()
+        # simulated time (seconds since day 0) of the first sample
+        self._origin = None
+        # per slot: intention at each sample time, first sample not fixed yet, intention of the last status
+        self._intentions = np.zeros((0, len(INTENTION_SAMPLE_TIMES)), dtype=np.int64)
+        self._next_sample = np.zeros(0, dtype=np.int64)
+        self._last_intention = np.zeros(0, dtype=np.int64)
+        # (slot * len(aoi_table) + aoi row) of visited AOIs, sorted for membership / in visit order
+        self._visit_keys = np.empty(0, dtype=np.int64)
+        self._visits = np.empty(0, dtype=np.int64)
+
+    def _grow(self, num_agents: int):
+        missing = num_agents - len(self._next_sample)
+        if missing > 0:
+            self._intentions = np.concatenate([
+                self._intentions,
+                np.zeros((missing, len(INTENTION_SAMPLE_TIMES)), dtype=np.int64),
+            ])
+            self._next_sample = np.concatenate([self._next_sample, np.zeros(missing, dtype=np.int64)])
+            # 0: no status yet
+            self._last_intention = np.concatenate([self._last_intention, np.zeros(missing, dtype=np.int64)])
+
+    def _sample_intentions(self, slots: np.ndarray, times: np.ndarray, intentions: np.ndarray):
+        """Fix the sample times between consecutive statuses of each agent"""
+        if len(slots) == 0:
+            return
+        if self._origin is None:
+            self._origin = times.min()
+        # rows of each agent together, in arrival (= time) order
+        order = np.argsort(slots, kind="stable")
+        slots, intentions = slots[order], intentions[order]
+        # first sample time at or after each status
+        ends = np.searchsorted(
+            np.asarray(INTENTION_SAMPLE_TIMES, dtype=np.float64), times[order] - self._origin, side="left"
+        )
+        is_first = np.concatenate([[True], slots[1:] != slots[:-1]])
+        # samples from the previous status of the agent up to this one take the previous status' intention;
+        # before the agent's first status they take this one's
+        starts = np.empty_like(ends)
+        starts[1:] = ends[:-1]
+        starts[is_first] = self._next_sample[slots[is_first]]
+        values = np.empty_like(intentions)
+        values[1:] = intentions[:-1]
+        values[is_first] = self._last_intention[slots[is_first]]
+        values = np.where(values == 0, intentions, values)
+        lengths = np.maximum(ends - starts, 0)
+        if lengths.any():
+            row = np.repeat(np.arange(len(slots)), lengths)
+            offsets = np.cumsum(lengths) - lengths
+            sample = starts[row] + np.arange(len(row)) - offsets[row]
+            self._intentions[slots[row], sample] = values[row]
+        is_last = np.concatenate([slots[1:] != slots[:-1], [True]])
+        self._next_sample[slots[is_last]] = np.maximum(self._next_sample[slots[is_last]], ends[is_last])
+        self._last_intention[slots[is_last]] = intentions[is_last]
+
+    def update(self, columns: StatusColumns):
+        try:
+            slots = self._agents.lookup(columns.agent_id)
+            self._grow(len(self._agents))
+
+            # intentions at the sample times passed by these statuses
+            self._sample_intentions(
+                slots,
+                columns.day.astype(np.float64) * SECONDS_PER_DAY + columns.t.astype(np.float64),
+                columns.action_codes(INTENTION_MAPPING, 3),
+            )
+
+            # unique AOIs per agent, in first-visit order
+            aoi_rows = self.aoi_table.rows(columns.parent_id)
+            in_aoi = np.flatnonzero(aoi_rows >= 0)
+            keys = slots[in_aoi] * len(self.aoi_table) + aoi_rows[in_aoi]
+            keys, first_visit = np.unique(keys, return_index=True)
+            is_new = ~np.isin(keys, self._visit_keys, assume_unique=True)
+            if is_new.any():
+                new_keys = keys[is_new][np.argsort(first_visit[is_new], kind="stable")]
+                self._visits = np.concatenate([self._visits, new_keys])
+                self._visit_keys = np.union1d(self._visit_keys, new_keys)
+        except Exception as e:
+            print(f"Error gathering data: {e}")
+            raise
+
+    def result(self) -> dict:
+        try:
+            num_agents = len(self._agents)
+            agent_ids = self._agents.ids
+
+            # group visits by agent, keeping the first-visit order within each agent
+            num_aois = max(len(self.aoi_table), 1)
+            visit_slots = self._visits // num_aois
+            order = np.argsort(visit_slots, kind="stable")
+            location_rows = (self._visits % num_aois)[order]
+            points = np.column_stack([self.aoi_table.cx[location_rows], self.aoi_table.cy[location_rows]])
+            daily_location_numbers = np.bincount(visit_slots, minlength=num_agents)
+            location_offsets = np.zeros(num_agents + 1, dtype=np.int64)
+            np.cumsum(daily_location_numbers, out=location_offsets[1:])
+
+            gyration_radius = []
+            for i in range(num_agents):
+                if daily_location_numbers[i] == 0:
+                    raise ValueError(f"agent {agent_ids[i]} has not visited any AOI")
+                gyration_radius.append(cal_gyration_radius(points[location_offsets[i]:location_offsets[i + 1]]))
+
+            # samples after the last status of an agent take its intention
+            pending = np.arange(len(INTENTION_SAMPLE_TIMES))[None, :] >= self._next_sample[:, None]
+            intention_sequences = np.where(pending, self._last_intention[:, None], self._intentions)
+            num_intentions = len(INTENTION_MAPPING)
+            proportion_counts = np.bincount(
+                (np.arange(num_agents)[:, None] * num_intentions + intention_sequences - 1).reshape(-1),
+                minlength=num_agents * num_intentions,
+            ).reshape(num_agents, num_intentions)
+            # normalize
+            intention_proportions = proportion_counts / len(INTENTION_SAMPLE_TIMES)
+        except Exception as e:
+            print(f"Error gathering results: {e}")
+            raise
+
+        return {
+            "daily_location_numbers": daily_location_numbers.tolist(),
+            "gyration_radius": gyration_radius,
+            "intention_sequences": intention_sequences.tolist(),
+            "intention_proportions": intention_proportions.tolist()
+        }
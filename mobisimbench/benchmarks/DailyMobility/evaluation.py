@@ -1,36 +1,77 @@
 import numpy as np
-from typing import Any, Dict
+from typing import Any, Dict, List
 from scipy.spatial.distance import jensenshannon
 
+from mobisimbench.utils.groundtruth import GROUNDTRUTH_REGISTRY
+from mobisimbench.utils.histogram import FixedBinHistogram, jensenshannon_batch
+from mobisimbench.utils.stats import bootstrap_multiplicities
+
+
+GROUNDTRUTH_FILES = {
+    "gyration_radius": "groundtruth/gyration_radius.npy",
+    "daily_location_numbers": "groundtruth/daily_location_numbers.npy",
+    "intention_sequences": "groundtruth/daily_intentions_2d.npy",
+    "intention_proportions": "groundtruth/intention_proportions_2d.npy",
+}
+
+HISTOGRAM_BINS = 50
+
+# Fixed histogram ranges, metrics not listed here use the ground truth's min / max
+HISTOGRAM_RANGES = {
+    "intention_proportions": (0.0, 1.0),
+}
+
+def _derive_groundtruth(groundtruth: Dict[str, Any]) -> Dict[str, Any]:
+    """Fix the histogram of every metric once, generated results are binned against the same edges"""
+    return {
+        "histograms": {
+            name: FixedBinHistogram.from_reference(
+                groundtruth[name], bins=HISTOGRAM_BINS, range=HISTOGRAM_RANGES.get(name)
+            )
+            for name in GROUNDTRUTH_FILES
+        },
+    }
+
+def load_groundtruth(datasets_path: str) -> Dict[str, Any]:
+    """
+    Load the ground truth arrays through the process-wide registry
+    
+    Args:
+        datasets_path (str): Path to datasets directory
+        
+    Returns:
+        Dict[str, Any]: Read-only memory-mapped ground truth arrays, and their histograms under
+        `derived`, shared by all evaluations in this process and reloaded only when a file changes
+    """
+    return GROUNDTRUTH_REGISTRY.get("DailyMobility", str(datasets_path), GROUNDTRUTH_FILES, derive=_derive_groundtruth)
+
 def calculate_jsd_1d(data1, data2, bins=50):
     """
     Calculate JSD between two 1D arrays (e.g., gyration radius, location numbers)
     
     Args:
-        data1 (np.array): First 1D array
+        data1 (np.array): First 1D array, its range fixes the bin edges of both histograms
         data2 (np.array): Second 1D array  
         bins (int): Number of bins for histogram calculation
         
     Returns:
         float: JSD value between the two distributions
     """
-    # Create histograms
-    hist1, bin_edges = np.histogram(data1, bins=bins, density=True)
-    hist2, _ = np.histogram(data2, bins=bins, density=True)
-    
-    # Add small epsilon to avoid zero probabilities
-    epsilon = 1e-10
-    hist1 = hist1 + epsilon
-    hist2 = hist2 + epsilon
-    
-    # Normalize to sum to 1
-    hist1 = hist1 / np.sum(hist1)
-    hist2 = hist2 / np.sum(hist2)
+    return calculate_jsd_histogram(FixedBinHistogram.from_reference(data1, bins=bins), data2)
+
+def calculate_jsd_histogram(histogram: FixedBinHistogram, data):
+    """
+    Calculate JSD between a precomputed ground truth histogram and generated data
     
+    Args:
+        histogram (FixedBinHistogram): Ground truth histogram with canonical bin edges
+        data (np.array): Generated data, flattened and binned against the same edges
+        
+    Returns:
+        float: JSD value between the two distributions
+    """
     # Calculate JSD using scipy
-    jsd = jensenshannon(hist1, hist2)
-    
-    return jsd
+    return jensenshannon(histogram.reference, histogram.probabilities(data))
 
 def calculate_jsd_2d(data1, data2):
     """
@@ -53,38 +94,72 @@ def calculate_jsd_2d(data1, data2):
     
     return jsd
 
+def batch_evaluation(to_evaluate: List[Any], datasets_path: str) -> Dict[str, np.ndarray]:
+    """
+    Score many generated result sets at once
+    
+    Each metric of the R result sets is binned into one (R, bins) histogram matrix against the
+    ground truth edges, and all JSDs are computed in one vectorized call.
+    
+    Args:
+        to_evaluate (List[Any]): R generated result sets, as passed to `evaluation`
+        datasets_path (str): Path to datasets directory
+        
+    Returns:
+        Dict[str, np.ndarray]: The four JSDs and the final score, each of length R
+    """
+    histograms = load_groundtruth(datasets_path)["derived"]["histograms"]
+    scores = {}
+    for name, histogram in histograms.items():
+        # 2D arrays are flattened into one distribution per result set
+        probabilities = histogram.probabilities_batch([np.asarray(results[name]) for results in to_evaluate])
+        scores[f"jsd_{name}"] = jensenshannon_batch(histogram.reference, probabilities)
+    scores["final_score"] = (1 - sum(scores.values()) / len(histograms)) * 100
+    return scores
+
+def bootstrap_evaluation(to_evaluate: Any, datasets_path: str, n_bootstrap: int = 1000, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Score bootstrap resamples of the agents of one generated result set
+    
+    Every metric is binned once per agent; the histogram of each resample is then the
+    multiplicity-weighted sum of the agent histograms (one matrix product per metric).
+    
+    Args:
+        to_evaluate (Any): Generated result set, as passed to `evaluation`, one row per agent
+        datasets_path (str): Path to datasets directory
+        n_bootstrap (int): Number of resamples
+        seed (int): Seed of the resampling generator
+        
+    Returns:
+        Dict[str, np.ndarray]: The four JSDs and the final score of each resample, each of length n_bootstrap
+    """
+    histograms = load_groundtruth(datasets_path)["derived"]["histograms"]
+    agent_counts = {name: histogram.counts_by_row(to_evaluate[name]) for name, histogram in histograms.items()}
+    num_agents = {len(counts) for counts in agent_counts.values()}
+    if len(num_agents) != 1:
+        raise ValueError(f"Result metrics have different numbers of agents: {sorted(num_agents)}")
+    multiplicities = bootstrap_multiplicities(num_agents.pop(), n_bootstrap=n_bootstrap, seed=seed)
+    scores = {}
+    for name, histogram in histograms.items():
+        probabilities = histogram.probabilities_from_counts(multiplicities @ agent_counts[name])
+        scores[f"jsd_{name}"] = jensenshannon_batch(histogram.reference, probabilities)
+    scores["final_score"] = (1 - sum(scores.values()) / len(histograms)) * 100
+    return scores
+
 async def evaluation(to_evaluate: Any, datasets_path: str, metadata: Dict):
     if metadata['mode'] == 'test':
         raise NotImplementedError("Test mode is not supported for DailyMobility")
     
-    # read ground truth
-    real_gyration_radius = np.load(f"{datasets_path}/groundtruth/gyration_radius.npy")
-    real_daily_location_numbers = np.load(f"{datasets_path}/groundtruth/daily_location_numbers.npy")
-    real_intention_sequences = np.load(f"{datasets_path}/groundtruth/daily_intentions_2d.npy")
-    real_intention_proportions = np.load(f"{datasets_path}/groundtruth/intention_proportions_2d.npy")
-
-    # generated results
-    gen_gyration_radius = np.array(to_evaluate["gyration_radius"])
-    gen_daily_location_numbers = np.array(to_evaluate["daily_location_numbers"])
-    gen_intention_sequences = np.array(to_evaluate["intention_sequences"])
-    gen_intention_proportions = np.array(to_evaluate["intention_proportions"])
-
-    # calculate metrics - JSD divergence
-    jsd_gyration = calculate_jsd_1d(real_gyration_radius, gen_gyration_radius)
-    jsd_locations = calculate_jsd_1d(real_daily_location_numbers, gen_daily_location_numbers)
-    jsd_sequences = calculate_jsd_2d(real_intention_sequences, gen_intention_sequences)
-    jsd_proportions = calculate_jsd_2d(real_intention_proportions, gen_intention_proportions)
-
-    # calculate final score
-    final_score = ((1-jsd_gyration + 1-jsd_locations + 1-jsd_sequences + 1-jsd_proportions) / 4) * 100
+    # calculate metrics - JSD divergence against the ground truth histograms (2D arrays are flattened)
+    scores = batch_evaluation([to_evaluate], datasets_path)
     
     # Return evaluation results
     results = {
-        "jsd_gyration_radius": jsd_gyration,
-        "jsd_daily_location_numbers": jsd_locations,
-        "jsd_intention_sequences": jsd_sequences,
-        "jsd_intention_proportions": jsd_proportions,
-        "final_score": final_score
+        "jsd_gyration_radius": float(scores["jsd_gyration_radius"][0]),
+        "jsd_daily_location_numbers": float(scores["jsd_daily_location_numbers"][0]),
+        "jsd_intention_sequences": float(scores["jsd_intention_sequences"][0]),
+        "jsd_intention_proportions": float(scores["jsd_intention_proportions"][0]),
+        "final_score": float(scores["final_score"][0])
     }
     
     return results
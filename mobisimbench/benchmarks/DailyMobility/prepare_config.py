@@ -1,8 +1,12 @@
 from pathlib import Path
 from agentsociety.agent import CitizenAgentBase
 from agentsociety.configs import Config, AgentsConfig, AgentConfig, MapConfig, ExpConfig, WorkflowStepConfig, EnvironmentConfig, WorkflowType
+from mobisimbench.utils.accumulator import StatusAccumulatorHook
 from mobisimbench.utils.agent_loader import load_agent_class
+from mobisimbench.utils.aoi_table import AoiTable
 from mobisimbench.cli import BenchmarkConfig
+from . import DAILY_MOBILITY_CONFIG
+from .accumulator import DailyMobilityAccumulator
 
 def prepare_config(benchmark_config: BenchmarkConfig, agent_config: AgentConfig, datasets_path: Path, mode: str) -> Config:
     """
@@ -31,17 +35,23 @@ def prepare_config(benchmark_config: BenchmarkConfig, agent_config: AgentConfig,
 
     assert benchmark_config.llm is not None, "LLM is not provided, please provide LLM in the benchmark config"
     
+    map_file_path = str(datasets_path / DAILY_MOBILITY_CONFIG["map_filename"])
+    # accumulate the metrics from each step's statuses while the simulation runs
+    accumulator_hook = StatusAccumulatorHook(
+        lambda simulation: DailyMobilityAccumulator(AoiTable.from_map(simulation.environment.map, map_file_path))
+    )
+
     # Create solver configuration
     simulation_config = Config(
         llm=benchmark_config.llm,
         env=benchmark_config.env,    
         map=MapConfig(
-            file_path=str(datasets_path / "beijing.pb")
+            file_path=map_file_path
         ),
         agents=AgentsConfig(
             citizens=[agent_config],
             supervisor=None,
-            init_funcs=[]
+            init_funcs=[accumulator_hook]
         ),
         exp=ExpConfig(
             name="DailyMobilityGeneration_benchmark",
@@ -1,5 +1,3 @@
-from .template_agent import HurricaneMobilityAgent
-
 # Lazy imports to avoid dependency issues during CLI operations
 def _get_prepare_config():
     """Get prepare_config function when needed"""
@@ -11,6 +9,16 @@ def _get_evaluation():
     from .evaluation import evaluation
     return evaluation
 
+def _get_bootstrap():
+    """Get bootstrap evaluation function when needed"""
+    from .evaluation import bootstrap_evaluation
+    return bootstrap_evaluation
+
+def _get_groundtruth():
+    """Get ground truth loader when needed"""
+    from .evaluation import load_groundtruth
+    return load_groundtruth
+
 def _get_entry():
     """Get entry function when needed"""
     from .entry import entry
@@ -26,13 +34,15 @@ HURRICANE_MOBILITY_CONFIG = {
     "description": "Hurricane mobility benchmark for agent societies",
     "dataset_repo_url": "HIDDEN FOR ANUNYMOUS REQUEST",
     "dataset_branch": "main",
+    "map_filename": "columbia.pb",
     "dependencies": [
         "numpy >= 1.26.4",
     ],
-    "agent_class": HurricaneMobilityAgent,
     "prepare_config_func": _get_prepare_config,
     "entry": _get_entry,
     "evaluation_func": _get_evaluation,
+    "bootstrap_func": _get_bootstrap,
+    "groundtruth_func": _get_groundtruth,
     "template_agent": _get_template_agent,
     "version": "1.0.0",
     "author": "Mobisim Team",
@@ -40,4 +50,10 @@ HURRICANE_MOBILITY_CONFIG = {
     "supported_modes": ["inference"]
 }
 
+def __getattr__(name):
+    # the template agent imports agentsociety, it is loaded on first access so that listing tasks stays fast
+    if name == "HurricaneMobilityAgent":
+        return _get_template_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = ["HURRICANE_MOBILITY_CONFIG", "HurricaneMobilityAgent"]
\ No newline at end of file
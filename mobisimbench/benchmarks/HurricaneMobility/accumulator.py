@@ -0,0 +1,142 @@
+import numpy as np
+
+from mobisimbench.utils.accumulator import StatusAccumulator
+from mobisimbench.utils.aoi_table import AoiTable
+from mobisimbench.utils.status_columns import AgentSlots, StatusColumns
+
+
+HOURS_PER_DAY = 24
+
+
+def _group_starts(groups: np.ndarray) -> np.ndarray:
+    """Mask of the first row of each run of equal groups"""
+    starts = np.ones(len(groups), dtype=bool)
+    starts[1:] = groups[1:] != groups[:-1]
+    return starts
+
+
+def _group_ends(groups: np.ndarray) -> np.ndarray:
+    """Mask of the last row of each run of equal groups"""
+    ends = np.ones(len(groups), dtype=bool)
+    ends[:-1] = groups[1:] != groups[:-1]
+    return ends
+
+
+class HurricaneMobilityAccumulator(StatusAccumulator):
+    """
+    Running counters of the HurricaneMobility trip counts.
+
+    - **Description**:
+        - Each (agent, day) is an independent segment; the last row and the last AOI row of every agent
+          are carried between `update` calls, so a segment may span any number of batches
+        - Trip and hourly departure counts are summed as rows arrive, in total and per agent
+          (the per-agent counts let the evaluation bootstrap over agents)
+
+    - **Args**:
+        - `aoi_table` (AoiTable): AOI table of the simulation map
+        - `num_phases` (int): Number of simulated days (phases) to count
+    """
+
+    def __init__(self, aoi_table: AoiTable, num_phases: int = 3):
+        self.aoi_table = aoi_table
+        self.num_phases = num_phases
+        self.total_travel_times = np.zeros(num_phases, dtype=np.int64)
+        self.hourly_travel_times = np.zeros((num_phases, HOURS_PER_DAY), dtype=np.int64)
+        self._agents = AgentSlots()
+        self._agent_total_travel_times = np.zeros((0, num_phases), dtype=np.int64)
+        self._agent_hourly_travel_times = np.zeros((0, num_phases, HOURS_PER_DAY), dtype=np.int64)
+        # carried state per agent slot, day -1 means no row yet
+        self._last_day = np.zeros(0, dtype=np.int64)
+        self._last_in_aoi = np.zeros(0, dtype=bool)
+        self._last_aoi_day = np.zeros(0, dtype=np.int64)
+        self._last_aoi_parent = np.zeros(0, dtype=np.int64)
+
+    def _grow(self, num_agents: int):
+        missing = num_agents - len(self._last_day)
+        if missing > 0:
+            self._last_day = np.concatenate([self._last_day, np.full(missing, -1, dtype=np.int64)])
+            self._last_in_aoi = np.concatenate([self._last_in_aoi, np.zeros(missing, dtype=bool)])
+            self._last_aoi_day = np.concatenate([self._last_aoi_day, np.full(missing, -1, dtype=np.int64)])
+            self._last_aoi_parent = np.concatenate([self._last_aoi_parent, np.zeros(missing, dtype=np.int64)])
+            self._agent_total_travel_times = np.concatenate([
+                self._agent_total_travel_times, np.zeros((missing, self.num_phases), dtype=np.int64)
+            ])
+            self._agent_hourly_travel_times = np.concatenate([
+                self._agent_hourly_travel_times, np.zeros((missing, self.num_phases, HOURS_PER_DAY), dtype=np.int64)
+            ])
+
+    def update(self, columns: StatusColumns):
+        num_phases = self.num_phases
+        # sort statuses by (agent, day, t) once, dropping days outside the phases
+        try:
+            keep = np.flatnonzero((columns.day >= 0) & (columns.day < num_phases))
+            slots = self._agents.lookup(columns.agent_id[keep])
+            self._grow(len(self._agents))
+            order = np.lexsort((columns.t[keep], columns.day[keep], slots))
+            slots = slots[order]
+            days = columns.day[keep][order]
+            ts = columns.t[keep][order]
+            parent_ids = columns.parent_id[keep][order]
+            in_aoi = self.aoi_table.rows(parent_ids) >= 0
+        except Exception as e:
+            print(f"HurricaneMobility, error gather statuses: {e}")
+            raise e
+
+        try:
+            # previous row of each row: the row before it in the batch, or the carried last row of the agent
+            first_of_agent = _group_starts(slots)
+            prev_day = np.concatenate([[-1], days[:-1]])[:len(days)]
+            prev_in_aoi = np.concatenate([[False], in_aoi[:-1]])[:len(in_aoi)]
+            prev_day[first_of_agent] = self._last_day[slots[first_of_agent]]
+            prev_in_aoi[first_of_agent] = self._last_in_aoi[slots[first_of_agent]]
+
+            # counting total travel times: AOI changes between consecutive AOI rows of a segment
+            aoi_rows = np.flatnonzero(in_aoi)
+            aoi_slots = slots[aoi_rows]
+            aoi_days = days[aoi_rows]
+            aoi_parent_ids = parent_ids[aoi_rows]
+            first_aoi_of_agent = _group_starts(aoi_slots)
+            prev_aoi_day = np.concatenate([[-1], aoi_days[:-1]])[:len(aoi_days)]
+            prev_aoi_parent = np.concatenate([[0], aoi_parent_ids[:-1]])[:len(aoi_parent_ids)]
+            prev_aoi_day[first_aoi_of_agent] = self._last_aoi_day[aoi_slots[first_aoi_of_agent]]
+            prev_aoi_parent[first_aoi_of_agent] = self._last_aoi_parent[aoi_slots[first_aoi_of_agent]]
+            trips = (prev_aoi_day == aoi_days) & (prev_aoi_parent != aoi_parent_ids)
+            num_agents = len(self._agent_total_travel_times)
+            agent_trips = np.bincount(
+                aoi_slots[trips] * num_phases + aoi_days[trips],
+                minlength=num_agents * num_phases,
+            ).reshape(num_agents, num_phases)
+            self._agent_total_travel_times += agent_trips
+            self.total_travel_times += agent_trips.sum(axis=0)
+
+            # counting departures: first non-AOI row after an AOI row of the same segment
+            departures = np.flatnonzero(~in_aoi & prev_in_aoi & (prev_day == days))
+            hours = (ts[departures] // (60 * 60)).astype(np.int64)
+            if hours.size and (hours.min() < 0 or hours.max() >= HOURS_PER_DAY):
+                raise IndexError(f"departure hour out of range [0, {HOURS_PER_DAY})")
+            agent_departures = np.bincount(
+                (slots[departures] * num_phases + days[departures]) * HOURS_PER_DAY + hours,
+                minlength=num_agents * num_phases * HOURS_PER_DAY,
+            ).reshape(num_agents, num_phases, HOURS_PER_DAY)
+            self._agent_hourly_travel_times += agent_departures
+            self.hourly_travel_times += agent_departures.sum(axis=0)
+
+            # carry the last row and the last AOI row of each agent to the next batch
+            last_of_agent = _group_ends(slots)
+            self._last_day[slots[last_of_agent]] = days[last_of_agent]
+            self._last_in_aoi[slots[last_of_agent]] = in_aoi[last_of_agent]
+            last_aoi_of_agent = _group_ends(aoi_slots)
+            self._last_aoi_day[aoi_slots[last_aoi_of_agent]] = aoi_days[last_aoi_of_agent]
+            self._last_aoi_parent[aoi_slots[last_aoi_of_agent]] = aoi_parent_ids[last_aoi_of_agent]
+        except Exception as e:
+            print(f"HurricaneMobility, error gather travel times: {e}")
+            raise e
+
+    def result(self) -> dict:
+        return {
+            "total_travel_times": self.total_travel_times.tolist(),
+            "hourly_travel_times": self.hourly_travel_times.tolist(),
+            # per agent, in order of first appearance
+            "agent_total_travel_times": self._agent_total_travel_times.tolist(),
+            "agent_hourly_travel_times": self._agent_hourly_travel_times.tolist(),
+        }
@@ -1,102 +1,26 @@
 from agentsociety.simulation import AgentSociety
-from agentsociety.environment import MapData
 from agentsociety.configs import Config
+from typing import AsyncIterator
 
-def gather_results(results: list[dict], map: MapData):
-    aois = map.aois
-    aoi_ids = list(aois.keys())
+from mobisimbench.storage.status_reader import StatusReader
+from mobisimbench.utils.accumulator import find_status_accumulator
+from mobisimbench.utils.aoi_table import AoiTable
+from mobisimbench.utils.status_columns import StatusColumns
+from .accumulator import HurricaneMobilityAccumulator
+from .prepare_config import get_num_phases
 
-    pre_hurricane_agent_entries = {}
-    mid_hurricane_agent_entries = {}
-    post_hurricane_agent_entries = {}
-    try:
-        for result in results:
-            agent_id = result["id"]
-            if agent_id not in pre_hurricane_agent_entries:
-                pre_hurricane_agent_entries[agent_id] = []
-            if agent_id not in mid_hurricane_agent_entries:
-                mid_hurricane_agent_entries[agent_id] = []
-            if agent_id not in post_hurricane_agent_entries:
-                post_hurricane_agent_entries[agent_id] = []
-            if result["day"] == 0:
-                pre_hurricane_agent_entries[agent_id].append(result)
-            elif result["day"] == 1:
-                mid_hurricane_agent_entries[agent_id].append(result)
-            elif result["day"] == 2:
-                post_hurricane_agent_entries[agent_id].append(result)
-            else:
-                continue
-    except Exception as e:
-        print(f"HurricaneMobility, error gather statuses: {e}")
-        raise e
-    
-    total_travel_times = [0, 0, 0]
-    hourly_travel_times = [[0 for _ in range(24)] for _ in range(3)]
-    try:
-        for agent_id, entries in pre_hurricane_agent_entries.items():
-            pre_aoi_id = 0
-            pre_id = 0
-            for entry in entries:
-                # counting total travel times
-                if entry["parent_id"] in aoi_ids:
-                    if pre_aoi_id == 0:
-                        pre_aoi_id = entry["parent_id"]
-                    if pre_aoi_id != entry["parent_id"]:
-                        total_travel_times[0] += 1
-                        pre_aoi_id = entry["parent_id"]
-                elif pre_id in aoi_ids:
-                    departure_time = entry["t"]
-                    hour = int(departure_time // (60 * 60))
-                    hourly_travel_times[0][hour] += 1
-                pre_id = entry["parent_id"]
-    except Exception as e:
-        print(f"HurricaneMobility, error gather pre_hurricane_agent_entries: {e}")
-        raise e
-        
-    try:
-        for agent_id, entries in mid_hurricane_agent_entries.items():
-            pre_aoi_id = 0
-            pre_id = 0
-            for entry in entries:
-                if entry["parent_id"] in aoi_ids:
-                    if pre_aoi_id == 0:
-                        pre_aoi_id = entry["parent_id"]
-                    if pre_aoi_id != entry["parent_id"]:
-                        total_travel_times[1] += 1
-                        pre_aoi_id = entry["parent_id"]
-                elif pre_id in aoi_ids:
-                    departure_time = entry["t"]
-                    hour = int(departure_time // (60 * 60))
-                    hourly_travel_times[1][hour] += 1
-                pre_id = entry["parent_id"]
-    except Exception as e:
-        print(f"HurricaneMobility, error gather mid_hurricane_agent_entries: {e}")
-        raise e
-    
-    try:
-        for agent_id, entries in post_hurricane_agent_entries.items():
-            pre_aoi_id = 0
-            pre_id = 0
-            for entry in entries:
-                if entry["parent_id"] in aoi_ids:
-                    if pre_aoi_id == 0:
-                        pre_aoi_id = entry["parent_id"]
-                    if pre_aoi_id != entry["parent_id"]:
-                        total_travel_times[2] += 1
-                        pre_aoi_id = entry["parent_id"]
-                elif pre_id in aoi_ids:
-                    departure_time = entry["t"]
-                    hour = int(departure_time // (60 * 60))
-                    hourly_travel_times[2][hour] += 1
-                pre_id = entry["parent_id"]
-    except Exception as e:
-        print(f"HurricaneMobility, error gather post_hurricane_agent_entries: {e}")
-        raise e
 
-    return {
-        "total_travel_times": total_travel_times,
-        "hourly_travel_times": hourly_travel_times,
-    }
+def gather_results(results: list[dict], aoi_table: AoiTable, num_phases: int = 3):
+    accumulator = HurricaneMobilityAccumulator(aoi_table, num_phases)
+    accumulator.update(StatusColumns.from_records(results))
+    return accumulator.result()
+
+
+async def gather_results_stream(chunks: AsyncIterator[StatusColumns], aoi_table: AoiTable, num_phases: int = 3):
+    accumulator = HurricaneMobilityAccumulator(aoi_table, num_phases)
+    async for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.result()
 
 
 async def entry(config: Config, tenant_id: str):
@@ -111,17 +35,25 @@ async def entry(config: Config, tenant_id: str):
     # ========================    
     # run agentsociety
     # ========================
-    await agentsociety.run()
+    try:
+        await agentsociety.run()
+    except Exception:
+        # stopped by an error or an abort rule, release the simulation before reporting it
+        await agentsociety.close()
+        raise
     # ========================    
     # get results
     # ========================
-    assert agentsociety._database_writer is not None
-    results = await agentsociety._database_writer.read_statuses()
-    # ========================    
-    # gather results
-    # ========================
-    map = agentsociety.environment.map # type: ignore
-    results = gather_results(results, map)
+    accumulator = find_status_accumulator(config)
+    if accumulator is not None:
+        # metrics were accumulated step by step during the run
+        results = accumulator.result()
+    else:
+        assert agentsociety._database_writer is not None
+        reader = StatusReader(agentsociety._database_writer._engine, agentsociety._database_writer.exp_id)
+        map = agentsociety.environment.map # type: ignore
+        aoi_table = AoiTable.from_map(map, config.map.file_path)
+        results = await gather_results_stream(reader.iter_chunks(), aoi_table, get_num_phases(config))
     # ========================    
     # close agentsociety
     # ========================
@@ -1,28 +1,108 @@
-import json
 import numpy as np
 from typing import Any, Dict
+
+from mobisimbench.utils.groundtruth import GROUNDTRUTH_REGISTRY
+from mobisimbench.utils.stats import bootstrap_multiplicities
+
+
+GROUNDTRUTH_FILES = {
+    "hurricane": "groundtruth/hurricane_groundtruth.json",
+}
+
+
+def _derive_groundtruth(groundtruth: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize the real hourly trips once, they are compared against every generated result"""
+    hourly_trips = groundtruth["hurricane"]["hourly_trips"]
+    return {
+        "hourly_trips_normalized": {
+            period: np.asarray(hourly_trips[period], dtype=np.float64) / (np.linalg.norm(hourly_trips[period]) + 1e-8)
+            for period in ("before", "during", "after")
+        },
+    }
+
+
+def load_groundtruth(datasets_path: str) -> Dict[str, Any]:
+    """
+    Load the ground truth through the process-wide registry
     
+    Args:
+        datasets_path (str): Path to datasets directory
+        
+    Returns:
+        Dict[str, Any]: Parsed ground truth under `hurricane` and precomputed values under `derived`,
+        shared by all evaluations in this process (do not modify) and reloaded only when the file changes
+    """
+    return GROUNDTRUTH_REGISTRY.get("HurricaneMobility", str(datasets_path), GROUNDTRUTH_FILES, derive=_derive_groundtruth)
+
+
+def bootstrap_evaluation(to_evaluate: Any, datasets_path: str, n_bootstrap: int = 1000, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Score bootstrap resamples of the agents of one generated result set
+    
+    The trip counts of a resample are the multiplicity-weighted sums of the per-agent counts
+    (`agent_total_travel_times`, `agent_hourly_travel_times`), and the scores of all resamples are
+    computed with the same formulas as `evaluation`, vectorized over resamples.
+    
+    Args:
+        to_evaluate (Any): Generated result set with per-agent trip counts
+        datasets_path (str): Path to datasets directory
+        n_bootstrap (int): Number of resamples
+        seed (int): Seed of the resampling generator
+        
+    Returns:
+        Dict[str, np.ndarray]: Change rate, distribution and final score of each resample, each of length
+        n_bootstrap; resamples without trips before the hurricane have non-finite scores
+    """
+    if "agent_total_travel_times" not in to_evaluate or "agent_hourly_travel_times" not in to_evaluate:
+        raise ValueError("Results do not contain per-agent trip counts, they were generated by an older version")
+    groundtruth = load_groundtruth(datasets_path)
+    agent_totals = np.asarray(to_evaluate["agent_total_travel_times"], dtype=np.float64)
+    agent_hourly = np.asarray(to_evaluate["agent_hourly_travel_times"], dtype=np.float64)
+    multiplicities = bootstrap_multiplicities(len(agent_totals), n_bootstrap=n_bootstrap, seed=seed)
+    totals = multiplicities @ agent_totals[:, :3]
+    hourly = (multiplicities @ agent_hourly[:, :3].reshape(len(agent_hourly), -1)).reshape(n_bootstrap, 3, -1)
+
+    # change rate score
+    real_mid_pre = groundtruth["hurricane"]["relative_changes"]["during_vs_before"]
+    real_post_pre = groundtruth["hurricane"]["relative_changes"]["after_vs_before"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gen_mid_pre = (totals[:, 1] - totals[:, 0]) / totals[:, 0] * 100
+        gen_post_pre = (totals[:, 2] - totals[:, 0]) / totals[:, 0] * 100
+    mape_mid = np.abs(real_mid_pre - gen_mid_pre) / (abs(real_mid_pre) + 1e-8) * 100
+    mape_post = np.abs(real_post_pre - gen_post_pre) / (abs(real_post_pre) + 1e-8) * 100
+    change_rate_score = np.maximum(0, 100 - (mape_mid + mape_post) / 2)
+
+    # distribution score: cosine similarity against the normalized real hourly trips of each period
+    real_normalized = np.stack([groundtruth["derived"]["hourly_trips_normalized"][period] for period in ("before", "during", "after")])
+    gen_normalized = hourly / (np.linalg.norm(hourly, axis=-1, keepdims=True) + 1e-8)
+    similarity = (gen_normalized * real_normalized).sum(axis=-1).mean(axis=-1)
+    distribution_score = np.maximum(0, similarity * 100)
+
+    return {
+        "change_rate_score": change_rate_score,
+        "distribution_score": distribution_score,
+        "final_score": change_rate_score * 0.6 + distribution_score * 0.4,
+    }
+
 
 async def evaluation(to_evaluate: Any, datasets_path: str, metadata: Dict):
     if metadata['mode'] == 'test':
         raise NotImplementedError("Test mode is not supported for HurricaneMobility")
     
     # load ground truth
-    with open(f"{datasets_path}/groundtruth/hurricane_groundtruth.json", "r") as f:
-        groundtruth = json.load(f)
+    groundtruth = load_groundtruth(datasets_path)
 
     # Ground truth change rate
-    real_mid_pre = groundtruth["relative_changes"]["during_vs_before"]
-    real_post_pre = groundtruth["relative_changes"]["after_vs_before"]
-    # Ground truth hourly travel
-    real_hourly_trips_pre = groundtruth["hourly_trips"]["before"]
-    real_hourly_trips_mid = groundtruth["hourly_trips"]["during"]
-    real_hourly_trips_post = groundtruth["hourly_trips"]["after"]
+    real_mid_pre = groundtruth["hurricane"]["relative_changes"]["during_vs_before"]
+    real_post_pre = groundtruth["hurricane"]["relative_changes"]["after_vs_before"]
+    # Ground truth hourly travel, already normalized
+    real_hourly_trips_pre = groundtruth["derived"]["hourly_trips_normalized"]["before"]
+    real_hourly_trips_mid = groundtruth["derived"]["hourly_trips_normalized"]["during"]
+    real_hourly_trips_post = groundtruth["derived"]["hourly_trips_normalized"]["after"]
 
     # Generated data
-    gen_pre = to_evaluate["total_travel_times"][0]
-    gen_mid = to_evaluate["total_travel_times"][1]
-    gen_post = to_evaluate["total_travel_times"][2]
+    # results may be memory-mapped arrays, the counts are cast back to ints
+    gen_pre, gen_mid, gen_post = (int(count) for count in to_evaluate["total_travel_times"][:3])
     gen_mid_pre = (gen_mid-gen_pre)/gen_pre*100
     gen_post_pre = (gen_post-gen_pre)/gen_pre*100
     gen_hourly_trips_pre = to_evaluate["hourly_travel_times"][0]
@@ -77,10 +157,9 @@ async def evaluation(to_evaluate: Any, datasets_path: str, metadata: Dict):
     """
     def calculate_distribution_score(real_hourly_trips_pre, real_hourly_trips_mid, real_hourly_trips_post,
                                    gen_hourly_trips_pre, gen_hourly_trips_mid, gen_hourly_trips_post):
-        def cosine_similarity(a, b):
-            # Normalize vectors to focus on pattern rather than magnitude
-            a_norm = np.array(a) / (np.linalg.norm(a) + 1e-8)
-            b_norm = np.array(b) / (np.linalg.norm(b) + 1e-8)
+        def cosine_similarity(a_norm, b):
+            # Normalize vectors to focus on pattern rather than magnitude (the real ones are pre-normalized)
+            b_norm = np.asarray(b) / (np.linalg.norm(b) + 1e-8)
             return np.dot(a_norm, b_norm)
         
         # Calculate cosine similarity for each time period
@@ -118,8 +197,8 @@ async def evaluation(to_evaluate: Any, datasets_path: str, metadata: Dict):
     final_score = change_rate_score * 0.6 + distribution_score * 0.4
 
     return {
-        "total_travel_times": to_evaluate["total_travel_times"],
-        "hourly_travel_times": to_evaluate["hourly_travel_times"],
+        "total_travel_times": np.asarray(to_evaluate["total_travel_times"]).tolist(),
+        "hourly_travel_times": np.asarray(to_evaluate["hourly_travel_times"]).tolist(),
         "change_rate_score": change_rate_score,
         "distribution_score": distribution_score,
         "final_score": final_score,
@@ -1,8 +1,13 @@
+import math
 from pathlib import Path
 from agentsociety.agent import CitizenAgentBase
 from agentsociety.configs import Config, AgentsConfig, AgentConfig, MapConfig, ExpConfig, WorkflowStepConfig, EnvironmentConfig, WorkflowType
+from mobisimbench.utils.accumulator import StatusAccumulatorHook
 from mobisimbench.utils.agent_loader import load_agent_class
+from mobisimbench.utils.aoi_table import AoiTable
 from mobisimbench.cli import BenchmarkConfig
+from . import HURRICANE_MOBILITY_CONFIG
+from .accumulator import HurricaneMobilityAccumulator
 
 def prepare_config(benchmark_config: BenchmarkConfig, agent_config: AgentConfig, datasets_path: Path, mode: str) -> Config:
     """
@@ -31,12 +36,14 @@ def prepare_config(benchmark_config: BenchmarkConfig, agent_config: AgentConfig,
 
     assert benchmark_config.llm is not None, "LLM is not provided, please provide LLM in the benchmark config"
     
+    map_file_path = str(datasets_path / HURRICANE_MOBILITY_CONFIG["map_filename"])
+
     # Create solver configuration
     simulation_config = Config(
         llm=benchmark_config.llm,
         env=benchmark_config.env,    
         map=MapConfig(
-            file_path=str(datasets_path / "columbia.pb")
+            file_path=map_file_path
         ),
         agents=AgentsConfig(
             citizens=[agent_config],
@@ -78,5 +85,25 @@ def prepare_config(benchmark_config: BenchmarkConfig, agent_config: AgentConfig,
         ),
         logging_level="INFO",
     )
+
+    # accumulate the trip counts from each step's statuses while the simulation runs
+    num_phases = get_num_phases(simulation_config)
+    simulation_config.agents.init_funcs.append(StatusAccumulatorHook(
+        lambda simulation: HurricaneMobilityAccumulator(
+            AoiTable.from_map(simulation.environment.map, map_file_path), num_phases
+        )
+    ))
+    
+    return simulation_config
+
+def get_num_phases(config: Config) -> int:
+    """
+    Get the number of simulated days (phases) covered by the workflow
     
-    return simulation_config
\ No newline at end of file
+    Args:
+        config (Config): Prepared simulation configuration
+    Returns:
+        int: Number of phases, one per simulated day of the RUN steps
+    """
+    days = sum(step.days for step in config.exp.workflow if step.type == WorkflowType.RUN)
+    return math.ceil(days)
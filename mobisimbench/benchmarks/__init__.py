@@ -1,8 +1,8 @@
 """
 Benchmarks module containing task configurations
 """
-from .DailyMobility import DAILY_MOBILITY_CONFIG, DailyMobilityAgent
-from .HurricaneMobility import HURRICANE_MOBILITY_CONFIG, HurricaneMobilityAgent
+from .DailyMobility import DAILY_MOBILITY_CONFIG
+from .HurricaneMobility import HURRICANE_MOBILITY_CONFIG
 
 # Task to config mapping
 TASK_CONFIGS = {
@@ -31,6 +31,13 @@ def get_all_task_configs():
     """
     return TASK_CONFIGS.copy()
 
+def __getattr__(name):
+    # template agents are loaded on first access, see `template_agent` of the task configs
+    for task_config in TASK_CONFIGS.values():
+        if name == f"{task_config['name']}Agent":
+            return task_config["template_agent"]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def list_available_tasks():
     """
     List all available task names
@@ -1,7 +1,25 @@
 """
 CLI module for mobisimbench
 """
+import importlib
+from typing import TYPE_CHECKING
 
-from .config import BenchmarkConfig
+if TYPE_CHECKING:
+    from .config import AbortRule, BenchmarkConfig, BenchmarkDatabaseConfig, BenchmarkEnvConfig
 
-__all__ = ["BenchmarkConfig"]
\ No newline at end of file
+# the configuration models import agentsociety, they are imported on first access
+_LAZY_IMPORTS = {
+    "AbortRule": ".config",
+    "BenchmarkConfig": ".config",
+    "BenchmarkDatabaseConfig": ".config",
+    "BenchmarkEnvConfig": ".config",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["AbortRule", "BenchmarkConfig", "BenchmarkDatabaseConfig", "BenchmarkEnvConfig"]
@@ -1,8 +1,64 @@
 """
 CLI commands module
 """
-from .clone import clone, list_tasks, update_benchmarks
-from .run import run, list_installed
-from .evaluate import evaluate, list_evaluatable_tasks
+import importlib
+import sys
+from typing import TYPE_CHECKING, Dict, Tuple
 
-__all__ = ["clone", "list_tasks", "run", "list_installed", "update_benchmarks", "evaluate", "list_evaluatable_tasks"] 
\ No newline at end of file
+if TYPE_CHECKING:
+    from .clone import clone, list_tasks, update_benchmarks
+    from .run import run, list_installed
+    from .evaluate import evaluate, list_evaluatable_tasks
+    from .sweep import sweep
+    from .leaderboard import leaderboard
+    from .import_results import import_results
+    from .export import export
+    from .retention import compact, rehydrate
+
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    "clone": (".clone", "clone"),
+    "list-tasks": (".clone", "list_tasks"),
+    "update-benchmarks": (".clone", "update_benchmarks"),
+    "run": (".run", "run"),
+    "list-installed": (".run", "list_installed"),
+    "evaluate": (".evaluate", "evaluate"),
+    "list-evaluatable-tasks": (".evaluate", "list_evaluatable_tasks"),
+    "sweep": (".sweep", "sweep"),
+    "leaderboard": (".leaderboard", "leaderboard"),
+    "import-results": (".import_results", "import_results"),
+    "export": (".export", "export"),
+    "compact": (".retention", "compact"),
+    "rehydrate": (".retention", "rehydrate"),
+}
+"""CLI name of each command -> (module, attribute); a command module is imported when its command is used"""
+
+
+def load_command(name: str):
+    """
+    Import a command by its CLI name
+
+    Args:
+        name (str): CLI name of the command, e.g. list-tasks
+
+    Returns:
+        click.Command: The command
+    """
+    module_name, attribute = COMMANDS[name]
+    importlib.import_module(module_name, __name__)
+    # importing a module binds it to the package, hiding the command of the same name (run, sweep, ...);
+    # bind the commands of every loaded module instead, as the eager imports used to
+    for loaded_module_name, loaded_attribute in COMMANDS.values():
+        module = sys.modules.get(f"{__name__}{loaded_module_name}")
+        if module is not None:
+            globals()[loaded_attribute] = getattr(module, loaded_attribute)
+    return globals()[attribute]
+
+
+def __getattr__(name):
+    for cli_name, (_, attribute) in COMMANDS.items():
+        if attribute == name:
+            return load_command(cli_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["clone", "list_tasks", "run", "list_installed", "update_benchmarks", "evaluate", "list_evaluatable_tasks", "sweep", "leaderboard", "import_results", "export", "compact", "rehydrate"]
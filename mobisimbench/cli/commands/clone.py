@@ -1,6 +1,7 @@
 """
 Clone command for downloading benchmark datasets from various sources
 """
+import importlib.util
 import os
 import shutil
 import subprocess
@@ -9,12 +10,9 @@ from typing import Optional
 from pathlib import Path
 
 import click
-from git import Repo
-try:
-    from tqdm import tqdm
-    TQDM_AVAILABLE = True
-except ImportError:
-    TQDM_AVAILABLE = False
+
+# tqdm is imported when a clone starts, not with the CLI
+TQDM_AVAILABLE = importlib.util.find_spec("tqdm") is not None
 
 
 def check_lfc_support() -> bool:
@@ -140,6 +138,8 @@ class CloneProgress:
             
         # Initialize progress bar on first call
         if self.pbar is None and max_count is not None:
+            from tqdm import tqdm
+
             self.pbar = tqdm(
                 total=max_count,
                 desc=f"Cloning {self.repo_url.split('/')[-1]}",
@@ -438,6 +438,8 @@ def download_dataset_from_repo(repo_url: str, output_dir: Path, branch: str = "m
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        from git import Repo
+
         # Initialize progress tracker
         progress = CloneProgress(repo_url)
         
@@ -708,6 +710,8 @@ def update_benchmarks(ctx: click.Context, force: bool, branch: str):
     click.echo("Updating benchmarks from remote repository...")
     
     try:
+        from git import Repo
+
         # Initialize git repository
         repo = Repo(project_root)
         
@@ -2,12 +2,13 @@
 Evaluate command for executing benchmark evaluation independently
 """
 import asyncio
+import glob
+import json
 from pathlib import Path
+from typing import List
 
 import click
 
-from mobisimbench.runner import BenchmarkRunner
-
 from .run import load_benchmark_config
 
 
@@ -44,78 +45,106 @@ def get_task_functions(task_name: str):
 
 def load_results_file(results_path: Path):
     """
-    Load results from file, supports JSON and PKL formats
+    Load results from file, supports the columnar NPZ format and legacy PKL files
     
     Args:
-        results_path (Path): Path to the results file
+        results_path (Path): Path to the results file (.npz, its .json sidecar, or .pkl)
         
     Returns:
-        dict: Results data
+        tuple: (results, metadata)
     """
     if not results_path.exists():
         raise click.BadParameter(f"Results file {results_path} does not exist")
+    from mobisimbench.utils.results_file import load_results
     
     try:
-        import pickle
-        with open(results_path, "rb") as f:
-            data = pickle.load(f)
-            return data["results"], data["metadata"]
+        return load_results(results_path)
     except Exception as e:
-        raise click.BadParameter(f"Failed to parse PKL results file: {e}")
+        raise click.BadParameter(f"Failed to parse results file: {e}")
 
 
-def load_results_from_file_object(file_object):
+def expand_results_files(results: str) -> List[Path]:
     """
-    Load results from file object, supports JSON and PKL formats
+    Expand a results argument into result files
     
-    - **Description**:
-        - Loads results data from a file object (bytes or file-like object)
-        - Supports both JSON and PKL formats
-        - Extracts results and metadata from the file content
+    Args:
+        results (str): A results file, a directory (all *.npz and legacy *.pkl files in it) or a glob pattern
         
+    Returns:
+        List[Path]: Matched result files, sorted
+    """
+    from mobisimbench.utils.results_file import LEGACY_RESULTS_SUFFIX, RESULTS_SUFFIX
+
+    results_path = Path(results)
+    if results_path.is_dir():
+        return sorted(
+            path for suffix in (RESULTS_SUFFIX, LEGACY_RESULTS_SUFFIX) for path in results_path.glob(f"*{suffix}")
+        )
+    if results_path.is_file():
+        return [results_path]
+    matches = {Path(p) for p in glob.glob(results, recursive=True) if Path(p).is_file()}
+    # a pattern like `dir/*` also matches the JSON metadata sidecars of the NPZ files
+    return sorted(p for p in matches if not (p.suffix == ".json" and p.with_suffix(RESULTS_SUFFIX) in matches))
+
+
+def echo_batch_summary(summaries: list):
+    """
+    Print the sorted summary table of a batch evaluation
+    
+    Args:
+        summaries (list): Result of BenchmarkRunner.evaluate_batch
+    """
+    num_failed = sum(1 for summary in summaries if summary["error"])
+    click.echo(f"Evaluated {len(summaries) - num_failed}/{len(summaries)} result files")
+    click.echo(f"{'final_score':>12}  {'llm':<24}  {'exp_id':<36}  results_file")
+    for summary in summaries:
+        score = f"{summary['final_score']:.4f}" if summary["final_score"] is not None else "ERROR"
+        click.echo(f"{score:>12}  {str(summary['llm'])[:24]:<24}  {summary['exp_id']:<36}  {summary['results_file']}")
+        if summary["error"]:
+            click.echo(f"{'':>12}  {summary['error']}")
+        bootstrap = (summary["evaluation_result"] or {}).get("bootstrap", {})
+        if "final_score" in bootstrap.get("metrics", {}):
+            final_score = bootstrap["metrics"]["final_score"]
+            click.echo(f"{'':>12}  {int(round(bootstrap['confidence'] * 100))}% CI [{final_score['ci_low']:.4f}, {final_score['ci_high']:.4f}]")
+
+
+def echo_bootstrap_summary(bootstrap: dict):
+    """
+    Print the bootstrap confidence intervals of an evaluation
+    
+    Args:
+        bootstrap (dict): `bootstrap` entry of an evaluation result
+    """
+    if "error" in bootstrap:
+        click.echo(f"Bootstrap failed: {bootstrap['error']}")
+        return
+    confidence = int(round(bootstrap["confidence"] * 100))
+    click.echo(f"Bootstrap over agents ({bootstrap['n_bootstrap']} resamples, {confidence}% CI):")
+    for name, summary in bootstrap["metrics"].items():
+        click.echo(f"  {name:<28} {summary['mean']:.4f} ± {summary['std']:.4f}  [{summary['ci_low']:.4f}, {summary['ci_high']:.4f}]")
+
+
+def load_results_from_file_object(file_object):
+    """
+    Load results from file object, supports the columnar NPZ format and legacy PKL files
+    
     - **Args**:
         - `file_object` (bytes or file-like): File object containing results data
         
     - **Returns**:
         - `tuple`: (results, metadata) tuple containing the loaded data
     """
+    from mobisimbench.utils.results_file import load_results_from_file_object as _load_results_from_file_object
+
     try:
-        import pickle
-        from pathlib import Path
-        class CrossPlatformUnpickler(pickle.Unpickler):
-            """
-            Custom unpickler that handles cross-platform path objects
-            """
-            def find_class(self, module, name):
-                # Handle WindowsPath objects by converting them to the current platform's Path
-                if module == 'pathlib' and name == 'WindowsPath':
-                    return Path
-                if module == 'pathlib' and name == 'PosixPath':
-                    return Path
-                return super().find_class(module, name)
-        
-        # Handle bytes object
-        if isinstance(file_object, bytes):
-            import io
-            data = CrossPlatformUnpickler(io.BytesIO(file_object)).load()
-        # Handle file-like object
-        elif hasattr(file_object, 'read'):
-            data = CrossPlatformUnpickler(file_object).load()
-        else:
-            raise ValueError("file_object must be bytes or a file-like object")
-        
-        if not isinstance(data, dict) or "results" not in data or "metadata" not in data:
-            raise ValueError("Invalid results file format: missing 'results' or 'metadata' keys")
-        
-        return data["results"], data["metadata"]
-        
+        return _load_results_from_file_object(file_object)
     except Exception as e:
         raise ValueError(f"Failed to parse results file: {e}")
 
 
 @click.command()
 @click.argument("task", type=str)
-@click.argument("results_file", type=click.Path(exists=True, file_okay=True, dir_okay=False))
+@click.argument("results_file", type=str)
 @click.option(
     "--config",
     "-c",
@@ -154,6 +183,21 @@ def load_results_from_file_object(file_object):
     is_flag=True,
     help="Official validation",
 )
+@click.option(
+    "--workers",
+    "-j",
+    required=False,
+    type=click.IntRange(min=1),
+    help="Number of worker processes when evaluating a directory or glob (defaults to the CPU count)",
+)
+@click.option(
+    "--bootstrap",
+    "-b",
+    "n_bootstrap",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Resample agents B times and report confidence intervals of every metric (0 to skip)",
+)
 @click.pass_context
 def evaluate(ctx: click.Context, 
              task: str, 
@@ -163,25 +207,31 @@ def evaluate(ctx: click.Context,
              tenant_id: str,
              config: str,
              official: bool,
-             agent_filename: str):
+             agent_filename: str,
+             workers: int,
+             n_bootstrap: int):
     """
     Evaluate benchmark results independently
     
     TASK: Name of the task to evaluate (e.g, HurricaneMobility)
-    RESULTS_FILE: Path to the results file to evaluate (JSON or PKL format)
+    RESULTS_FILE: Path to the results file to evaluate (NPZ or legacy PKL format),
+    or a directory / glob pattern (quote it) to evaluate many result files in parallel
     
     This command allows you to run the evaluation function for a specific task
     on previously generated results without running the full benchmark pipeline.
     
     Supported file formats:
-    - JSON: Standard JSON format with results data
-    - PKL: Pickle format with results and metadata (from inference mode)
+    - NPZ: Columnar results with a JSON metadata sidecar (from inference mode)
+    - PKL: Legacy pickle format with results and metadata
     
     Database storage:
     - If tenant-id, exp-id, llm, and agent are provided, results will be saved to database
     - If exp-id is not provided, a new UUID will be generated
     - Status will be set to 4 (evaluation-only) to distinguish from run results
     """
+    from mobisimbench.runner import BenchmarkRunner
+    from mobisimbench.storage import ENGINE_POOL
+
     home_dir = ctx.obj["home_dir"]
 
     # Validate config
@@ -202,10 +252,11 @@ def evaluate(ctx: click.Context,
         return
     
     # Validate results file
-    results_path = Path(results_file)
-    if not results_path.exists():
-        click.echo(f"Error: Results file '{results_file}' does not exist")
+    results_files = expand_results_files(results_file)
+    if not results_files:
+        click.echo(f"Error: No results file matches '{results_file}'")
         return
+    results_path = results_files[0]
     
     # Set datasets path
     if datasets:
@@ -237,6 +288,34 @@ def evaluate(ctx: click.Context,
         click.echo(f"Error getting task functions: {e}")
         return
     
+    if len(results_files) > 1 or Path(results_file).is_dir():
+        runner = BenchmarkRunner(config=benchmark_config)
+        click.echo(f"Evaluating {len(results_files)} result files for task: {task}")
+
+        async def run_batch():
+            try:
+                return await runner.evaluate_batch(
+                    tenant_id=tenant_id,
+                    task_name=task,
+                    results_files=results_files,
+                    datasets_path=datasets_path,
+                    official_validated=official,
+                    max_workers=workers,
+                    n_bootstrap=n_bootstrap,
+                )
+            finally:
+                await ENGINE_POOL.dispose()
+
+        summaries = asyncio.run(run_batch())
+        echo_batch_summary(summaries)
+        if output:
+            output_path = Path(output)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "w") as f:
+                json.dump(summaries, f, ensure_ascii=False, indent=2, default=str)
+            click.echo(f"Result saved to: {output_path}")
+        return 0 if summaries and all(not summary["error"] for summary in summaries) else 1
+    
     # Load results from file
     try:
         click.echo(f"Loading results from: {results_path}")
@@ -278,17 +357,23 @@ def evaluate(ctx: click.Context,
                 output_file=output_path,
                 official_validated=official,
                 agent_filename=agent_filename,
-                result_filename=str(results_file)
+                result_filename=str(results_file),
+                n_bootstrap=n_bootstrap,
             )
             
             click.echo("Evaluation completed successfully")
-            return result.get('evaluation_result')
+            evaluation_result = result.get('evaluation_result')
+            if isinstance(evaluation_result, dict) and "bootstrap" in evaluation_result:
+                echo_bootstrap_summary(evaluation_result["bootstrap"])
+            return evaluation_result
             
         except Exception as e:
             click.echo(f"Error during evaluation: {e}")
             import traceback
             click.echo(f"Traceback: {traceback.format_exc()}")
             return None
+        finally:
+            await ENGINE_POOL.dispose()
     
     # Run the evaluation
     result = asyncio.run(run_evaluation())
@@ -0,0 +1,86 @@
+"""
+Export command for writing the tables of a run to Parquet
+"""
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from mobisimbench.storage.constants import EXPERIMENT_TABLE_TYPES
+
+from .run import load_benchmark_config
+
+
+@click.command()
+@click.argument("exp_id", type=str)
+@click.option(
+    "--config",
+    "-c",
+    required=True,
+    help="Path to configuration file with the database settings (required)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option(
+    "--output",
+    "-o",
+    required=False,
+    help="Output directory (defaults to <home_dir>/exports/<exp_id>)",
+    type=click.Path(file_okay=False, dir_okay=True),
+)
+@click.option(
+    "--tables",
+    "-t",
+    multiple=True,
+    type=click.Choice(EXPERIMENT_TABLE_TYPES),
+    help="Table to export, can be repeated (defaults to every table of the run)",
+)
+@click.option(
+    "--rows-per-group",
+    default=100_000,
+    type=click.IntRange(min=1),
+    help="Rows per Parquet row group, also the number of rows fetched at a time",
+)
+def export(exp_id: str, config: str, output: Optional[str], tables: tuple, rows_per_group: int):
+    """
+    Export the tables of a run to Parquet for offline analysis
+
+    EXP_ID: Experiment ID of the run, as listed by 'mbbench leaderboard'
+
+    Tables with a day column (e.g. agent_status) are partitioned by day,
+    e.g. agent_status/day=0/part-00000.parquet, and can be read with
+    pyarrow, pandas or DuckDB without access to the database.
+    """
+    from mobisimbench.storage import ENGINE_POOL, export_experiment
+
+    try:
+        benchmark_config = load_benchmark_config(Path(config))
+    except Exception as e:
+        click.echo(f"Error loading configuration: {e}")
+        return
+    if not benchmark_config.env.db.enabled:
+        click.echo("Error: The database is disabled in the configuration")
+        return
+    home_dir = Path(benchmark_config.env.home_dir) if benchmark_config.env.home_dir else Path.home() / ".mobisim-bench"
+    output_dir = Path(output) if output else home_dir / "exports" / exp_id
+
+    async def run_export():
+        try:
+            pooled = ENGINE_POOL.get(benchmark_config.env.db, home_dir / "sqlite.db")
+            return await export_experiment(
+                pooled.engine, exp_id, output_dir, table_types=list(tables) or None, rows_per_group=rows_per_group
+            )
+        finally:
+            await ENGINE_POOL.dispose()
+
+    try:
+        manifest = asyncio.run(run_export())
+    except ImportError as e:
+        click.echo(f"Error: {e}")
+        return
+    if not manifest["tables"]:
+        click.echo(f"Error: No tables of experiment {exp_id} in the database")
+        return
+    for table_type, table in manifest["tables"].items():
+        click.echo(f"{table_type:<16} {table['rows']:>10} rows  {len(table['files'])} files")
+    click.echo(f"Exported to: {output_dir}")
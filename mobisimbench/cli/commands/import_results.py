@@ -0,0 +1,84 @@
+"""
+Import command for recording past result files in the benchmark database
+"""
+import asyncio
+from pathlib import Path
+
+import click
+
+from .evaluate import expand_results_files
+from .run import load_benchmark_config
+
+
+@click.command(name="import-results")
+@click.argument("results", type=str)
+@click.option(
+    "--config",
+    "-c",
+    required=True,
+    help="Path to configuration file with the database settings (required)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option(
+    "--tenant-id",
+    default="",
+    help="Tenant ID of the imported runs (defaults to the tenant saved in each file)",
+)
+@click.option(
+    "--official",
+    is_flag=True,
+    help="Official validation",
+)
+@click.option(
+    "--workers",
+    "-j",
+    required=False,
+    type=click.IntRange(min=1),
+    help="Number of worker processes decoding the files (defaults to the CPU count)",
+)
+def import_results(results: str, config: str, tenant_id: str, official: bool, workers: int):
+    """
+    Record result files of past runs in the benchmark database
+
+    RESULTS: Directory of result files (NPZ or legacy PKL), a single file,
+    or a glob pattern (quote it, e.g. 'old_runs/**/*_results.pkl')
+
+    The runs are recorded as finished; use 'mbbench evaluate' to score them.
+    Files that were imported before are recognized by their hash and skipped,
+    so the command can be re-run as new files arrive.
+    """
+    from mobisimbench.runner import BenchmarkRunner
+    from mobisimbench.storage import ENGINE_POOL
+
+    try:
+        benchmark_config = load_benchmark_config(Path(config))
+    except Exception as e:
+        click.echo(f"Error loading configuration: {e}")
+        return
+    if not benchmark_config.env.db.enabled:
+        click.echo("Error: The database is disabled in the configuration")
+        return
+
+    results_files = expand_results_files(results)
+    if not results_files:
+        click.echo(f"Error: No results file matches '{results}'")
+        return
+
+    runner = BenchmarkRunner(config=benchmark_config)
+    click.echo(f"Importing {len(results_files)} result files")
+
+    async def run_import():
+        try:
+            return await runner.import_results(
+                results_files=results_files,
+                tenant_id=tenant_id,
+                official_validated=official,
+                max_workers=workers,
+            )
+        finally:
+            await ENGINE_POOL.dispose()
+
+    summary = asyncio.run(run_import())
+    click.echo(f"Imported {summary['imported']}, skipped {summary['skipped']} (already imported), failed {summary['failed']}")
+    for results_file, error in summary["errors"].items():
+        click.echo(f"  {results_file}: {error}")
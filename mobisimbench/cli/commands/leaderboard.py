@@ -0,0 +1,167 @@
+"""
+Leaderboard command for querying the benchmark database
+"""
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from mobisimbench.storage.constants import BenchmarkStatus
+
+from .run import load_benchmark_config
+
+
+def echo_runs(runs: list, metric: Optional[str] = None):
+    """
+    Print a table of runs returned by DatabaseReader
+
+    Args:
+        runs (list): Runs with final score, LLM, agent file, status and creation time
+        metric (Optional[str]): Name of the metric `value` of each run, if listed by metric
+    """
+    metric_header = f"{'value':>16}  " if metric else ""
+    click.echo(f"{metric_header}{'final_score':>12}  {'llm':<24}  {'status':<9}  {'created_at':<19}  {'exp_id':<36}  agent_filename")
+    for run in runs:
+        created_at = run["created_at"].strftime("%Y-%m-%d %H:%M:%S") if run["created_at"] else ""
+        metric_value = f"{run['value']:>16.4f}  " if metric else ""
+        click.echo(
+            f"{metric_value}{run['final_score']:>12.4f}  {str(run['llm'])[:24]:<24}  {run['status']:<9}  {created_at:<19}  "
+            f"{run['id']:<36}  {run['agent_filename']}"
+        )
+
+
+@click.command()
+@click.argument("task", type=str, required=False)
+@click.option(
+    "--config",
+    "-c",
+    required=True,
+    help="Path to configuration file with the database settings (required)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option("--llm", required=False, help="Only runs of this LLM model")
+@click.option(
+    "--top",
+    "-k",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Number of runs per page",
+)
+@click.option(
+    "--offset",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Number of runs to skip, for paging",
+)
+@click.option(
+    "--status",
+    default=BenchmarkStatus.EVALUATED.name,
+    type=click.Choice([status.name for status in BenchmarkStatus], case_sensitive=False),
+    help="Only runs with this status",
+)
+@click.option("--official", is_flag=True, help="Only official validation runs")
+@click.option("--tenant-id", required=False, help="Only runs of this tenant")
+@click.option(
+    "--agent",
+    "agent_filename",
+    required=False,
+    help="Show the score history of this agent file instead of the top runs",
+)
+@click.option("--status-counts", is_flag=True, help="Show the number of runs of each task by status")
+@click.option("--metric", required=False, help="List runs by this evaluation metric instead of the final score, e.g. jsd_gyration_radius")
+@click.option("--min", "min_value", required=False, type=float, help="With --metric, only values >= MIN")
+@click.option("--max", "max_value", required=False, type=float, help="With --metric, only values < MAX")
+@click.option("--desc", is_flag=True, help="With --metric, largest values first")
+@click.option(
+    "--output",
+    "-o",
+    required=False,
+    help="Output file path for saving the rows (JSON format)",
+    type=click.Path(file_okay=True, dir_okay=False),
+)
+def leaderboard(task: Optional[str],
+                config: str,
+                llm: Optional[str],
+                top: int,
+                offset: int,
+                status: str,
+                official: bool,
+                tenant_id: Optional[str],
+                agent_filename: Optional[str],
+                status_counts: bool,
+                metric: Optional[str],
+                min_value: Optional[float],
+                max_value: Optional[float],
+                desc: bool,
+                output: Optional[str]):
+    """
+    Query the benchmark database
+
+    TASK: Name of the task (e.g, DailyMobility), required for the top runs
+
+    Shows the best scored runs of TASK, optionally of one LLM, by default.
+    Use --agent to follow the scores of an agent over time, --status-counts
+    to count the runs of each task by status, and --metric with --min / --max
+    to find runs by an evaluation metric (e.g. jsd_gyration_radius --max 0.2).
+    """
+    from mobisimbench.storage import ENGINE_POOL, DatabaseReader
+
+    try:
+        benchmark_config = load_benchmark_config(Path(config))
+    except Exception as e:
+        click.echo(f"Error loading configuration: {e}")
+        return
+    if not benchmark_config.env.db.enabled:
+        click.echo("Error: The database is disabled in the configuration")
+        return
+    if not status_counts and not agent_filename and not metric and not task:
+        click.echo("Error: Task name is required for the top runs")
+        return
+    home_dir = Path(benchmark_config.env.home_dir) if benchmark_config.env.home_dir else Path.home() / ".mobisim-bench"
+    reader = DatabaseReader(benchmark_config.env.db, str(home_dir))
+    benchmark_status = BenchmarkStatus[status.upper()]
+
+    async def query():
+        try:
+            if status_counts:
+                return await reader.status_counts(task_name=task, tenant_id=tenant_id)
+            if metric:
+                return await reader.runs_by_metric(
+                    metric, task_name=task, min_value=min_value, max_value=max_value, descending=desc, limit=top, offset=offset
+                )
+            if agent_filename:
+                return await reader.score_history(
+                    agent_filename, task_name=task, status=benchmark_status, limit=top, offset=offset
+                )
+            return await reader.top_scores(
+                task,
+                llm=llm,
+                status=benchmark_status,
+                official_validated=True if official else None,
+                tenant_id=tenant_id,
+                limit=top,
+                offset=offset,
+            )
+        finally:
+            await ENGINE_POOL.dispose()
+
+    rows = asyncio.run(query())
+    if status_counts:
+        click.echo(f"{'task':<24}  {'status':<9}  count")
+        for row in rows:
+            click.echo(f"{row['benchmark_name']:<24}  {row['status']:<9}  {row['count']}")
+    else:
+        if metric:
+            click.echo(f"Runs by {metric}")
+        elif agent_filename:
+            click.echo(f"Score history of {agent_filename}")
+        else:
+            click.echo(f"Top runs of {task}" + (f" with {llm}" if llm else ""))
+        echo_runs(rows, metric=metric)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2, default=str)
+        click.echo(f"Rows saved to: {output}")
@@ -0,0 +1,158 @@
+"""
+Retention commands for archiving and restoring the per-experiment tables of runs
+"""
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from mobisimbench.storage.constants import BenchmarkStatus
+
+from .run import load_benchmark_config
+
+
+def _load_archiver(config: str):
+    """
+    Load the configuration and the archiver of its database
+
+    Args:
+        config (str): Path to the configuration file
+
+    Returns:
+        tuple: The benchmark configuration and the archiver, (None, None) after printing the error
+    """
+    from mobisimbench.storage import ExperimentArchiver
+
+    try:
+        benchmark_config = load_benchmark_config(Path(config))
+    except Exception as e:
+        click.echo(f"Error loading configuration: {e}")
+        return None, None
+    if not benchmark_config.env.db.enabled:
+        click.echo("Error: The database is disabled in the configuration")
+        return None, None
+    home_dir = Path(benchmark_config.env.home_dir) if benchmark_config.env.home_dir else Path.home() / ".mobisim-bench"
+    return benchmark_config, ExperimentArchiver(benchmark_config.env.db, str(home_dir))
+
+
+@click.command()
+@click.option(
+    "--config",
+    "-c",
+    required=True,
+    help="Path to configuration file with the database settings and the retention policy (required)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option("--older-than-days", required=False, type=click.FloatRange(min=0), help="Archive runs older than this (overrides the config)")
+@click.option(
+    "--status",
+    "statuses",
+    multiple=True,
+    type=click.Choice([status.name for status in BenchmarkStatus], case_sensitive=False),
+    help="Archive runs with this status, can be repeated (overrides the config)",
+)
+@click.option("--keep-per-agent", required=False, type=click.IntRange(min=0), help="Keep the tables of the N most recent runs of each agent file and tenant (overrides the config)")
+@click.option("--archive-dir", required=False, type=click.Path(file_okay=False, dir_okay=True), help="Directory of the archives (overrides the config)")
+@click.option("--tenant-id", required=False, help="Only runs of this tenant")
+@click.option("--no-vacuum", is_flag=True, help="Do not run VACUUM / ANALYZE after dropping tables")
+@click.option("--dry-run", is_flag=True, help="Only list the runs that would be archived")
+def compact(config: str,
+            older_than_days: Optional[float],
+            statuses: tuple,
+            keep_per_agent: Optional[int],
+            archive_dir: Optional[str],
+            tenant_id: Optional[str],
+            no_vacuum: bool,
+            dry_run: bool):
+    """
+    Archive the per-experiment tables of old runs and compact the database
+
+    Runs selected by the retention policy (the 'retention' section of the
+    configuration, or the options) have their tables (statuses, dialogs,
+    surveys, ...) written to compressed Parquet and dropped. The benchmark
+    rows are kept and point to the archive; use 'mbbench rehydrate' to load
+    a run's tables back. At least one of --older-than-days and
+    --keep-per-agent (or their configuration settings) is required.
+    """
+    from mobisimbench.storage import ENGINE_POOL
+
+    benchmark_config, archiver = _load_archiver(config)
+    if archiver is None:
+        return
+    updates = {}
+    if older_than_days is not None:
+        updates["older_than_days"] = older_than_days
+    if statuses:
+        updates["statuses"] = [BenchmarkStatus[status.upper()] for status in statuses]
+    if keep_per_agent is not None:
+        updates["keep_per_agent"] = keep_per_agent
+    if archive_dir is not None:
+        updates["archive_dir"] = archive_dir
+    if no_vacuum:
+        updates["vacuum"] = False
+    policy = benchmark_config.retention.model_copy(update=updates)
+    if not policy.is_bounded and not dry_run:
+        click.echo("Error: The retention policy selects every stopped run, set --older-than-days or --keep-per-agent")
+        return
+
+    async def apply():
+        try:
+            return await archiver.apply(policy, tenant_id=tenant_id, dry_run=dry_run)
+        finally:
+            await ENGINE_POOL.dispose()
+
+    try:
+        summary = asyncio.run(apply())
+    except ImportError as e:
+        click.echo(f"Error: {e}")
+        return
+    if dry_run:
+        click.echo(f"{len(summary['selected'])} runs would be archived")
+        for run in summary["selected"]:
+            click.echo(f"  {run['id']}  {run['benchmark_name']:<20}  {run['status']:<9}  {run['created_at']:%Y-%m-%d %H:%M}  {run['agent_filename']}")
+        return
+    click.echo(
+        f"Archived {len(summary['archived'])} runs ({summary['tables']} tables dropped), "
+        f"{len(summary['without_tables'])} runs without tables, {len(summary['errors'])} failed"
+    )
+    for exp_id, error in summary["errors"].items():
+        click.echo(f"  {exp_id}: {error}")
+
+
+@click.command()
+@click.argument("exp_id", type=str)
+@click.option(
+    "--config",
+    "-c",
+    required=True,
+    help="Path to configuration file with the database settings (required)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option("--tenant-id", required=False, help="Tenant ID of the run")
+def rehydrate(exp_id: str, config: str, tenant_id: Optional[str]):
+    """
+    Load the archived tables of a run back into the database
+
+    EXP_ID: Experiment ID of a run archived by 'mbbench compact'
+    """
+    from mobisimbench.storage import ENGINE_POOL
+
+    _, archiver = _load_archiver(config)
+    if archiver is None:
+        return
+
+    async def restore():
+        try:
+            return await archiver.rehydrate(exp_id, tenant_id=tenant_id)
+        finally:
+            await ENGINE_POOL.dispose()
+
+    try:
+        restored = asyncio.run(restore())
+    except (ImportError, ValueError, FileNotFoundError) as e:
+        click.echo(f"Error: {e}")
+        return
+    for table_type, rows in restored.items():
+        click.echo(f"{table_type:<16} {rows:>10} rows")
+    click.echo(f"Restored the tables of {exp_id}")
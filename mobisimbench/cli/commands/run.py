@@ -4,18 +4,18 @@ Run command for executing benchmark experiments
 import asyncio
 import json
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
-import requests
 import yaml
 
-from ..config import BenchmarkConfig
-from agentsociety.configs import AgentConfig
-from mobisimbench.runner import BenchmarkRunner
+# agentsociety and the runner take seconds to import, they are imported when a command needs them
+if TYPE_CHECKING:
+    from agentsociety.configs import AgentConfig
+    from ..config import BenchmarkConfig
 
 
-def load_benchmark_config(config_path: Path) -> BenchmarkConfig:
+def load_benchmark_config(config_path: Path) -> "BenchmarkConfig":
     """
     Load configuration file, supports JSON and YAML formats
     
@@ -27,6 +27,7 @@ def load_benchmark_config(config_path: Path) -> BenchmarkConfig:
     """
     if not config_path.exists():
         raise click.BadParameter(f"Benchmark config file {config_path} does not exist")
+    from ..config import BenchmarkConfig
     
     file_ext = config_path.suffix.lower()
     if file_ext in [".json"]:
@@ -45,7 +46,7 @@ def load_benchmark_config(config_path: Path) -> BenchmarkConfig:
         raise click.BadParameter(f"Unsupported benchmark config file format: {file_ext}")
 
 
-def load_agent_config(agent_path: Path) -> AgentConfig:
+def load_agent_config(agent_path: Path) -> "AgentConfig":
     """
     Load agent configuration from agent file
     
@@ -55,6 +56,8 @@ def load_agent_config(agent_path: Path) -> AgentConfig:
     Returns:
         AgentConfig: Agent configuration object
     """
+    from agentsociety.configs import AgentConfig
+
     file_ext = agent_path.suffix.lower()
     if file_ext in [".json"]:
         try:
@@ -139,6 +142,34 @@ def find_task_config(task_dir: Path) -> Optional[Path]:
 
 
 
+def echo_repeats_summary(result: dict):
+    """
+    Print the replicates and the metric summary of a repeated run
+    
+    Args:
+        result (dict): Result of BenchmarkRunner.run_repeats
+    """
+    num_success = sum(1 for run in result["runs"] if run["success"])
+    click.echo(f"Replicates completed: {num_success}/{result['repeats']} (group id: {result['group_id']})")
+    for run in result["runs"]:
+        if run["success"]:
+            click.echo(f"  {run['exp_id']}: {run['result_filename']}")
+        else:
+            click.echo(f"  failed: {run['error']}")
+    
+    summary = result["summary"]
+    if not summary:
+        click.echo("No evaluated replicates to summarize")
+        return
+    name_width = max(len(name) for name in summary)
+    click.echo(f"{'metric':<{name_width}}  {'mean':>12}  {'std':>12}  {'ci_low':>12}  {'ci_high':>12}")
+    for name, stats in summary.items():
+        click.echo(
+            f"{name:<{name_width}}  {stats['mean']:>12.4f}  {stats['std']:>12.4f}"
+            f"  {stats['ci_low']:>12.4f}  {stats['ci_high']:>12.4f}"
+        )
+
+
 @click.command()
 @click.argument("task", type=str)
 @click.option(
@@ -171,9 +202,22 @@ def find_task_config(task_dir: Path) -> Optional[Path]:
     "--mode",
     "-m",
     required=False,
-    help="Execution mode: 'test' runs full pipeline including evaluation, 'inference' skips evaluation and saves results",
+    help="Execution mode: 'test' runs full pipeline including evaluation, 'inference' skips evaluation and saves results "
+         "(default: 'test', or 'inference' with --repeats)",
     type=click.Choice(["test", "inference"]),
-    default="test",
+    default=None,
+)
+@click.option(
+    "--repeats",
+    "-n",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of replicates to run concurrently; reports mean/std/bootstrap CI of every metric",
+)
+@click.option(
+    "--live-scoring",
+    is_flag=True,
+    help="Print and save a partial score after each workflow step (e.g. each simulated day)",
 )
 @click.option("--tenant-id", default="", help="Specify tenant ID")
 @click.option("--callback-url", default="", help="Specify callback URL (POST)")
@@ -186,7 +230,9 @@ def run(ctx: click.Context,
         tenant_id: str,
         callback_url: str,
         official: bool,
-        mode: str,
+        mode: Optional[str],
+        repeats: int,
+        live_scoring: bool,
     ):
     """
     Run a benchmark experiment with custom configuration and agent
@@ -217,6 +263,10 @@ def run(ctx: click.Context,
         click.echo(f"Error: Datasets path '{datasets}' is not a directory")
         return
     
+    from mobisimbench.runner import BenchmarkRunner
+    from mobisimbench.storage import ENGINE_POOL
+    from mobisimbench.utils.abort import BenchmarkAborted
+
     # Load configuration data
     try:
         benchmark_config = load_benchmark_config(benchmark_config_path)
@@ -227,6 +277,16 @@ def run(ctx: click.Context,
     # Load agent configuration
     agent_config = load_agent_config(agent_config_path)
 
+    if mode is None:
+        mode = "inference" if repeats > 1 else "test"
+    if repeats > 1:
+        # every replicate would be simulated and then fail at evaluation
+        try:
+            BenchmarkRunner(config=benchmark_config).check_mode(task, mode)
+        except ValueError as e:
+            click.echo(f"Error: {e}")
+            return
+
     # Run benchmark using BenchmarkRunner
     async def run_benchmark_with_runner():
         try:
@@ -237,6 +297,22 @@ def run(ctx: click.Context,
             
             click.echo(f"Running benchmark task: {task} using BenchmarkRunner")
             
+            if repeats > 1:
+                if live_scoring:
+                    click.echo("Warning: --live-scoring is ignored with --repeats")
+                result = await runner.run_repeats(
+                    task_name=task,
+                    tenant_id=tenant_id,
+                    agent_config=agent_config,
+                    repeats=repeats,
+                    datasets_path=datasets_path,
+                    mode=mode,
+                    official_validated=official,
+                    agent_filename=f"{agent}"
+                )
+                echo_repeats_summary(result)
+                return result
+            
             # Run benchmark
             result = await runner.run(
                 task_name=task,
@@ -246,7 +322,8 @@ def run(ctx: click.Context,
                 mode=mode,
                 official_validated=official,
                 save_results=True,
-                agent_filename=f"{agent}"
+                agent_filename=f"{agent}",
+                live_scoring=live_scoring,
             )
             
             click.echo("Benchmark task completed successfully")
@@ -257,15 +334,22 @@ def run(ctx: click.Context,
             
             return result
             
+        except BenchmarkAborted as e:
+            # stopped on purpose by an abort rule, the benchmark row is marked ABORTED
+            click.echo(f"Benchmark aborted: {e}")
         except Exception as e:
             error_msg = f"Error during benchmark execution: {str(e)}"
             click.echo(f"Error: {error_msg}")
             raise e
+        finally:
+            await ENGINE_POOL.dispose()
     
     # Run the benchmark using BenchmarkRunner
     asyncio.run(run_benchmark_with_runner())
     
     if callback_url:
+        import requests
+
         requests.post(callback_url)
 
 
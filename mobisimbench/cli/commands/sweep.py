@@ -0,0 +1,127 @@
+"""
+Sweep command for running an experiment matrix in parallel
+"""
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+import yaml
+
+from .run import load_benchmark_config
+
+if TYPE_CHECKING:
+    from mobisimbench.sweep import SweepConfig
+
+
+def load_sweep_config(sweep_path: Path) -> "SweepConfig":
+    """
+    Load sweep file, supports JSON and YAML formats
+
+    Args:
+        sweep_path (Path): Path to the sweep file
+
+    Returns:
+        SweepConfig: Experiment matrix
+    """
+    from mobisimbench.sweep import SweepConfig
+
+    file_ext = sweep_path.suffix.lower()
+    if file_ext in [".json"]:
+        try:
+            with open(sweep_path, "r") as f:
+                return SweepConfig.model_validate(json.load(f))
+        except json.JSONDecodeError as e:
+            raise click.BadParameter(f"Failed to parse JSON sweep file: {e}")
+    elif file_ext in [".yaml", ".yml"]:
+        try:
+            with open(sweep_path, "r") as f:
+                return SweepConfig.model_validate(yaml.safe_load(f))
+        except yaml.YAMLError as e:
+            raise click.BadParameter(f"Failed to parse YAML sweep file: {e}")
+    else:
+        raise click.BadParameter(f"Unsupported sweep file format: {file_ext}")
+
+
+@click.command()
+@click.option(
+    "--config",
+    "-c",
+    required=True,
+    help="Path to base configuration file (required)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option(
+    "--sweep",
+    "-s",
+    "sweep_file",
+    required=True,
+    help="Path to the sweep file with tasks, agents, llms and seeds (required)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option(
+    "--max-parallel",
+    "-j",
+    required=False,
+    type=click.IntRange(min=1),
+    help="Maximum number of runs executed at the same time (overrides the sweep file)",
+)
+@click.option(
+    "--manifest",
+    required=False,
+    help="Output manifest file (JSON), defaults to <home_dir>/sweeps/sweep_<timestamp>.json",
+    type=click.Path(file_okay=True, dir_okay=False),
+)
+@click.option("--tenant-id", default="", help="Specify tenant ID")
+@click.pass_context
+def sweep(ctx: click.Context,
+          config: str,
+          sweep_file: str,
+          max_parallel: int,
+          manifest: str,
+          tenant_id: str):
+    """
+    Run every combination of an experiment matrix in a process pool
+
+    The sweep file lists tasks, agents, llms (one variant each) and seeds,
+    e.g. `tasks: [DailyMobility]`, `agents: [a.py, b.py]`, `seeds: [0, 1]`.
+    All runs are recorded in a single manifest.
+    """
+    home_dir = ctx.obj["home_dir"]
+
+    try:
+        benchmark_config = load_benchmark_config(Path(config))
+        sweep_config = load_sweep_config(Path(sweep_file))
+    except Exception as e:
+        click.echo(f"Error loading configuration: {e}")
+        return
+    if max_parallel:
+        sweep_config.max_parallel = max_parallel
+
+    for task in sweep_config.tasks:
+        datasets_path = Path(sweep_config.datasets.get(task, home_dir / "datasets" / task))
+        if not datasets_path.is_dir():
+            click.echo(f"Error: Datasets directory '{datasets_path}' does not exist")
+            return
+    for agent in sweep_config.agents:
+        if not Path(agent).exists():
+            click.echo(f"Error: Agent file '{agent}' does not exist")
+            return
+
+    from mobisimbench.sweep import SweepRunner
+
+    runner = SweepRunner(config=benchmark_config, sweep=sweep_config)
+    try:
+        runner.check_modes()
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        return
+    result = runner.run(
+        default_datasets_dir=home_dir / "datasets",
+        tenant_id=tenant_id,
+        manifest_path=Path(manifest) if manifest else None,
+    )
+
+    num_success = sum(1 for run in result["runs"] if run["success"])
+    click.echo(f"Sweep completed: {num_success}/{result['num_jobs']} runs succeeded")
+    click.echo(f"Manifest file: {result['manifest_filename']}")
@@ -2,8 +2,54 @@ from pydantic import BaseModel, Field
 from typing import List, Literal, Optional
 from agentsociety.configs import LLMConfig, EnvConfig
 from agentsociety.storage.database import DatabaseConfig
+from mobisimbench.storage.database import SQLiteTuning
+from mobisimbench.storage.retention import RetentionPolicy
 
-__all__ = ["BenchmarkConfig"]
+__all__ = ["AbortRule", "BenchmarkDatabaseConfig", "BenchmarkEnvConfig", "BenchmarkConfig"]
+
+class AbortRule(BaseModel):
+    """Rule that stops a run early when a partial metric shows it is clearly failing"""
+
+    task: Optional[str] = Field(default=None)
+    """Task the rule applies to, e.g. DailyMobility; all tasks if not set"""
+
+    after_hours: float = Field(default=0, ge=0)
+    """Simulated hours since the start of the run after which the rule is checked, once"""
+
+    metric: str
+    """Dotted name of the metric: a key of the partial evaluation (e.g. `jsd_intention_sequences`), or
+    `results.<key>[.<index>]` for the raw results so far (e.g. `results.total_travel_times.0`)"""
+
+    aggregate: Optional[Literal["sum", "mean", "min", "max"]] = Field(default=None)
+    """How to reduce a list / array metric to one number"""
+
+    op: Literal[">", ">=", "<", "<=", "==", "!="]
+    """Comparison with `value`; the run is aborted when it holds"""
+
+    value: float
+    """Threshold"""
+
+    description: Optional[str] = Field(default=None)
+    """Human readable reason reported when the rule fires"""
+
+class BenchmarkDatabaseConfig(DatabaseConfig):
+    """Database configuration, with the options of the benchmark table writer"""
+
+    write_behind: bool = Field(default=False)
+    """Queue benchmark status updates and write them in the background, keeping only the latest
+    state of each benchmark; pending updates are always written when the run ends"""
+
+    write_behind_interval: float = Field(default=1.0, gt=0)
+    """Seconds between two background writes of the queued status updates"""
+
+    sqlite: SQLiteTuning = Field(default_factory=SQLiteTuning)
+    """Connection settings of the benchmark writers when `db_type` is sqlite"""
+
+class BenchmarkEnvConfig(EnvConfig):
+    """Environment configuration"""
+
+    db: BenchmarkDatabaseConfig
+    """Database configuration"""
 
 class BenchmarkConfig(BaseModel):
     """Configuration for the benchmark"""
@@ -11,8 +57,8 @@ class BenchmarkConfig(BaseModel):
     llm: Optional[List[LLMConfig]] = Field(default=None, min_length=1)
     """List of LLM configurations, if not provided, you can only use evaluation function"""
 
-    env: EnvConfig = EnvConfig(
-        db=DatabaseConfig(
+    env: BenchmarkEnvConfig = BenchmarkEnvConfig(
+        db=BenchmarkDatabaseConfig(
             enabled=True,
             db_type="sqlite",
             pg_dsn=None,
@@ -22,4 +68,10 @@ class BenchmarkConfig(BaseModel):
     """Environment configuration"""
 
     mode: Literal["test", "inference"] = Field(default="test")
-    """Execution mode: 'test' runs full pipeline including evaluation, 'inference' skips evaluation and saves results"""
\ No newline at end of file
+    """Execution mode: 'test' runs full pipeline including evaluation, 'inference' skips evaluation and saves results"""
+
+    abort: List[AbortRule] = Field(default=[])
+    """Early-abort rules, checked while the simulation runs"""
+
+    retention: RetentionPolicy = Field(default_factory=RetentionPolicy)
+    """Retention policy of the per-experiment tables, applied by `mbbench compact`"""
\ No newline at end of file
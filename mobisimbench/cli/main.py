@@ -1,26 +1,40 @@
 """
 Main CLI entry point for mobisim-bench
 """
-import importlib.metadata
 from pathlib import Path
 
 import click
 
-from .commands import clone, list_tasks, run, list_installed, update_benchmarks, evaluate, list_evaluatable_tasks
-
-version_string_of_mobisimbench = importlib.metadata.version("mobisimbench")
+from .commands import COMMANDS, load_command
 
 CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 
 
+class LazyGroup(click.Group):
+    """
+    Command group that imports a subcommand's module only when the subcommand is used
+
+    The job launchers call `mbbench` many times, so a command must not pay for the
+    imports of the others; the command modules defer their heavy imports too
+    """
+
+    def list_commands(self, ctx: click.Context):
+        return sorted(set(super().list_commands(ctx)) | set(COMMANDS))
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        if cmd_name not in self.commands and cmd_name in COMMANDS:
+            self.add_command(load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
 def get_default_home_dir() -> str:
     """Get default home directory for benchmark data"""
     # Use current working directory instead of home directory
     return str(Path.cwd() / "mobisim-data")
 
 
-@click.group(context_settings=CONTEXT_SETTINGS)
-@click.version_option(version=version_string_of_mobisimbench, prog_name="Mobisim-Bench")
+@click.group(cls=LazyGroup, context_settings=CONTEXT_SETTINGS)
+@click.version_option(package_name="mobisimbench", prog_name="Mobisim-Bench")
 @click.option(
     "--home-dir",
     default=get_default_home_dir(),
@@ -39,6 +53,8 @@ def cli(ctx: click.Context, home_dir: str):
     2. Use 'mbbench clone <task>' to download datasets from Git repositories (HuggingFace/GitHub)
     3. Use 'mbbench run <task>' to run benchmark experiments with your config and agent
     4. Use 'mbbench evaluate <task> <results_file>' to evaluate results independently
+    5. Use 'mbbench sweep --config <config> --sweep <sweep_file>' to run an experiment matrix in parallel
+    6. Use 'mbbench leaderboard <task> --config <config>' to query the best runs in the database
     """
     # Ensure context object exists
     ctx.ensure_object(dict)
@@ -48,15 +64,5 @@ def cli(ctx: click.Context, home_dir: str):
     ctx.obj["home_dir"].mkdir(parents=True, exist_ok=True)
 
 
-# Add subcommands
-cli.add_command(clone)
-cli.add_command(list_tasks)
-cli.add_command(run)
-cli.add_command(list_installed)
-cli.add_command(update_benchmarks)
-cli.add_command(evaluate)
-cli.add_command(list_evaluatable_tasks)
-
-
 if __name__ == "__main__":
     cli() 
\ No newline at end of file
@@ -5,18 +5,209 @@ This module provides a standalone BenchmarkRunner class that abstracts
 the core functionality of running benchmarks and evaluating results.
 """
 
+import asyncio
 import json
+import os
+import sys
+import uuid
 import yaml
-import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from agentsociety.configs import AgentConfig, Config, IndividualConfig
 from mobisimbench.cli.config import BenchmarkConfig
 from mobisimbench.storage.database import DatabaseWriter
 from mobisimbench.storage.type import StorageBenchmark, BenchmarkStatus
+from mobisimbench.utils.abort import AbortMonitor, BenchmarkAborted
+from mobisimbench.utils.accumulator import find_status_accumulator
 from mobisimbench.utils.agent_loader import load_agent_class
+from mobisimbench.utils.llm_semaphore import ShareLLMSemaphores
+from mobisimbench.utils.results_file import (
+    RESULTS_SUFFIX,
+    file_sha256,
+    load_results,
+    load_results_from_file_object,
+    load_results_metadata,
+    save_results,
+)
+from mobisimbench.utils.stats import summarize_bootstrap, summarize_replicates
+from mobisimbench.utils.workflow_checkpoint import add_workflow_checkpoints
+
+def _partial_evaluation_mode(task_config: Dict[str, Any], mode: str) -> str:
+    """
+    Mode passed to the evaluation function when scoring a running simulation.
+    
+    - **Description**:
+        - Partial scores are diagnostics (live scoring, abort rules), so they do not depend on the run's mode:
+          if the task cannot evaluate that mode, e.g. `test`, the first mode it supports is used
+    """
+    supported_modes = task_config.get("supported_modes", [])
+    if not supported_modes or mode in supported_modes:
+        return mode
+    return supported_modes[0]
+
+async def _close_database_writer(database_writer: DatabaseWriter, pending: Optional[BaseException]):
+    """
+    Close a database writer in a `finally` block.
+    
+    - **Description**:
+        - With write-behind, closing flushes the queued updates; if that fails (e.g. locked or unreachable
+          database) while `pending` is propagating, the failure is printed so it does not replace `pending`,
+          e.g. `BenchmarkAborted`
+    
+    - **Args**:
+        - `database_writer` (DatabaseWriter): The writer to close
+        - `pending` (Optional[BaseException]): The exception propagating through the `finally` block, `sys.exc_info()[1]`
+    """
+    try:
+        await database_writer.close()
+    except Exception as e:
+        if pending is None:
+            raise
+        print(f"Failed to write the queued benchmark updates: {e}")
+
+def _bootstrap_evaluation(task_config: Dict[str, Any],
+                          results: Any,
+                          datasets_path: str,
+                          n_bootstrap: int,
+                          confidence: float = 0.95) -> Dict[str, Any]:
+    """
+    Bootstrap the agents of one result set with the task's bootstrap function.
+    
+    - **Returns**:
+        - `Dict[str, Any]`: `n_bootstrap`, `confidence` and the per-metric summary under `metrics`,
+          or `error` if the task or the results do not support it
+    """
+    bootstrap: Dict[str, Any] = {"n_bootstrap": n_bootstrap, "confidence": confidence}
+    try:
+        if "bootstrap_func" not in task_config:
+            raise ValueError("Task does not support bootstrap")
+        replicates = task_config["bootstrap_func"]()(results, datasets_path, n_bootstrap=n_bootstrap)
+        bootstrap["metrics"] = summarize_bootstrap(replicates, confidence=confidence)
+    except Exception as e:
+        print(f"Failed to bootstrap evaluation: {e}")
+        bootstrap["error"] = str(e)
+    return bootstrap
+
+
+def _evaluate_results_file(task_name: str, results_file: str, datasets_path: str, n_bootstrap: int = 0) -> Dict[str, Any]:
+    """
+    Evaluate one results file in a worker process of `BenchmarkRunner.evaluate_batch`.
+    
+    - **Description**:
+        - The task's ground truth loader caches per process, so each worker reads it at most once
+        
+    - **Returns**:
+        - `Dict[str, Any]`: `results_file`, `metadata` and either `evaluation_result` or `error`
+    """
+    from mobisimbench.benchmarks import get_task_config
+    
+    outcome: Dict[str, Any] = {"results_file": results_file, "metadata": {}}
+    try:
+        results, metadata = load_results(results_file)
+        outcome["metadata"] = metadata
+        evaluation_function = get_task_config(task_name)["evaluation_func"]()
+        evaluation_result = asyncio.run(evaluation_function(
+            to_evaluate=results,
+            datasets_path=datasets_path,
+            metadata=metadata
+        ))
+        if n_bootstrap:
+            evaluation_result["bootstrap"] = _bootstrap_evaluation(get_task_config(task_name), results, datasets_path, n_bootstrap)
+        outcome["evaluation_result"] = evaluation_result
+    except Exception as e:
+        outcome["error"] = str(e)
+    return outcome
+
+
+def _evaluate_results_files_batched(task_name: str, results_files: List[str], datasets_path: str, n_bootstrap: int = 0) -> List[Dict[str, Any]]:
+    """
+    Evaluate many results files with the task's batched evaluation function in one call.
+    
+    - **Description**:
+        - Files in a mode the task does not support are passed to the per-file evaluation function,
+          which reports the error for them
+        
+    - **Returns**:
+        - `List[Dict[str, Any]]`: One outcome per file, as returned by `_evaluate_results_file`
+    """
+    from mobisimbench.benchmarks import get_task_config
+    
+    task_config = get_task_config(task_name)
+    supported_modes = task_config.get("supported_modes", [])
+    outcomes: List[Dict[str, Any]] = []
+    batch: List[Any] = []
+    batch_outcomes: List[Dict[str, Any]] = []
+    for results_file in results_files:
+        outcome: Dict[str, Any] = {"results_file": results_file, "metadata": {}}
+        outcomes.append(outcome)
+        try:
+            results, metadata = load_results(results_file)
+        except Exception as e:
+            outcome["error"] = str(e)
+            continue
+        outcome["metadata"] = metadata
+        if supported_modes and metadata.get("mode") not in supported_modes:
+            outcome.update(_evaluate_results_file(task_name, results_file, datasets_path, n_bootstrap))
+            continue
+        batch.append(results)
+        batch_outcomes.append(outcome)
+    
+    if batch:
+        scores = task_config["batch_evaluation_func"]()(batch, datasets_path)
+        for i, outcome in enumerate(batch_outcomes):
+            outcome["evaluation_result"] = {name: float(values[i]) for name, values in scores.items()}
+            if n_bootstrap:
+                outcome["evaluation_result"]["bootstrap"] = _bootstrap_evaluation(task_config, batch[i], datasets_path, n_bootstrap)
+    return outcomes
+
+
+def _read_results_file_metadata(results_file: str) -> Dict[str, Any]:
+    """
+    Decode the metadata of a results file in a worker process of `BenchmarkRunner.import_results`.
+    
+    - **Returns**:
+        - `Dict[str, Any]`: `results_file` and either `metadata` or `error`
+    """
+    info: Dict[str, Any] = {"results_file": results_file}
+    try:
+        info["metadata"] = load_results_metadata(results_file)
+        if not info["metadata"].get("exp_id"):
+            raise ValueError("no exp_id in metadata")
+    except Exception as e:
+        info["error"] = str(e)
+    return info
+
+
+def _imported_benchmark_info(info: Dict[str, Any], tenant_id: str, official_validated: bool) -> StorageBenchmark:
+    """Benchmark row of an imported results file, as saved by `BenchmarkRunner.run` before evaluation"""
+    metadata = info["metadata"]
+    try:
+        created_at = datetime.fromisoformat(str(metadata["execution_time"]))
+    except (KeyError, ValueError):
+        created_at = datetime.fromtimestamp(os.path.getmtime(info["results_file"]))
+    return StorageBenchmark(
+        tenant_id=tenant_id or metadata.get("tenant_id", ""),
+        id=str(uuid.UUID(str(metadata["exp_id"]))),
+        benchmark_name=metadata.get("task_name", ""),
+        llm=metadata.get("llm", ""),
+        agent=metadata.get("agent", ""),
+        agent_filename=str(metadata.get("agent_filename", "")),
+        result_filename=str(Path(info["results_file"]).resolve()),
+        result_hash=info["result_hash"],
+        status=BenchmarkStatus.FINISHED,
+        result_info="",
+        final_score=0.0,
+        config=metadata.get("config", ""),
+        error="",
+        official_validated=official_validated,
+        group_id=metadata.get("group_id"),
+        created_at=created_at,
+        updated_at=datetime.now(),
+    )
+
 
 class BenchmarkRunner:
     """
@@ -118,6 +309,20 @@ class BenchmarkRunner:
         except ImportError:
             return None
     
+    def check_mode(self, task_name: str, mode: str):
+        """
+        Check that a task supports an execution mode.
+        
+        - **Raises**:
+            - `ValueError`: The task is unknown or does not support the mode
+        """
+        task_config = self._get_task_config(task_name)
+        if not task_config:
+            raise ValueError(f"Task '{task_name}' not found or invalid")
+        supported_modes = task_config.get("supported_modes", [])
+        if supported_modes and mode not in supported_modes:
+            raise ValueError(f"Task '{task_name}' does not support mode '{mode}', supported modes: {supported_modes}")
+    
     def _get_task_functions(self, task_name: str) -> Optional[Dict[str, Any]]:
         """
         Get task functions from the benchmarks module.
@@ -163,8 +368,11 @@ class BenchmarkRunner:
         Initialize database writer for storing results.
         
         - **Description**:
-            - Creates database configuration and writer instance
-            - Handles database initialization
+            - Creates a writer instance that borrows its engine from the process-wide `ENGINE_POOL`,
+              so repeated runs and evaluations reuse connections
+            - Tables are created on the first writer of each database only
+            - With `env.db.write_behind`, status updates are queued and written in the background;
+              the writer is always closed in a `finally` block, which writes the remaining updates
             
         - **Args**:
             - `tenant_id` (str): Tenant ID for database operations
@@ -173,7 +381,14 @@ class BenchmarkRunner:
         - **Returns**:
             - `DatabaseWriter`: Initialized database writer
         """        
-        database_writer = DatabaseWriter(tenant_id, exp_id, self.config.env.db, str(self.home_dir))
+        database_writer = DatabaseWriter(
+            tenant_id,
+            exp_id,
+            self.config.env.db,
+            str(self.home_dir),
+            write_behind=self.config.env.db.write_behind,
+            write_behind_interval=self.config.env.db.write_behind_interval,
+        )
         await database_writer.init()
         return database_writer
     
@@ -187,11 +402,13 @@ class BenchmarkRunner:
                                      config_str: str,
                                      status: BenchmarkStatus,
                                      result_info: str = "",
+                                     metrics: Optional[Dict[str, Any]] = None,
                                      final_score: float = 0.0,
                                      error: str = "",
                                      official_validated: bool = False,
                                      agent_filename: str = "",
-                                     result_filename: str = ""):
+                                     result_filename: str = "",
+                                     group_id: Optional[str] = None):
         """
         Update benchmark status in database.
         
@@ -207,9 +424,12 @@ class BenchmarkRunner:
             - `config_str` (str): Configuration as JSON string
             - `status` (int): Status code (1=running, 2=completed, 3=error, 4=evaluation)
             - `result_info` (str): Result information
+            - `metrics` (Optional[Dict[str, Any]]): Evaluation result, saved in the JSON `metrics` column and
+              as one `BenchmarkMetric` row per numeric value
             - `final_score` (float): Final score
             - `error` (str): Error message if any
             - `official_validated` (bool): Whether this is an official validation
+            - `group_id` (Optional[str]): ID shared by the replicates of a repeated run
         """
         benchmark_info = StorageBenchmark(
             tenant_id=tenant_id,
@@ -218,8 +438,10 @@ class BenchmarkRunner:
             llm=llm,
             agent=agent,
             official_validated=official_validated,
+            group_id=group_id,
             status=status,
             result_info=result_info,
+            metrics=metrics,
             final_score=final_score,
             config=config_str,
             error=error,
@@ -239,7 +461,10 @@ class BenchmarkRunner:
                  datasets_path: Optional[Path] = None,
                  mode: str = "test",
                  official_validated: bool = False,
-                 save_results: bool = True) -> Dict[str, Any]:
+                 save_results: bool = True,
+                 group_id: Optional[str] = None,
+                 llm_semaphores: Optional[List[asyncio.Semaphore]] = None,
+                 live_scoring: bool = False) -> Dict[str, Any]:
         """
         Run a benchmark experiment.
         
@@ -256,9 +481,17 @@ class BenchmarkRunner:
             - `mode` (str): Execution mode ('test' or 'inference')
             - `official_validated` (bool): Whether this is an official validation
             - `save_results` (bool): Whether to save results to database
+            - `group_id` (Optional[str]): ID shared by the replicates of a repeated run
+            - `llm_semaphores` (Optional[List[asyncio.Semaphore]]): LLM semaphores shared with concurrent runs
+            - `live_scoring` (bool): Score the statuses gathered so far after each RUN / STEP workflow step,
+              print the partial score and write it into the benchmark row
             
         - **Returns**:
             - `Dict[str, Any]`: Execution results and metadata
+
+        - **Raises**:
+            - `BenchmarkAborted`: An abort rule of the benchmark config stopped the run; the benchmark row
+              is marked `ABORTED` instead of `ERROR`
         """
         assert self.config.llm is not None, "LLM is not provided, please provide LLM in the benchmark config"
         
@@ -272,6 +505,7 @@ class BenchmarkRunner:
             raise ValueError(f"Task '{task_name}' not found or invalid")
         
         database_writer = None
+        abort_monitor: Optional[AbortMonitor] = None
 
         # Handle agent_class if it's a string (could be file path or class name)
         if isinstance(agent_config.agent_class, str):
@@ -280,7 +514,7 @@ class BenchmarkRunner:
             # Check if it's a file path (ends with .py or exists as file)
             if agent_path.suffix == '.py' or agent_path.exists():
                 # It's a file path, load agent class from file
-                agent_class = load_agent_class(agent_path, task_config["agent_class"])
+                agent_class = load_agent_class(agent_path, task_config["template_agent"]())
                 agent_config.agent_class = agent_class
         
         try:
@@ -295,6 +529,27 @@ class BenchmarkRunner:
                 )
             else:
                 prepared_config = self.config
+            if llm_semaphores is not None and isinstance(prepared_config, Config):
+                prepared_config.agents.init_funcs.append(ShareLLMSemaphores(llm_semaphores))
+
+            # Stop clearly failing runs early, checked after every status write of the simulation
+            abort_rules = [rule for rule in self.config.abort if rule.task in (None, task_name)]
+            if abort_rules and isinstance(prepared_config, Config):
+                if "evaluation" not in task_functions:
+                    raise ValueError(f"Task '{task_name}' does not have an evaluation function for abort rules")
+                evaluation_function = task_functions["evaluation"]
+                partial_mode = _partial_evaluation_mode(task_config, mode)
+
+                async def evaluate_partial(partial_results: Dict[str, Any]) -> Dict[str, Any]:
+                    return await evaluation_function(
+                        to_evaluate=partial_results,
+                        datasets_path=str(datasets_path),
+                        metadata={"mode": partial_mode, "partial": True},
+                    )
+
+                # appended after the task's status accumulator, so rules see the rows of the current step
+                abort_monitor = AbortMonitor(prepared_config, abort_rules, evaluate_partial)
+                prepared_config.agents.init_funcs.append(abort_monitor)
 
             # Initialize database writer if needed
             if save_results:
@@ -347,8 +602,49 @@ class BenchmarkRunner:
                     status=BenchmarkStatus.RUNNING,
                     official_validated=official_validated,
                     agent_filename=agent_filename,
+                    group_id=group_id,
                 )
             
+            # Score the prefix of the run after each workflow step
+            live_scores: List[Dict[str, Any]] = []
+            if live_scoring and isinstance(prepared_config, Config):
+                async def score_checkpoint(step_index: int, simulation: Any):
+                    partial = await self._score_partial(
+                        prepared_config,
+                        task_functions.get("evaluation"),
+                        step_index,
+                        simulation,
+                        datasets_path,
+                        _partial_evaluation_mode(task_config, mode),
+                    )
+                    live_scores.append(partial)
+                    if "error" in partial:
+                        print(f"Partial score after workflow step {step_index} (day {partial['day']}, t={partial['t']}): unavailable, {partial['error']}")
+                    else:
+                        print(f"Partial score after workflow step {step_index} (day {partial['day']}, t={partial['t']}): {partial['final_score']:.4f}")
+                    if database_writer:
+                        try:
+                            await self._update_benchmark_status(
+                                database_writer=database_writer,
+                                tenant_id=tenant_id,
+                                exp_id=str(exp_id),
+                                task_name=task_name,
+                                llm=llm_name,
+                                agent=agent_config_str,
+                                config_str=config_str,
+                                status=BenchmarkStatus.RUNNING,
+                                result_info=json.dumps(partial, ensure_ascii=False, indent=2, default=str),
+                                final_score=partial.get("final_score", 0.0),
+                                official_validated=official_validated,
+                                agent_filename=agent_filename,
+                                group_id=group_id,
+                            )
+                        except Exception as e:
+                            # a failed partial update must not stop the simulation
+                            print(f"Failed to save partial score: {e}")
+
+                add_workflow_checkpoints(prepared_config, score_checkpoint)
+
             # Execute benchmark
             if "entry" not in task_functions:
                 raise ValueError(f"Task '{task_name}' does not have an entry function")
@@ -359,8 +655,7 @@ class BenchmarkRunner:
                 tenant_id=tenant_id
             )
 
-            result_filename = self.home_dir / "inference_results" / f"{task_name}_{exp_id}_results.pkl"
-            result_filename.parent.mkdir(parents=True, exist_ok=True)
+            result_filename = self.home_dir / "inference_results" / f"{task_name}_{exp_id}_results{RESULTS_SUFFIX}"
             
             # Save results
             results_data = {
@@ -375,13 +670,13 @@ class BenchmarkRunner:
                     "agent_filename": agent_filename,
                     "result_filename": result_filename,
                     "execution_time": datetime.now().isoformat(),
-                    "mode": mode
+                    "mode": mode,
+                    "group_id": group_id,
                 }
             }
             
-            # Save to file
-            with open(result_filename, "wb") as f:
-                pickle.dump(results_data, f)
+            # Save to file, one array per metric plus a JSON metadata sidecar
+            save_results(result_filename, results_data["results"], results_data["metadata"])
             
             # Update database with completion status
             if database_writer:
@@ -396,7 +691,8 @@ class BenchmarkRunner:
                     status=BenchmarkStatus.FINISHED,
                     official_validated=official_validated,
                     agent_filename=agent_filename,
-                    result_filename=str(result_filename)
+                    result_filename=str(result_filename),
+                    group_id=group_id,
                 )
             
             # Run evaluation if in test mode
@@ -411,15 +707,19 @@ class BenchmarkRunner:
             
             return {
                 "success": True,
+                "exp_id": str(exp_id),
                 "result_filename": str(result_filename),
                 "results": results,
                 "evaluation": evaluation_result,
+                "live_scores": live_scores,
                 "task_name": task_name,
                 "mode": mode
             }
             
         except Exception as e:
-            # Update database with error status
+            # The engine wraps exceptions raised during the simulation, the monitor keeps the abort reason
+            aborted = abort_monitor is not None and abort_monitor.reason is not None
+            # Update database with aborted / error status
             if database_writer:
                 await self._update_benchmark_status(
                     database_writer=database_writer,
@@ -429,17 +729,363 @@ class BenchmarkRunner:
                     llm=llm_name,
                     agent=agent_config_str,
                     config_str=config_str,
-                    status=BenchmarkStatus.ERROR,
-                    error=str(e),
+                    status=BenchmarkStatus.ABORTED if aborted else BenchmarkStatus.ERROR,
+                    error=abort_monitor.reason if aborted else str(e),
                     official_validated=official_validated,
                     agent_filename=agent_filename,
+                    group_id=group_id,
                 )
             
+            if aborted:
+                raise BenchmarkAborted(abort_monitor.reason) from e
             raise e
         finally:
             if database_writer:
-                await database_writer.close()
+                await _close_database_writer(database_writer, sys.exc_info()[1])
     
+    async def _score_partial(self,
+                             config: Config,
+                             evaluation_function: Optional[Any],
+                             step_index: int,
+                             simulation: Any,
+                             datasets_path: Optional[Path],
+                             mode: str) -> Dict[str, Any]:
+        """
+        Score the statuses gathered so far in a running simulation.
+        
+        - **Description**:
+            - Uses the task's status accumulator, so only the already-gathered prefix is read
+            - Days not simulated yet count as empty, so partial scores are not comparable with final
+              scores; they are meant to spot runs that are clearly failing
+            
+        - **Args**:
+            - `config` (Config): Prepared simulation configuration
+            - `evaluation_function` (Optional[Any]): Task evaluation function
+            - `step_index` (int): Index of the finished workflow step
+            - `simulation` (Any): Running simulation engine
+            - `datasets_path` (Optional[Path]): Path to datasets directory
+            - `mode` (str): Mode passed to the evaluation function, one the task supports
+            
+        - **Returns**:
+            - `Dict[str, Any]`: `workflow_step`, simulated `day` and `t`, and `evaluation` and `final_score` or `error`
+        """
+        day, t = simulation.environment.get_datetime()
+        partial: Dict[str, Any] = {"partial": True, "workflow_step": step_index, "day": day, "t": t}
+        try:
+            accumulator = find_status_accumulator(config)
+            if accumulator is None:
+                raise ValueError("The task does not accumulate results during the simulation")
+            if evaluation_function is None:
+                raise ValueError("The task does not have an evaluation function")
+            evaluation = await evaluation_function(
+                to_evaluate=accumulator.result(),
+                datasets_path=str(datasets_path),
+                metadata={"mode": mode, "partial": True},
+            )
+            partial["evaluation"] = evaluation
+            partial["final_score"] = self._final_score(evaluation)
+        except Exception as e:
+            partial["error"] = str(e)
+        return partial
+
+    async def run_repeats(self,
+                          tenant_id: str,
+                          task_name: str,
+                          agent_config: AgentConfig,
+                          repeats: int,
+                          agent_filename: str = "",
+                          datasets_path: Optional[Path] = None,
+                          mode: str = "inference",
+                          official_validated: bool = False,
+                          n_bootstrap: int = 1000,
+                          confidence: float = 0.95) -> Dict[str, Any]:
+        """
+        Run replicates of a benchmark experiment and aggregate their scores.
+        
+        - **Description**:
+            - Runs `repeats` replicates concurrently in this process; their LLMs share one semaphore
+              per LLM config, so the total number of in-flight requests stays within `concurrency`
+            - Every replicate is stored as its own benchmark row and result file, tagged with a common group ID
+            - Replicates that were not evaluated by `run` (inference mode) are evaluated from their result file
+            - The mode is checked against the task's `supported_modes` before any replicate starts, so that
+              no replicate is simulated only to fail at evaluation
+            - Reports mean, standard deviation and a bootstrap confidence interval of every scalar metric
+            
+        - **Args**:
+            - `task_name` (str): Name of the benchmark task
+            - `agent_config` (AgentConfig): Agent configuration object
+            - `repeats` (int): Number of replicates
+            - `datasets_path` (Optional[Path]): Path to datasets directory
+            - `mode` (str): Execution mode ('test' or 'inference'), must be supported by the task
+            - `official_validated` (bool): Whether this is an official validation
+            - `n_bootstrap` (int): Number of bootstrap resamples
+            - `confidence` (float): Confidence level of the interval
+            
+        - **Returns**:
+            - `Dict[str, Any]`: Group ID, per-replicate results and the metric summary
+        """
+        assert self.config.llm is not None, "LLM is not provided, please provide LLM in the benchmark config"
+        self.check_mode(task_name, mode)
+        
+        group_id = str(uuid.uuid4())
+        llm_semaphores = [asyncio.Semaphore(llm_config.concurrency) for llm_config in self.config.llm]
+        replicates = await asyncio.gather(*[
+            self.run(
+                tenant_id=tenant_id,
+                task_name=task_name,
+                agent_config=agent_config.model_copy(),
+                agent_filename=agent_filename,
+                datasets_path=datasets_path,
+                mode=mode,
+                official_validated=official_validated,
+                save_results=True,
+                group_id=group_id,
+                llm_semaphores=llm_semaphores,
+            )
+            for _ in range(repeats)
+        ], return_exceptions=True)
+        
+        runs = []
+        evaluations = []
+        for replicate in replicates:
+            if isinstance(replicate, BaseException):
+                print(f"Replicate failed: {replicate}")
+                runs.append({"success": False, "aborted": isinstance(replicate, BenchmarkAborted), "error": str(replicate)})
+                continue
+            evaluation = replicate.get("evaluation")
+            if evaluation is None:
+                try:
+                    evaluation = (await self.evaluate(
+                        tenant_id=tenant_id,
+                        task_name=task_name,
+                        results_file=replicate["result_filename"],
+                        agent_filename=agent_filename,
+                        datasets_path=datasets_path,
+                        official_validated=official_validated,
+                    ))["evaluation_result"]
+                except Exception as e:
+                    print(f"Failed to evaluate replicate {replicate['exp_id']}: {e}")
+            runs.append({
+                "success": True,
+                "exp_id": replicate["exp_id"],
+                "result_filename": replicate["result_filename"],
+                "evaluation": evaluation,
+            })
+            if isinstance(evaluation, dict):
+                evaluations.append(evaluation)
+        
+        return {
+            "group_id": group_id,
+            "task_name": task_name,
+            "mode": mode,
+            "repeats": repeats,
+            "runs": runs,
+            "summary": summarize_replicates(evaluations, n_bootstrap=n_bootstrap, confidence=confidence),
+        }
+
+    async def evaluate_batch(self,
+                             tenant_id: str,
+                             task_name: str,
+                             results_files: List[Path],
+                             datasets_path: Optional[Path] = None,
+                             official_validated: bool = False,
+                             max_workers: Optional[int] = None,
+                             n_bootstrap: int = 0) -> List[Dict[str, Any]]:
+        """
+        Evaluate many results files in parallel.
+        
+        - **Description**:
+            - Evaluations run in a process pool; the ground truth is loaded in this process before the pool
+              starts, so forked workers share it, otherwise every worker loads it once
+            - Tasks with a batched evaluation function get one contiguous share of the files per worker, scored
+              in one vectorized call; a share whose batched call fails is evaluated file by file
+            - All status upserts go through one database writer (one engine) in this process
+            - An empty `tenant_id` falls back to the tenant stored in each file's metadata
+            
+        - **Args**:
+            - `task_name` (str): Name of the benchmark task
+            - `results_files` (List[Path]): Results files to evaluate
+            - `datasets_path` (Optional[Path]): Path to datasets directory
+            - `official_validated` (bool): Whether this is an official validation
+            - `max_workers` (Optional[int]): Number of worker processes, defaults to the CPU count
+            - `n_bootstrap` (int): Number of agent resamples for confidence intervals, 0 to skip
+            
+        - **Returns**:
+            - `List[Dict[str, Any]]`: One summary per file (`results_file`, `exp_id`, `llm`, `agent_filename`,
+              `final_score`, `evaluation_result` or `error`), sorted by final score, failures last
+        """
+        task_config = self._get_task_config(task_name)
+        if not task_config or "evaluation_func" not in task_config:
+            raise ValueError(f"Task '{task_name}' does not have an evaluation function")
+        if "groundtruth_func" in task_config:
+            try:
+                task_config["groundtruth_func"]()(str(datasets_path))
+            except Exception as e:
+                print(f"Failed to preload ground truth of {task_name}: {e}")
+        
+        loop = asyncio.get_running_loop()
+        database_writer = await self._init_database_writer(tenant_id, "")
+        summaries = []
+        try:
+            results_files = [str(results_file) for results_file in results_files]
+            max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(results_files)))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                async def evaluate_files(files: List[str]) -> List[Dict[str, Any]]:
+                    return list(await asyncio.gather(*[
+                        loop.run_in_executor(executor, _evaluate_results_file, task_name, results_file, str(datasets_path), n_bootstrap)
+                        for results_file in files
+                    ]))
+
+                async def evaluate_share(files: List[str]) -> List[Dict[str, Any]]:
+                    try:
+                        return await loop.run_in_executor(
+                            executor, _evaluate_results_files_batched, task_name, files, str(datasets_path), n_bootstrap
+                        )
+                    except Exception as e:
+                        print(f"Batched evaluation of {task_name} failed, evaluating {len(files)} files one by one: {e}")
+                        return await evaluate_files(files)
+
+                if "batch_evaluation_func" in task_config:
+                    share_size = max(1, -(-len(results_files) // max_workers))
+                    groups = [
+                        evaluate_share(results_files[start:start + share_size])
+                        for start in range(0, len(results_files), share_size)
+                    ]
+                else:
+                    groups = [evaluate_files([results_file]) for results_file in results_files]
+                for group in asyncio.as_completed(groups):
+                    for outcome in await group:
+                        summaries.append(await self._record_batch_outcome(database_writer, tenant_id, task_name, outcome, official_validated))
+        finally:
+            await _close_database_writer(database_writer, sys.exc_info()[1])
+        
+        summaries.sort(key=lambda summary: (summary["final_score"] is None, -(summary["final_score"] or 0.0), summary["results_file"]))
+        return summaries
+
+    async def import_results(self,
+                             results_files: List[Path],
+                             tenant_id: str = "",
+                             official_validated: bool = False,
+                             max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Import result files of past runs into the benchmark table.
+        
+        - **Description**:
+            - Files are hashed and their metadata decoded in a process pool
+            - Files whose hash is already in the table are not decoded again, so an interrupted or
+              repeated import only processes the new files
+            - The rows are written with `DatabaseWriter.import_benchmark_infos`, in multi-row
+              `INSERT ... ON CONFLICT` statements; runs already in the table keep their status and scores
+            
+        - **Args**:
+            - `results_files` (List[Path]): Result files (NPZ or legacy PKL)
+            - `tenant_id` (str): Tenant ID of the rows, defaults to the tenant saved in each file
+            - `official_validated` (bool): Whether the runs are official validations
+            - `max_workers` (Optional[int]): Number of worker processes, defaults to the CPU count
+            
+        - **Returns**:
+            - `Dict[str, Any]`: Numbers of `imported`, `skipped` and `failed` files, and the `errors` by file
+        """
+        loop = asyncio.get_running_loop()
+        database_writer = await self._init_database_writer(tenant_id, "")
+        try:
+            max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(results_files) or 1))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                hashes = await asyncio.gather(*[
+                    loop.run_in_executor(executor, file_sha256, str(results_file)) for results_file in results_files
+                ])
+                skip_hashes = await database_writer.existing_result_hashes(list(hashes), tenant_id=tenant_id or None)
+                to_decode = [
+                    (str(results_file), result_hash)
+                    for results_file, result_hash in zip(results_files, hashes)
+                    if result_hash not in skip_hashes
+                ]
+                infos = await asyncio.gather(*[
+                    loop.run_in_executor(executor, _read_results_file_metadata, results_file) for results_file, _ in to_decode
+                ])
+            for info, (_, result_hash) in zip(infos, to_decode):
+                info["result_hash"] = result_hash
+            
+            errors = {info["results_file"]: info["error"] for info in infos if "error" in info}
+            num_skipped = len(results_files) - len(to_decode)
+            rows: Dict[Any, StorageBenchmark] = {}
+            for info in infos:
+                if "error" in info:
+                    continue
+                try:
+                    benchmark_info = _imported_benchmark_info(info, tenant_id, official_validated)
+                except Exception as e:
+                    errors[info["results_file"]] = str(e)
+                    continue
+                key = (benchmark_info.tenant_id, benchmark_info.id)
+                if key in rows:
+                    # e.g. the NPZ and the legacy PKL file of the same run, a statement cannot update a row twice
+                    print(f"Skipping {info['results_file']}: run {benchmark_info.id} is also in {rows[key].result_filename}")
+                    num_skipped += 1
+                    continue
+                rows[key] = benchmark_info
+            await database_writer.import_benchmark_infos(list(rows.values()))
+        finally:
+            await _close_database_writer(database_writer, sys.exc_info()[1])
+        
+        return {
+            "imported": len(rows),
+            "skipped": num_skipped,
+            "failed": len(errors),
+            "errors": errors,
+        }
+
+    async def _record_batch_outcome(self,
+                                    database_writer: Optional[DatabaseWriter],
+                                    tenant_id: str,
+                                    task_name: str,
+                                    outcome: Dict[str, Any],
+                                    official_validated: bool) -> Dict[str, Any]:
+        """Summarize the outcome of one file of `evaluate_batch` and upsert its benchmark status"""
+        metadata = outcome["metadata"]
+        evaluation_result = outcome.get("evaluation_result")
+        summary = {
+            "results_file": outcome["results_file"],
+            "exp_id": str(metadata.get("exp_id", "")),
+            "llm": metadata.get("llm", ""),
+            "agent_filename": metadata.get("agent_filename", ""),
+            "final_score": self._final_score(evaluation_result) if evaluation_result is not None else None,
+            "evaluation_result": evaluation_result,
+            "error": outcome.get("error", ""),
+        }
+        if not metadata.get("exp_id"):
+            print(f"Skipping status update of {outcome['results_file']}: {summary['error'] or 'no exp_id in metadata'}")
+            return summary
+        await self._update_benchmark_status(
+            database_writer=database_writer,
+            tenant_id=tenant_id or metadata.get("tenant_id", ""),
+            exp_id=str(metadata["exp_id"]),
+            task_name=task_name,
+            llm=metadata.get("llm", ""),
+            agent=metadata.get("agent", ""),
+            config_str=metadata.get("config", ""),
+            status=BenchmarkStatus.EVALUATED if evaluation_result is not None else BenchmarkStatus.ERROR,
+            result_info=json.dumps(evaluation_result, ensure_ascii=False, indent=2, default=str) if evaluation_result is not None else "",
+            metrics=evaluation_result,
+            final_score=summary["final_score"] or 0.0,
+            error=summary["error"],
+            official_validated=official_validated,
+            agent_filename=summary["agent_filename"],
+            result_filename=summary["results_file"],
+            group_id=metadata.get("group_id"),
+        )
+        return summary
+
+    @staticmethod
+    def _final_score(evaluation_result: Any) -> float:
+        """Get the final score of an evaluation result, 0 if missing or invalid"""
+        if isinstance(evaluation_result, dict) and "final_score" in evaluation_result:
+            try:
+                return float(evaluation_result["final_score"])
+            except (ValueError, TypeError):
+                return 0.0
+        return 0.0
+
     async def evaluate(self,
                       tenant_id: str,
                       task_name: str,
@@ -448,7 +1094,8 @@ class BenchmarkRunner:
                       result_filename: str = "",
                       datasets_path: Optional[Path] = None,
                       official_validated: bool = False,
-                      output_file: Optional[Path] = None) -> Dict[str, Any]:
+                      output_file: Optional[Path] = None,
+                      n_bootstrap: int = 0) -> Dict[str, Any]:
         """
         Evaluate benchmark results.
         
@@ -462,6 +1109,7 @@ class BenchmarkRunner:
             - `results_file` (str): Path to the results file
             - `datasets_path` (Optional[Path]): Path to datasets directory
             - `output_file` (Optional[Path]): Output file for evaluation results
+            - `n_bootstrap` (int): Number of agent resamples for confidence intervals, 0 to skip
             
         - **Returns**:
             - `Dict[str, Any]`: Evaluation results and metadata
@@ -472,17 +1120,15 @@ class BenchmarkRunner:
             raise FileNotFoundError(f"Results file {results_file} does not exist")
         
         try:
-            with open(results_path, "rb") as f:
-                data = pickle.load(f)
-                results, metadata = data["results"], data["metadata"]
-                print(f"Inference Evaluation Metadata: \n{metadata}")
+            results, metadata = load_results(results_path)
+            print(f"Inference Evaluation Metadata: \n{metadata}")
         except Exception as e:
             raise ValueError(f"Failed to load results file: {e}")
         if agent_filename == "":
             agent_filename = metadata.get("agent_filename", "unknown")
         if result_filename == "":
             result_filename = metadata.get("result_filename", "unknown")
-        return await self._evaluate_results(tenant_id, task_name, results, metadata, datasets_path, output_file, official_validated, agent_filename, result_filename)
+        return await self._evaluate_results(tenant_id, task_name, results, metadata, datasets_path, output_file, official_validated, agent_filename, result_filename, n_bootstrap)
 
     async def evaluate_from_file_object(self,
                                        tenant_id: str,
@@ -492,7 +1138,8 @@ class BenchmarkRunner:
                                        result_filename: str = "",
                                        datasets_path: Optional[Path] = None,
                                        output_file: Optional[Path] = None,
-                                       official_validated: bool = False) -> Dict[str, Any]:
+                                       official_validated: bool = False,
+                                       n_bootstrap: int = 0) -> Dict[str, Any]:
         """
         Evaluate benchmark results from file object.
         
@@ -507,13 +1154,11 @@ class BenchmarkRunner:
             - `file_object` (bytes or file-like): File object containing results data
             - `datasets_path` (Optional[Path]): Path to datasets directory
             - `output_file` (Optional[Path]): Output file for evaluation results
+            - `n_bootstrap` (int): Number of agent resamples for confidence intervals, 0 to skip
             
         - **Returns**:
             - `Dict[str, Any]`: Evaluation results and metadata
         """
-        # Import the function to load results from file object
-        from .cli.commands.evaluate import load_results_from_file_object
-        
         try:
             # Load results from file object
             results, metadata = load_results_from_file_object(file_object)
@@ -524,7 +1169,7 @@ class BenchmarkRunner:
             agent_filename = metadata.get("agent_filename", "unknown")
         if result_filename == "":
             result_filename = metadata.get("result_filename", "unknown")
-        return await self._evaluate_results(tenant_id, task_name, results, metadata, datasets_path, output_file, official_validated, agent_filename, result_filename)
+        return await self._evaluate_results(tenant_id, task_name, results, metadata, datasets_path, output_file, official_validated, agent_filename, result_filename, n_bootstrap)
 
     async def _evaluate_results(self,
                                tenant_id: str,
@@ -535,7 +1180,8 @@ class BenchmarkRunner:
                                output_file: Optional[Path] = None,
                                official_validated: bool = False,
                                agent_filename: str = "",
-                               result_filename: str = "") -> Dict[str, Any]:
+                               result_filename: str = "",
+                               n_bootstrap: int = 0) -> Dict[str, Any]:
         """
         Internal method to evaluate benchmark results.
         
@@ -550,6 +1196,7 @@ class BenchmarkRunner:
             - `metadata` (Dict[str, Any]): Metadata from the results file
             - `datasets_path` (Optional[Path]): Path to datasets directory
             - `output_file` (Optional[Path]): Output file for evaluation results
+            - `n_bootstrap` (int): Number of agent resamples for confidence intervals, 0 to skip
             
         - **Returns**:
             - `Dict[str, Any]`: Evaluation results and metadata
@@ -571,6 +1218,10 @@ class BenchmarkRunner:
                 datasets_path=str(datasets_path),
                 metadata=metadata
             )
+            if n_bootstrap:
+                evaluation_result["bootstrap"] = _bootstrap_evaluation(
+                    self._get_task_config(task_name), results, str(datasets_path), n_bootstrap
+                )
             
             # Save to output file if specified
             if output_file:
@@ -580,12 +1231,7 @@ class BenchmarkRunner:
             
             result_info = json.dumps(evaluation_result, ensure_ascii=False, indent=2, default=str)            
             # Get final score from result
-            final_score = 0.0
-            if isinstance(evaluation_result, dict) and "final_score" in evaluation_result:
-                try:
-                    final_score = float(evaluation_result["final_score"])
-                except (ValueError, TypeError):
-                    final_score = 0.0
+            final_score = self._final_score(evaluation_result)
             
             print(f"Evaluation Result: \n{evaluation_result}")
 
@@ -597,13 +1243,15 @@ class BenchmarkRunner:
                 task_name=task_name,
                 llm=metadata.get("llm", ""),
                 agent=metadata.get("agent", ""),
-                config_str=metadata.get("config", {}),
+                config_str=metadata.get("config", ""),
                 status=BenchmarkStatus.EVALUATED,
                 result_info=result_info,
+                metrics=evaluation_result,
                 final_score=final_score,
                 official_validated=official_validated,
                 agent_filename=agent_filename,
-                result_filename=result_filename
+                result_filename=result_filename,
+                group_id=metadata.get("group_id"),
             )
             
             return {
@@ -622,18 +1270,19 @@ class BenchmarkRunner:
                     task_name=task_name,
                     llm=metadata.get("llm", ""),
                     agent=metadata.get("agent", ""),
-                    config_str=metadata.get("config", {}),
+                    config_str=metadata.get("config", ""),
                     status=BenchmarkStatus.ERROR,
                     error=str(e),
                     official_validated=official_validated,
                     agent_filename=agent_filename,
-                    result_filename=result_filename
+                    result_filename=result_filename,
+                    group_id=metadata.get("group_id"),
                 )
             
             raise e
         finally:
             if database_writer:
-                await database_writer.close()
+                await _close_database_writer(database_writer, sys.exc_info()[1])
     
     def list_available_tasks(self) -> list:
         """
@@ -1,11 +1,47 @@
 """
 Logging and saving components
 """
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._base import TABLE_PREFIX, Base, MoneyDecimal
+    from .database import DatabaseWriter, DatabaseConfig, SQLiteTuning, EnginePool, ENGINE_POOL
+    from .type import StorageBenchmark
+    from .model import Benchmark
+    from .status_reader import StatusReader
+    from .reader import DatabaseReader
+    from .export import EXPORT_MANIFEST, export_experiment, ExportedStatusReader
+    from .retention import RetentionPolicy, ExperimentArchiver
+
+# sqlalchemy and agentsociety are imported on first access, so that the CLI can import
+# `storage.type` without them
+_LAZY_IMPORTS = {
+    "TABLE_PREFIX": "._base",
+    "Base": "._base",
+    "MoneyDecimal": "._base",
+    "DatabaseWriter": ".database",
+    "DatabaseConfig": ".database",
+    "SQLiteTuning": ".database",
+    "EnginePool": ".database",
+    "ENGINE_POOL": ".database",
+    "StorageBenchmark": ".type",
+    "Benchmark": ".model",
+    "StatusReader": ".status_reader",
+    "DatabaseReader": ".reader",
+    "EXPORT_MANIFEST": ".export",
+    "export_experiment": ".export",
+    "ExportedStatusReader": ".export",
+    "RetentionPolicy": ".retention",
+    "ExperimentArchiver": ".retention",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from ._base import TABLE_PREFIX, Base, MoneyDecimal
-from .database import DatabaseWriter, DatabaseConfig
-from .type import StorageBenchmark
-from .model import Benchmark
 
 __all__ = [
     "TABLE_PREFIX",
@@ -13,6 +49,16 @@ __all__ = [
     "MoneyDecimal",
     "DatabaseWriter",
     "DatabaseConfig",
+    "SQLiteTuning",
+    "EnginePool",
+    "ENGINE_POOL",
     "StorageBenchmark",
     "Benchmark",
+    "StatusReader",
+    "DatabaseReader",
+    "EXPORT_MANIFEST",
+    "export_experiment",
+    "ExportedStatusReader",
+    "RetentionPolicy",
+    "ExperimentArchiver",
 ]
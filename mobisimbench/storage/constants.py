@@ -0,0 +1,31 @@
+"""
+Benchmark statuses and table names, without the database dependencies so that the CLI can import them at startup
+"""
+import enum
+
+__all__ = ["BenchmarkStatus", "EXPERIMENT_TABLE_TYPES"]
+
+
+class BenchmarkStatus(enum.IntEnum):
+    """Benchmark status"""
+
+    NOT_STARTED = 0  # The benchmark is not started
+    RUNNING = 1  # The benchmark is running
+    FINISHED = 2  #  The benchmark is finished
+    EVALUATED = 3  # The benchmark has been evaluated
+    ERROR = 4  # The benchmark has error and stopped
+    ABORTED = 5  # The benchmark was stopped early by an abort rule
+
+
+EXPERIMENT_TABLE_TYPES = [
+    "agent_profile",
+    "agent_status",
+    "agent_dialog",
+    "agent_survey",
+    "global_prompt",
+    "pending_dialog",
+    "pending_survey",
+    "task_result",
+    "metric",
+]
+"""Per-experiment tables created by agentsociety for each run"""
@@ -1,8 +1,14 @@
 import asyncio
+import math
+import threading
+import time
 from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
 import uuid
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from pydantic import BaseModel, Field
+from sqlalchemy import Table, delete, event, insert, inspect, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
@@ -10,33 +16,241 @@ from agentsociety.storage import DatabaseConfig
 from agentsociety.utils.decorators import lock_decorator
 from .model import (
     Benchmark,
+    BenchmarkMetric,
 )
 from ._base import Base
 from .type import (
     StorageBenchmark,
 )
 
-__all__ = ["DatabaseWriter", "DatabaseConfig"]
+__all__ = ["DatabaseWriter", "DatabaseConfig", "SQLiteTuning", "EnginePool", "ENGINE_POOL", "create_shared_tables"]
 
 
-def _create_async_engine_from_config(config: DatabaseConfig, sqlite_path: Path):
-    return create_async_engine(config.get_dsn(sqlite_path))
+class SQLiteTuning(BaseModel):
+    """SQLite settings that let many processes share one database file"""
 
+    enabled: bool = Field(default=True)
+    """Whether to apply the settings below to every new connection"""
+
+    journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = Field(default="WAL")
+    """Journal mode; in WAL mode readers do not block the writer and commits append to the log"""
+
+    synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(default="NORMAL")
+    """fsync policy; NORMAL is durable across application crashes in WAL mode and fsyncs only at checkpoints"""
+
+    busy_timeout: int = Field(default=30000, ge=0)
+    """Milliseconds to wait for a lock held by another connection before failing with 'database is locked'"""
+
+    mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)
+    """Bytes of the database file read through memory mapping"""
+
+    wal_checkpoint_interval: float = Field(default=60.0, ge=0)
+    """Seconds between two passive WAL checkpoints run by the benchmark writers, 0 to leave them to SQLite"""
+
+
+def _add_missing_columns(sync_conn, table: Table):
+    """Add columns introduced after the table was first created (all of them are nullable)"""
+    existing = {column["name"] for column in inspect(sync_conn).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+def _add_missing_indexes(sync_conn, table: Table):
+    """Create indexes introduced after the table was first created, `create_all` skips existing tables"""
+    for index in table.indexes:
+        index.create(sync_conn, checkfirst=True)
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert an evaluation result to plain JSON types, non-finite numbers become null"""
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if hasattr(value, "tolist"):
+        # numpy scalars and arrays
+        return _json_safe(value.tolist())
+    if isinstance(value, (int, float)):
+        return value if math.isfinite(value) else None
+    return str(value)
+
+
+def _flatten_metrics(metrics: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Numeric values of nested dicts by dotted path, lists are only kept in the JSON column"""
+    flat: Dict[str, float] = {}
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten_metrics(value, prefix=f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            flat[name] = float(value)
+    return flat
+
+
+def _apply_sqlite_tuning(engine: AsyncEngine, tuning: SQLiteTuning):
+    """Set the pragmas of `tuning` on every connection the engine opens"""
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # the timeout first, switching the journal mode waits for other connections
+        cursor.execute(f"PRAGMA busy_timeout={tuning.busy_timeout}")
+        cursor.execute(f"PRAGMA journal_mode={tuning.journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={tuning.synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={tuning.mmap_size}")
+        cursor.close()
+
+    event.listen(engine.sync_engine, "connect", on_connect)
+
+
+class _PooledEngine:
+    """Engine of one DSN on one event loop, with its session factory"""
+
+    def __init__(self, engine: AsyncEngine, loop: asyncio.AbstractEventLoop, sqlite_tuning: Optional[SQLiteTuning] = None):
+        self.engine = engine
+        self.loop = loop
+        self.session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        self.tables_lock = asyncio.Lock()
+        self.sqlite_tuning = sqlite_tuning
+        self.last_checkpoint = time.monotonic()
+
+    async def checkpoint(self, force: bool = False):
+        """
+        Run a passive WAL checkpoint if the interval has passed since the last one.
+
+        - **Description**:
+            - A passive checkpoint copies what it can from the log into the database without waiting
+              for readers or writers, which keeps the log from growing while writers never pause
+        """
+        tuning = self.sqlite_tuning
+        if tuning is None or tuning.journal_mode != "WAL" or tuning.wal_checkpoint_interval == 0:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_checkpoint < tuning.wal_checkpoint_interval:
+            return
+        self.last_checkpoint = now
+        async with self.engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+class EnginePool:
+    """
+    Process-wide pool of async engines, shared by all database writers.
+
+    - **Description**:
+        - One engine (and its connection pool) per DSN and event loop: connections of async drivers
+          are bound to the loop that opened them, so each `asyncio.run` gets its own engine
+        - Call `dispose` before the event loop ends: engines of closed loops are only dropped, their
+          connections (and aiosqlite threads) are never closed
+        - The benchmark tables are created at most once per DSN and process
+    """
+
+    def __init__(self):
+        self._engines: Dict[Tuple[str, int], _PooledEngine] = {}
+        self._tables_created: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, config: DatabaseConfig, sqlite_path: Path) -> _PooledEngine:
+        """
+        Get the engine of a database on the running event loop, creating it if needed.
+
+        - **Args**:
+            - `config` (DatabaseConfig): Database configuration
+            - `sqlite_path` (Path): Path of the SQLite database file, if SQLite is used
+
+        - **Returns**:
+            - `_PooledEngine`: The engine and its session factory
+        """
+        dsn = config.get_dsn(sqlite_path)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for key, pooled in list(self._engines.items()):
+                if pooled.loop.is_closed():
+                    # connections of a closed loop cannot be closed anymore, only forgotten
+                    pooled.engine.sync_engine.dispose(close=False)
+                    del self._engines[key]
+            pooled = self._engines.get((dsn, id(loop)))
+            if pooled is None:
+                engine = create_async_engine(dsn)
+                # `BenchmarkDatabaseConfig` carries the SQLite settings, agentsociety's `DatabaseConfig` does not
+                sqlite_tuning = getattr(config, "sqlite", None) if config.db_type == "sqlite" else None
+                if sqlite_tuning is not None and sqlite_tuning.enabled:
+                    _apply_sqlite_tuning(engine, sqlite_tuning)
+                else:
+                    sqlite_tuning = None
+                pooled = _PooledEngine(engine, loop, sqlite_tuning)
+                self._engines[(dsn, id(loop))] = pooled
+            return pooled
+
+    async def create_tables(self, config: DatabaseConfig, sqlite_path: Path, shared: bool = False):
+        """
+        Create the benchmark and metric tables once per DSN, adding columns and indexes introduced
+        after they were created.
+
+        - **Args**:
+            - `config` (DatabaseConfig): Database configuration
+            - `sqlite_path` (Path): Path of the SQLite database file, if SQLite is used
+            - `shared` (bool): Also create agentsociety's experiment table
+        """
+        from agentsociety.storage.model import Experiment
+
+        dsn = config.get_dsn(sqlite_path)
+        if dsn in self._tables_created and not shared:
+            return
+        pooled = self.get(config, sqlite_path)
+        async with pooled.tables_lock:
+            if dsn in self._tables_created and not shared:
+                return
+            async with pooled.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=[Benchmark.__table__, BenchmarkMetric.__table__])
+                await conn.run_sync(_add_missing_columns, Benchmark.__table__)
+                await conn.run_sync(_add_missing_indexes, Benchmark.__table__)
+                if shared:
+                    await conn.run_sync(Experiment.metadata.create_all, tables=[Experiment.__table__])
+            self._tables_created.add(dsn)
+
+    async def dispose(self):
+        """
+        Close the connections of every engine created on the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            keys = [key for key, pooled in self._engines.items() if pooled.loop is loop]
+            pooled_engines = [self._engines.pop(key) for key in keys]
+        for pooled in pooled_engines:
+            await pooled.checkpoint(force=True)
+            await pooled.engine.dispose()
+
+
+ENGINE_POOL = EnginePool()
+"""Process-wide engine pool used by `DatabaseWriter`"""
+
+
+async def create_shared_tables(config: DatabaseConfig, sqlite_path: Path):
+    """
+    Create the tables shared by all experiments: the benchmark table and agentsociety's experiment table.
+
+    - **Description**:
+        - Run once before starting several writers in parallel processes, so that they do not
+          race on `CREATE TABLE` for the same database
+    """
+    await ENGINE_POOL.create_tables(config, sqlite_path, shared=True)
+
+_IMPORT_BATCH_SIZE = 500
+"""Rows / values per statement when importing, well below SQLite's limit of bound parameters"""
 
-async def _create_tables(config: DatabaseConfig, sqlite_path: Path):
-    """Create tables using SQLAlchemy"""
-    engine = _create_async_engine_from_config(config, sqlite_path)
-    
-    try:
-        async with engine.begin() as conn:
-            # Create benchmark table if not exists
-            await conn.run_sync(Base.metadata.create_all, tables=[Benchmark.__table__])
-                
-    finally:
-        await engine.dispose()
 
 class DatabaseWriter:
-    def __init__(self, tenant_id: str, exp_id: str, config: DatabaseConfig, home_dir: str):
+    def __init__(self,
+                 tenant_id: str,
+                 exp_id: str,
+                 config: DatabaseConfig,
+                 home_dir: str,
+                 write_behind: bool = False,
+                 write_behind_interval: float = 1.0):
         """
         Initialize database writer.
 
@@ -45,22 +259,34 @@ class DatabaseWriter:
             - `exp_id` (str): Experiment ID.
             - `config` (DatabaseConfig): Database configuration.
             - `home_dir` (str): Home directory. sqlite will be stored in home_dir/sqlite.db
+            - `write_behind` (bool): Queue benchmark updates and write them from a background task,
+              keeping only the latest update of each benchmark. `flush` or `close` writes the queue.
+            - `write_behind_interval` (float): Seconds between two background writes.
         """
         self.tenant_id = tenant_id
         self.exp_id = exp_id
         self._config = config
         self._lock = asyncio.Lock()
         self._sqlite_path = Path(home_dir) / "sqlite.db"
-        self._engine = _create_async_engine_from_config(config, sqlite_path=self._sqlite_path)
-        self._async_session = async_sessionmaker(self._engine, expire_on_commit=False)
+        self._pooled: Optional[_PooledEngine] = None
+        self._engine = None
+        self._async_session = None
+        self._write_behind = write_behind
+        self._write_behind_interval = write_behind_interval
+        self._pending: Dict[Tuple[str, str], StorageBenchmark] = {}
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def init(self):
-        """Initialize database tables"""
+        """Borrow the database engine from the pool and initialize database tables"""
+        pooled = ENGINE_POOL.get(self._config, self._sqlite_path)
+        self._pooled = pooled
+        self._engine = pooled.engine
+        self._async_session = pooled.session_factory
         await self._create_tables()
 
     async def _create_tables(self):
-        """Create tables"""
-        await _create_tables(self._config, self._sqlite_path)
+        """Create tables, once per database and process"""
+        await ENGINE_POOL.create_tables(self._config, self._sqlite_path)
 
     def _get_insert_func(self):
         """Get insert function based on database type"""
@@ -71,31 +297,75 @@ class DatabaseWriter:
         else:
             raise ValueError(f"Unsupported database type: {self._config.db_type}")
 
-    @lock_decorator
     async def update_benchmark_info(self, benchmark_info: StorageBenchmark):
+        """
+        Insert or update a benchmark row.
+
+        - **Description**:
+            - In write-behind mode the update replaces any queued update of the same (tenant_id, id)
+              and is written by the background task, otherwise it is written before returning
+        """
+        if not self._write_behind:
+            await self._write_benchmark_infos([benchmark_info])
+            return
+        self._pending[(benchmark_info.tenant_id, benchmark_info.id)] = benchmark_info
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self):
+        while self._pending:
+            await asyncio.sleep(self._write_behind_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                # the failed updates are queued again, the next flush retries them
+                print(f"Failed to write benchmark updates: {e}")
+
+    async def flush(self):
+        """Write every queued benchmark update in one transaction"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            await self._write_benchmark_infos(list(pending.values()))
+        except BaseException:
+            # also on cancellation: keep the updates queued, plus the newer ones made during the write
+            self._pending = {**pending, **self._pending}
+            raise
+
+    @lock_decorator
+    async def _write_benchmark_infos(self, benchmark_infos: List[StorageBenchmark]):
+        """Upsert benchmark rows and replace their metric rows, in one transaction"""
+        assert self._async_session is not None, "DatabaseWriter is not initialized, call init() first"
         insert_func = self._get_insert_func()
+        metrics = [_json_safe(benchmark_info.metrics) if benchmark_info.metrics is not None else None for benchmark_info in benchmark_infos]
         
         async with self._async_session() as session:
             try:
                 # Use SQLAlchemy upsert operation
-                stmt = insert_func(Benchmark).values(
-                    tenant_id=benchmark_info.tenant_id,
-                    id=uuid.UUID(self.exp_id),
-                    benchmark_name=benchmark_info.benchmark_name,
-                    llm=benchmark_info.llm,
-                    agent=benchmark_info.agent,
-                    status=benchmark_info.status,
-                    result_info=benchmark_info.result_info,
-                    final_score=benchmark_info.final_score,
-                    config=benchmark_info.config,
-                    error=benchmark_info.error,
-                    official_validated=benchmark_info.official_validated,
-                    agent_filename=benchmark_info.agent_filename,
-                    result_filename=benchmark_info.result_filename,
-                    created_at=benchmark_info.created_at,
-                    updated_at=benchmark_info.updated_at,
-                )
-                
+                stmt = insert_func(Benchmark).values([
+                    dict(
+                        tenant_id=benchmark_info.tenant_id,
+                        id=uuid.UUID(benchmark_info.id),
+                        benchmark_name=benchmark_info.benchmark_name,
+                        llm=benchmark_info.llm,
+                        agent=benchmark_info.agent,
+                        status=benchmark_info.status,
+                        result_info=benchmark_info.result_info,
+                        metrics=run_metrics,
+                        final_score=benchmark_info.final_score,
+                        config=benchmark_info.config,
+                        error=benchmark_info.error,
+                        official_validated=benchmark_info.official_validated,
+                        group_id=benchmark_info.group_id,
+                        agent_filename=benchmark_info.agent_filename,
+                        result_filename=benchmark_info.result_filename,
+                        result_hash=benchmark_info.result_hash,
+                        created_at=benchmark_info.created_at,
+                        updated_at=benchmark_info.updated_at,
+                    )
+                    for benchmark_info, run_metrics in zip(benchmark_infos, metrics)
+                ])
                 # Database-specific upsert operation
                 if self._config.db_type == "postgresql":
                     stmt = stmt.on_conflict_do_update(
@@ -106,10 +376,12 @@ class DatabaseWriter:
                             agent=stmt.excluded.agent,
                             status=stmt.excluded.status,
                             result_info=stmt.excluded.result_info,
+                            metrics=stmt.excluded.metrics,
                             final_score=stmt.excluded.final_score,
                             config=stmt.excluded.config,
                             error=stmt.excluded.error,
                             official_validated=stmt.excluded.official_validated,
+                            group_id=stmt.excluded.group_id,
                             agent_filename=stmt.excluded.agent_filename,
                             result_filename=stmt.excluded.result_filename,
                             updated_at=stmt.excluded.updated_at,
@@ -124,10 +396,12 @@ class DatabaseWriter:
                             agent=stmt.excluded.agent,
                             status=stmt.excluded.status,
                             result_info=stmt.excluded.result_info,
+                            metrics=stmt.excluded.metrics,
                             final_score=stmt.excluded.final_score,
                             config=stmt.excluded.config,
                             error=stmt.excluded.error,
                             official_validated=stmt.excluded.official_validated,
+                            group_id=stmt.excluded.group_id,
                             agent_filename=stmt.excluded.agent_filename,
                             result_filename=stmt.excluded.result_filename,
                             updated_at=stmt.excluded.updated_at,
@@ -135,12 +409,114 @@ class DatabaseWriter:
                     )
                 
                 await session.execute(stmt)
+                # The metric rows mirror the metrics of the latest state of each run
+                await session.execute(delete(BenchmarkMetric).where(
+                    tuple_(BenchmarkMetric.tenant_id, BenchmarkMetric.benchmark_id).in_(
+                        [(benchmark_info.tenant_id, uuid.UUID(benchmark_info.id)) for benchmark_info in benchmark_infos]
+                    )
+                ))
+                metric_rows = [
+                    dict(tenant_id=benchmark_info.tenant_id, benchmark_id=uuid.UUID(benchmark_info.id), name=name, value=value)
+                    for benchmark_info, run_metrics in zip(benchmark_infos, metrics)
+                    if isinstance(run_metrics, dict)
+                    for name, value in _flatten_metrics(run_metrics).items()
+                ]
+                if metric_rows:
+                    await session.execute(insert(BenchmarkMetric), metric_rows)
                 await session.commit()                
             except Exception:
                 await session.rollback()
                 raise
+        if self._pooled is not None:
+            await self._pooled.checkpoint()
+
+    async def existing_result_hashes(self, result_hashes: List[str], tenant_id: Optional[str] = None) -> Set[str]:
+        """
+        Get which results files were already imported.
+
+        - **Args**:
+            - `result_hashes` (List[str]): SHA-256 of the results files
+            - `tenant_id` (Optional[str]): Only rows of this tenant
+
+        - **Returns**:
+            - `Set[str]`: The hashes present in the benchmark table
+        """
+        assert self._async_session is not None, "DatabaseWriter is not initialized, call init() first"
+        existing: Set[str] = set()
+        async with self._async_session() as session:
+            for start in range(0, len(result_hashes), _IMPORT_BATCH_SIZE):
+                stmt = select(Benchmark.result_hash).where(Benchmark.result_hash.in_(result_hashes[start:start + _IMPORT_BATCH_SIZE]))
+                if tenant_id is not None:
+                    stmt = stmt.where(Benchmark.tenant_id == tenant_id)
+                existing.update((await session.execute(stmt)).scalars())
+        return existing
+
+    @lock_decorator
+    async def import_benchmark_infos(self, benchmark_infos: List[StorageBenchmark], batch_size: int = _IMPORT_BATCH_SIZE) -> int:
+        """
+        Insert benchmark rows imported from results files, in multi-row `INSERT ... ON CONFLICT` statements.
+
+        - **Description**:
+            - New runs are inserted as given
+            - Existing runs keep their status and scores, only `result_filename` and `result_hash` are
+              updated, and only if the hash differs, so re-importing the same files changes nothing
+            - Each batch is committed on its own
+
+        - **Args**:
+            - `benchmark_infos` (List[StorageBenchmark]): Rows with `result_hash` set, unique by (tenant_id, id)
+            - `batch_size` (int): Rows per statement, at most 1000 so that SQLite's limit of bound parameters holds
+
+        - **Returns**:
+            - `int`: Number of rows inserted or updated
+        """
+        assert self._async_session is not None, "DatabaseWriter is not initialized, call init() first"
+        insert_func = self._get_insert_func()
+        num_written = 0
+        async with self._async_session() as session:
+            for start in range(0, len(benchmark_infos), batch_size):
+                batch = benchmark_infos[start:start + batch_size]
+                stmt = insert_func(Benchmark).values([
+                    dict(benchmark_info.model_dump(exclude={"metrics"}), id=uuid.UUID(benchmark_info.id), metrics=None)
+                    for benchmark_info in batch
+                ])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["tenant_id", "id"],
+                    set_=dict(
+                        result_filename=stmt.excluded.result_filename,
+                        result_hash=stmt.excluded.result_hash,
+                        updated_at=stmt.excluded.updated_at,
+                    ),
+                    where=Benchmark.result_hash.is_distinct_from(stmt.excluded.result_hash),
+                )
+                try:
+                    result = await session.execute(stmt)
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+                num_written += max(result.rowcount, 0)
+        if self._pooled is not None:
+            await self._pooled.checkpoint()
+        return num_written
 
     async def close(self):
-        """Close database connection"""
-        if hasattr(self, "_engine"):
-            await self._engine.dispose()
\ No newline at end of file
+        """
+        Write the queued updates and return the engine to the pool.
+
+        - **Description**:
+            - The connections stay open for the next writer on the same event loop, `ENGINE_POOL.dispose()`
+              closes them
+        """
+        try:
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                try:
+                    await self._flush_task
+                except asyncio.CancelledError:
+                    pass
+                self._flush_task = None
+            await self.flush()
+        finally:
+            self._pooled = None
+            self._engine = None
+            self._async_session = None
\ No newline at end of file
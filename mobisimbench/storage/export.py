@@ -0,0 +1,277 @@
+"""
+Export of the per-experiment agentsociety tables to Parquet for offline analysis
+"""
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import agentsociety.storage.model as agentsociety_model
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, Uuid, inspect, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from mobisimbench.utils.status_columns import STATUS_COLUMNS, StatusColumns
+from .model import EXPERIMENT_TABLE_TYPES, experiment_tablename
+
+__all__ = ["EXPORT_MANIFEST", "export_experiment", "ExportedStatusReader"]
+
+EXPORT_MANIFEST = "export.json"
+"""Manifest written at the root of an export, with the exported tables, files and row counts"""
+
+PARTITION_COLUMN = "day"
+"""Tables with this column are written as one directory per value, `<table_type>/day=<value>/`"""
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(f"Parquet export requires pyarrow, install it with `pip install pyarrow`: {e}")
+    return pa, pq
+
+
+def _arrow_type(pa, column_type):
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        # timezone-aware values (PostgreSQL) are converted to UTC
+        return pa.timestamp("us")
+    # String, UUID and JSON (serialized) columns
+    return pa.string()
+
+
+def _arrow_values(column_type, values: Sequence[Any]) -> List[Any]:
+    """Convert database values to values accepted by the column's Arrow type"""
+    if isinstance(column_type, JSON):
+        return [json.dumps(value, ensure_ascii=False, default=str) if value is not None else None for value in values]
+    if isinstance(column_type, Uuid):
+        return [str(value) if value is not None else None for value in values]
+    if isinstance(column_type, DateTime):
+        return [
+            value.astimezone(timezone.utc).replace(tzinfo=None)
+            if isinstance(value, datetime) and value.tzinfo is not None else value
+            for value in values
+        ]
+    return list(values)
+
+
+class _PartitionedParquetWriter:
+    """
+    Writes the rows of one table as Parquet files, one per partition value.
+
+    - **Description**:
+        - Rows are buffered per partition and written as one row group once `rows_per_group` rows
+          are buffered, so memory is bounded by `rows_per_group` rows per open partition
+    """
+
+    def __init__(self, table_dir: Path, schema, partition_index: Optional[int], rows_per_group: int, compression: str):
+        self.pa, self.pq = _import_pyarrow()
+        self.table_dir = table_dir
+        self.schema = schema
+        self.partition_index = partition_index
+        self.rows_per_group = rows_per_group
+        self.compression = compression
+        self._buffers: Dict[Any, List[Sequence[Any]]] = {}
+        self._writers: Dict[Any, Any] = {}
+        self.files: List[str] = []
+        self.num_rows = 0
+
+    def _path(self, partition: Any) -> Path:
+        if self.partition_index is None:
+            return self.table_dir / "part-00000.parquet"
+        return self.table_dir / f"{PARTITION_COLUMN}={partition}" / "part-00000.parquet"
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]):
+        for row in rows:
+            partition = None
+            if self.partition_index is not None:
+                # the partition column is stored in the directory name only
+                partition = row[self.partition_index]
+                row = row[:self.partition_index] + row[self.partition_index + 1:]
+            buffer = self._buffers.setdefault(partition, [])
+            buffer.append(tuple(row))
+            if len(buffer) >= self.rows_per_group:
+                self._flush(partition)
+
+    def _flush(self, partition: Any):
+        rows = self._buffers.pop(partition, [])
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        arrays = [
+            self.pa.array(_arrow_values(column_type, values), type=field.type)
+            for (field, column_type), values in zip(self.schema, columns)
+        ]
+        table = self.pa.Table.from_arrays(arrays, schema=self.pa.schema([field for field, _ in self.schema]))
+        writer = self._writers.get(partition)
+        if writer is None:
+            path = self._path(partition)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = self.pq.ParquetWriter(path, table.schema, compression=self.compression)
+            self._writers[partition] = writer
+            self.files.append(str(path.relative_to(self.table_dir.parent)))
+        writer.write_table(table, row_group_size=self.rows_per_group)
+        self.num_rows += len(rows)
+
+    def close(self):
+        for partition in list(self._buffers):
+            self._flush(partition)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+async def export_experiment(engine: AsyncEngine,
+                            exp_id: str,
+                            output_dir: Path,
+                            table_types: Optional[Sequence[str]] = None,
+                            rows_per_group: int = 100_000,
+                            compression: str = "zstd") -> Dict[str, Any]:
+    """
+    Export the per-experiment agentsociety tables of a run to Parquet.
+
+    - **Description**:
+        - Each table is read with a server-side cursor (`yield_per`), so neither the database nor
+          this process holds more than `rows_per_group` rows per partition at a time
+        - Tables with a `day` column are partitioned by day, Hive style (`agent_status/day=0/part-00000.parquet`),
+          so readers such as `pyarrow.dataset` or DuckDB can prune days; the day is stored in the directory name only
+        - JSON columns are stored as JSON strings, UUIDs as strings, timestamps in UTC
+        - Tables that do not exist for the run are skipped
+        - `export.json` lists the exported tables, their files and row counts
+
+    - **Args**:
+        - `engine` (AsyncEngine): Engine of the database the run was written to
+        - `exp_id` (str): Experiment ID
+        - `output_dir` (Path): Output directory
+        - `table_types` (Optional[Sequence[str]]): Tables to export, `EXPERIMENT_TABLE_TYPES` by default
+        - `rows_per_group` (int): Rows per Parquet row group
+        - `compression` (str): Parquet compression codec
+
+    - **Returns**:
+        - `Dict[str, Any]`: The manifest
+    """
+    pa, _ = _import_pyarrow()
+    table_types = list(table_types or EXPERIMENT_TABLE_TYPES)
+    unknown = [table_type for table_type in table_types if table_type not in EXPERIMENT_TABLE_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown table types: {unknown}, expected some of {EXPERIMENT_TABLE_TYPES}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    async with engine.connect() as conn:
+        existing = set(await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()))
+
+    manifest: Dict[str, Any] = {
+        "exp_id": str(exp_id),
+        "exported_at": datetime.now().isoformat(),
+        "rows_per_group": rows_per_group,
+        "compression": compression,
+        "tables": {},
+    }
+    for table_type in table_types:
+        tablename = experiment_tablename(exp_id, table_type)
+        if tablename not in existing:
+            continue
+        table, _ = getattr(agentsociety_model, table_type)(tablename)
+        columns = list(table.columns)
+        names = [column.name for column in columns]
+        partition_index = names.index(PARTITION_COLUMN) if PARTITION_COLUMN in names else None
+        schema = [
+            (pa.field(column.name, _arrow_type(pa, column.type)), column.type)
+            for column in columns if column.name != PARTITION_COLUMN
+        ]
+        writer = _PartitionedParquetWriter(output_dir / table_type, schema, partition_index, rows_per_group, compression)
+        stmt = select(*columns).execution_options(yield_per=rows_per_group)
+        try:
+            async with engine.connect() as conn:
+                result = await conn.stream(stmt)
+                async for rows in result.partitions(rows_per_group):
+                    writer.write_rows(rows)
+        finally:
+            writer.close()
+        manifest["tables"][table_type] = {
+            "table": tablename,
+            "rows": writer.num_rows,
+            "partitioned_by": PARTITION_COLUMN if partition_index is not None else None,
+            "files": sorted(writer.files),
+        }
+
+    with open(output_dir / EXPORT_MANIFEST, "w") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+class ExportedStatusReader:
+    def __init__(self, export_dir: Path, chunk_size: int = 50_000):
+        """
+        Read the status rows of an export, with the interface of `StatusReader`.
+
+        - **Description**:
+            - Lets the tasks' `gather_results_stream` run offline on an export, e.g.
+              `gather_results_stream(ExportedStatusReader(path).iter_chunks(), aoi_table)`
+            - Reads one `day=` partition at a time, only the columns used for result gathering, and sorts
+              it by (agent id, t, created_at), so memory is bounded by the rows of one simulated day
+            - Unlike `StatusReader`, the rows of an agent are spread over the chunks of its days; they still
+              arrive in time order, which is what the tasks' status accumulators need
+
+        - **Args**:
+            - `export_dir` (Path): Directory written by `export_experiment`
+            - `chunk_size` (int): Number of rows per chunk
+        """
+        self.export_dir = Path(export_dir)
+        self.chunk_size = chunk_size
+
+    async def iter_chunks(self) -> AsyncIterator[StatusColumns]:
+        """
+        Iterate over status rows in chunks.
+
+        - **Yields**:
+            - `StatusColumns`: Up to `chunk_size` rows, ordered by (day, agent id, t, created_at)
+        """
+        pa, _ = _import_pyarrow()
+        import pyarrow.dataset as ds
+
+        status_dir = self.export_dir / "agent_status"
+        if not status_dir.exists():
+            raise FileNotFoundError(f"No agent_status table in export {self.export_dir}")
+        partitioning = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int64())]), flavor="hive")
+        dataset = ds.dataset(status_dir, format="parquet", partitioning=partitioning)
+        days = sorted({
+            ds.get_partition_keys(fragment.partition_expression)[PARTITION_COLUMN]
+            for fragment in dataset.get_fragments()
+        })
+        for day in days:
+            async for chunk in self._iter_day_chunks(dataset, day):
+                yield chunk
+
+    async def _iter_day_chunks(self, dataset, day: int) -> AsyncIterator[StatusColumns]:
+        import pyarrow.dataset as ds
+
+        # the partition filter only reads the files of this day
+        table = dataset.to_table(
+            columns=list(STATUS_COLUMNS) + ["created_at"], filter=ds.field(PARTITION_COLUMN) == day
+        )
+        table = table.sort_by([("id", "ascending"), ("t", "ascending"), ("created_at", "ascending")])
+        for start in range(0, table.num_rows, self.chunk_size):
+            chunk = table.slice(start, self.chunk_size)
+            parent_id = chunk.column("parent_id").to_numpy(zero_copy_only=False)
+            yield StatusColumns(
+                agent_id=chunk.column("id").to_numpy(zero_copy_only=False).astype("int64"),
+                day=chunk.column("day").to_numpy(zero_copy_only=False).astype("int64"),
+                t=chunk.column("t").to_numpy(zero_copy_only=False).astype("float64"),
+                parent_id=_fill_parent_id(parent_id),
+                action=chunk.column("action").to_numpy(zero_copy_only=False).astype(object),
+            )
+
+
+def _fill_parent_id(parent_id):
+    """Missing parent ids are -1, as in `StatusColumns.from_rows`"""
+    import numpy as np
+
+    parent_id = np.asarray(parent_id, dtype=np.float64)
+    return np.where(np.isnan(parent_id), -1, parent_id).astype(np.int64)
@@ -1,16 +1,46 @@
 
 import uuid
 from datetime import datetime
+from typing import Any, Optional
 
+from sqlalchemy import JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ._base import TABLE_PREFIX, Base
+from .constants import EXPERIMENT_TABLE_TYPES
+
+__all__ = ["Benchmark", "BenchmarkMetric", "EXPERIMENT_TABLE_TYPES", "experiment_tablename"]
+
+
+def experiment_tablename(exp_id, table_type: str) -> str:
+    """
+    Get the name of a per-experiment agentsociety table.
+
+    - **Args**:
+        - `exp_id` (str | uuid.UUID): Experiment ID
+        - `table_type` (str): One of `EXPERIMENT_TABLE_TYPES`
+
+    - **Returns**:
+        - `str`: Table name, e.g. `as_<exp_id>_agent_status`
+    """
+    return f"{TABLE_PREFIX}{str(exp_id).replace('-', '_')}_{table_type}"
 
 
 class Benchmark(Base):
     """Benchmark model"""
 
     __tablename__ = f"{TABLE_PREFIX}benchmark"
+    __table_args__ = (
+        # top-K by score per task, and status counts per task
+        Index(f"{TABLE_PREFIX}benchmark_task_status_score_idx", "benchmark_name", "status", "final_score"),
+        # top-K by score per task and LLM
+        Index(f"{TABLE_PREFIX}benchmark_task_llm_status_score_idx", "benchmark_name", "llm", "status", "final_score"),
+        # score history of an agent
+        Index(f"{TABLE_PREFIX}benchmark_agent_created_idx", "agent_filename", "created_at"),
+        # results files already imported
+        Index(f"{TABLE_PREFIX}benchmark_result_hash_idx", "result_hash"),
+    )
 
     tenant_id: Mapped[str] = mapped_column(primary_key=True)
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
@@ -19,12 +49,21 @@ class Benchmark(Base):
     agent: Mapped[str] = mapped_column()
     agent_filename: Mapped[str] = mapped_column()
     result_filename: Mapped[str] = mapped_column()
+    result_hash: Mapped[Optional[str]] = mapped_column(nullable=True, default=None)
+    """SHA-256 of the results file, set when the row was imported from it"""
     status: Mapped[int] = mapped_column()
+    archive_path: Mapped[Optional[str]] = mapped_column(nullable=True, default=None)
+    """Directory of the Parquet archive of the run's per-experiment tables, set when they were dropped by the retention policy"""
     result_info: Mapped[str] = mapped_column()
+    metrics: Mapped[Optional[Any]] = mapped_column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True, default=None
+    )
+    """Evaluation result as JSON (JSONB on PostgreSQL); its numeric values are also rows of `BenchmarkMetric`"""
     final_score: Mapped[float] = mapped_column()
     config: Mapped[str] = mapped_column()
     error: Mapped[str] = mapped_column()
     official_validated: Mapped[bool] = mapped_column(default=False)
+    group_id: Mapped[Optional[str]] = mapped_column(nullable=True, default=None)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.now, onupdate=datetime.now
@@ -33,47 +72,47 @@ class Benchmark(Base):
     @property
     def agent_profile_tablename(self):
         """Get agent profile table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_agent_profile"
+        return experiment_tablename(self.id, "agent_profile")
 
     @property
     def agent_status_tablename(self):
         """Get agent status table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_agent_status"
+        return experiment_tablename(self.id, "agent_status")
 
     @property
     def agent_dialog_tablename(self):
         """Get agent dialog table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_agent_dialog"
+        return experiment_tablename(self.id, "agent_dialog")
 
     @property
     def agent_survey_tablename(self):
         """Get agent survey table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_agent_survey"
+        return experiment_tablename(self.id, "agent_survey")
 
     @property
     def global_prompt_tablename(self):
         """Get global prompt table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_global_prompt"
+        return experiment_tablename(self.id, "global_prompt")
 
     @property
     def pending_dialog_tablename(self):
         """Get pending dialog table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_pending_dialog"
+        return experiment_tablename(self.id, "pending_dialog")
 
     @property
     def pending_survey_tablename(self):
         """Get pending survey table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_pending_survey"
+        return experiment_tablename(self.id, "pending_survey")
     
     @property
     def task_result_tablename(self):
         """Get task result table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_task_result"
+        return experiment_tablename(self.id, "task_result")
 
     @property
     def metric_tablename(self):
         """Get metric table name"""
-        return f"{TABLE_PREFIX}{str(self.id).replace('-', '_')}_metric"
+        return experiment_tablename(self.id, "metric")
 
     def to_dict(self):
         return {
@@ -83,12 +122,33 @@ class Benchmark(Base):
             "agent": self.agent,
             "agent_filename": self.agent_filename,
             "result_filename": self.result_filename,
+            "result_hash": self.result_hash,
             "status": self.status,
+            "archive_path": self.archive_path,
             "result_info": self.result_info,
+            "metrics": self.metrics,
             "final_score": self.final_score,
             "config": self.config,
             "error": self.error,
             "official_validated": self.official_validated,
+            "group_id": self.group_id,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
+
+
+class BenchmarkMetric(Base):
+    """One numeric evaluation metric of a benchmark run, e.g. `jsd_gyration_radius`"""
+
+    __tablename__ = f"{TABLE_PREFIX}benchmark_metric"
+    __table_args__ = (
+        # runs by metric value, e.g. every run with jsd_gyration_radius < 0.2
+        Index(f"{TABLE_PREFIX}benchmark_metric_name_value_idx", "name", "value"),
+    )
+
+    tenant_id: Mapped[str] = mapped_column(primary_key=True)
+    benchmark_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    """`id` of the `Benchmark` row"""
+    name: Mapped[str] = mapped_column(primary_key=True)
+    """Dotted path of the metric in the evaluation result, e.g. `detailed_metrics.change_rate_error.during_vs_before`"""
+    value: Mapped[float] = mapped_column()
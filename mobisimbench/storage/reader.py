@@ -0,0 +1,183 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from agentsociety.storage import DatabaseConfig
+from .database import ENGINE_POOL
+from .model import Benchmark, BenchmarkMetric
+from .type import BenchmarkStatus
+
+__all__ = ["DatabaseReader"]
+
+_SUMMARY_COLUMNS = (
+    Benchmark.tenant_id,
+    Benchmark.id,
+    Benchmark.benchmark_name,
+    Benchmark.llm,
+    Benchmark.agent_filename,
+    Benchmark.status,
+    Benchmark.final_score,
+    Benchmark.official_validated,
+    Benchmark.group_id,
+    Benchmark.created_at,
+)
+"""Columns returned by the listing queries, the large columns (config, agent, result_info, metrics) are left out"""
+
+
+class DatabaseReader:
+    def __init__(self, config: DatabaseConfig, home_dir: str):
+        """
+        Initialize read-only queries over the benchmark table.
+
+        - **Description**:
+            - Every query filters and sorts on a prefix of one of the `Benchmark` indexes and
+              pages with `limit` / `offset`, so it does not scan the whole table
+            - Borrows its engine from `ENGINE_POOL`, like `DatabaseWriter`
+
+        - **Args**:
+            - `config` (DatabaseConfig): Database configuration.
+            - `home_dir` (str): Home directory. sqlite is stored in home_dir/sqlite.db
+        """
+        self._config = config
+        self._sqlite_path = Path(home_dir) / "sqlite.db"
+
+    async def _fetch(self, stmt) -> List[Dict[str, Any]]:
+        await ENGINE_POOL.create_tables(self._config, self._sqlite_path)
+        pooled = ENGINE_POOL.get(self._config, self._sqlite_path)
+        async with pooled.engine.connect() as conn:
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    def _summary(row: Dict[str, Any]) -> Dict[str, Any]:
+        row["id"] = str(row["id"])
+        row["status"] = BenchmarkStatus(row["status"]).name
+        return row
+
+    async def top_scores(self,
+                         task_name: str,
+                         llm: Optional[str] = None,
+                         status: BenchmarkStatus = BenchmarkStatus.EVALUATED,
+                         official_validated: Optional[bool] = None,
+                         tenant_id: Optional[str] = None,
+                         limit: int = 10,
+                         offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get the best scored runs of a task.
+
+        - **Args**:
+            - `task_name` (str): Name of the benchmark task
+            - `llm` (Optional[str]): Only runs of this LLM
+            - `status` (BenchmarkStatus): Only runs with this status, evaluated runs by default
+            - `official_validated` (Optional[bool]): Only official / unofficial runs
+            - `tenant_id` (Optional[str]): Only runs of this tenant
+            - `limit` (int): Page size
+            - `offset` (int): Number of runs to skip
+
+        - **Returns**:
+            - `List[Dict[str, Any]]`: Runs by decreasing final score
+        """
+        stmt = select(*_SUMMARY_COLUMNS).where(
+            Benchmark.benchmark_name == task_name,
+            Benchmark.status == int(status),
+        )
+        if llm is not None:
+            stmt = stmt.where(Benchmark.llm == llm)
+        if official_validated is not None:
+            stmt = stmt.where(Benchmark.official_validated == official_validated)
+        if tenant_id is not None:
+            stmt = stmt.where(Benchmark.tenant_id == tenant_id)
+        stmt = stmt.order_by(Benchmark.final_score.desc(), Benchmark.created_at).limit(limit).offset(offset)
+        return [self._summary(row) for row in await self._fetch(stmt)]
+
+    async def status_counts(self,
+                            task_name: Optional[str] = None,
+                            tenant_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Count the runs of each task by status.
+
+        - **Args**:
+            - `task_name` (Optional[str]): Only runs of this task
+            - `tenant_id` (Optional[str]): Only runs of this tenant
+
+        - **Returns**:
+            - `List[Dict[str, Any]]`: `benchmark_name`, `status` name and `count`, by task and status
+        """
+        stmt = select(Benchmark.benchmark_name, Benchmark.status, func.count().label("count"))
+        if task_name is not None:
+            stmt = stmt.where(Benchmark.benchmark_name == task_name)
+        if tenant_id is not None:
+            stmt = stmt.where(Benchmark.tenant_id == tenant_id)
+        stmt = stmt.group_by(Benchmark.benchmark_name, Benchmark.status).order_by(Benchmark.benchmark_name, Benchmark.status)
+        rows = await self._fetch(stmt)
+        for row in rows:
+            row["status"] = BenchmarkStatus(row["status"]).name
+        return rows
+
+    async def score_history(self,
+                            agent_filename: str,
+                            task_name: Optional[str] = None,
+                            status: Optional[BenchmarkStatus] = BenchmarkStatus.EVALUATED,
+                            limit: int = 100,
+                            offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get the scores of an agent's runs over time.
+
+        - **Args**:
+            - `agent_filename` (str): Agent file name, as saved with the runs
+            - `task_name` (Optional[str]): Only runs of this task
+            - `status` (Optional[BenchmarkStatus]): Only runs with this status, all runs if None
+            - `limit` (int): Page size
+            - `offset` (int): Number of runs to skip
+
+        - **Returns**:
+            - `List[Dict[str, Any]]`: Runs by creation time, oldest first
+        """
+        stmt = select(*_SUMMARY_COLUMNS).where(Benchmark.agent_filename == agent_filename)
+        if task_name is not None:
+            stmt = stmt.where(Benchmark.benchmark_name == task_name)
+        if status is not None:
+            stmt = stmt.where(Benchmark.status == int(status))
+        stmt = stmt.order_by(Benchmark.created_at).limit(limit).offset(offset)
+        return [self._summary(row) for row in await self._fetch(stmt)]
+
+    async def runs_by_metric(self,
+                             name: str,
+                             task_name: Optional[str] = None,
+                             min_value: Optional[float] = None,
+                             max_value: Optional[float] = None,
+                             descending: bool = False,
+                             limit: int = 100,
+                             offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get the runs whose evaluation metric lies in a range, e.g. every run with `jsd_gyration_radius` < 0.2.
+
+        - **Description**:
+            - Filters and sorts on the (name, value) index of `BenchmarkMetric`, then joins the runs
+
+        - **Args**:
+            - `name` (str): Dotted metric name, e.g. `jsd_gyration_radius` or `detailed_metrics.change_rate_error.during_vs_before`
+            - `task_name` (Optional[str]): Only runs of this task
+            - `min_value` (Optional[float]): Lower bound, inclusive
+            - `max_value` (Optional[float]): Upper bound, exclusive
+            - `descending` (bool): Largest values first
+            - `limit` (int): Page size
+            - `offset` (int): Number of runs to skip
+
+        - **Returns**:
+            - `List[Dict[str, Any]]`: Runs with the metric `value`, by metric value
+        """
+        stmt = select(*_SUMMARY_COLUMNS, BenchmarkMetric.value).join(
+            Benchmark,
+            (Benchmark.tenant_id == BenchmarkMetric.tenant_id) & (Benchmark.id == BenchmarkMetric.benchmark_id),
+        ).where(BenchmarkMetric.name == name)
+        if min_value is not None:
+            stmt = stmt.where(BenchmarkMetric.value >= min_value)
+        if max_value is not None:
+            stmt = stmt.where(BenchmarkMetric.value < max_value)
+        if task_name is not None:
+            stmt = stmt.where(Benchmark.benchmark_name == task_name)
+        order = BenchmarkMetric.value.desc() if descending else BenchmarkMetric.value
+        stmt = stmt.order_by(order, Benchmark.created_at).limit(limit).offset(offset)
+        return [self._summary(row) for row in await self._fetch(stmt)]
@@ -0,0 +1,293 @@
+"""
+Retention policy for the per-experiment agentsociety tables: archive to Parquet, drop and compact
+"""
+import json
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import agentsociety.storage.model as agentsociety_model
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy import JSON, Uuid, func, inspect, select, text, update
+
+from agentsociety.storage import DatabaseConfig
+from .database import ENGINE_POOL
+from .export import EXPORT_MANIFEST, PARTITION_COLUMN, _import_pyarrow, export_experiment
+from .model import EXPERIMENT_TABLE_TYPES, Benchmark, experiment_tablename
+from .type import BenchmarkStatus
+
+__all__ = ["RetentionPolicy", "ExperimentArchiver"]
+
+
+class RetentionPolicy(BaseModel):
+    """
+    Which runs keep their per-experiment tables in the database; the tables of the other runs are archived.
+
+    At least one of `older_than_days` and `keep_per_agent` must be set to archive anything, so that a policy
+    left at its defaults never drops the tables of every stopped run.
+    """
+
+    older_than_days: Optional[float] = Field(default=None, ge=0)
+    """Archive runs created more than this many days ago; no age limit if not set"""
+
+    statuses: List[BenchmarkStatus] = Field(default=[
+        BenchmarkStatus.FINISHED,
+        BenchmarkStatus.EVALUATED,
+        BenchmarkStatus.ERROR,
+        BenchmarkStatus.ABORTED,
+    ])
+    """Archive only runs with one of these statuses (names or values), by default every run that has stopped"""
+
+    keep_per_agent: Optional[int] = Field(default=None, ge=0)
+    """Keep the tables of this many most recent runs of each agent file and tenant; no limit if not set"""
+
+    archive_dir: Optional[str] = Field(default=None)
+    """Directory of the archives, one sub-directory per run; `<home_dir>/archive` if not set"""
+
+    vacuum: bool = Field(default=True)
+    """Run VACUUM and ANALYZE after dropping tables, to give the space back and refresh the query planner statistics"""
+
+    @field_validator("statuses", mode="before")
+    @classmethod
+    def _status_names(cls, value):
+        if isinstance(value, (list, tuple)):
+            return [BenchmarkStatus[item.upper()] if isinstance(item, str) else item for item in value]
+        return value
+
+    @property
+    def is_bounded(self) -> bool:
+        """Whether the policy limits the runs it archives by age or keeps recent runs"""
+        return self.older_than_days is not None or self.keep_per_agent is not None
+
+
+class ExperimentArchiver:
+    def __init__(self, config: DatabaseConfig, home_dir: str):
+        """
+        Archive, drop and restore the per-experiment tables of benchmark runs.
+
+        - **Description**:
+            - A run's tables are exported to zstd-compressed Parquet with `export_experiment`, then dropped,
+              and the archive directory is saved in the `archive_path` column of its benchmark row
+            - `rehydrate` loads an archive back into the database, so the run can be inspected again
+            - Borrows its engine from `ENGINE_POOL`, like `DatabaseWriter`
+
+        - **Args**:
+            - `config` (DatabaseConfig): Database configuration.
+            - `home_dir` (str): Home directory. sqlite is stored in home_dir/sqlite.db
+        """
+        self._config = config
+        self._home_dir = Path(home_dir)
+        self._sqlite_path = self._home_dir / "sqlite.db"
+
+    async def _engine(self):
+        await ENGINE_POOL.create_tables(self._config, self._sqlite_path)
+        return ENGINE_POOL.get(self._config, self._sqlite_path).engine
+
+    async def select_runs(self, policy: RetentionPolicy, tenant_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the runs whose tables the policy archives.
+
+        - **Args**:
+            - `policy` (RetentionPolicy): Retention policy
+            - `tenant_id` (Optional[str]): Only runs of this tenant
+
+        - **Returns**:
+            - `List[Dict[str, Any]]`: `tenant_id`, `id`, `benchmark_name`, `agent_filename`, `status` name and
+              `created_at` of the runs not archived yet, oldest first
+        """
+        # rank of each run among the runs of its tenant and agent file, most recent first
+        rank = func.row_number().over(
+            partition_by=(Benchmark.tenant_id, Benchmark.agent_filename), order_by=Benchmark.created_at.desc()
+        ).label("rank")
+        ranked = select(
+            Benchmark.tenant_id,
+            Benchmark.id,
+            Benchmark.benchmark_name,
+            Benchmark.agent_filename,
+            Benchmark.status,
+            Benchmark.created_at,
+            Benchmark.archive_path,
+            rank,
+        )
+        if tenant_id is not None:
+            ranked = ranked.where(Benchmark.tenant_id == tenant_id)
+        ranked = ranked.subquery()
+        stmt = select(
+            ranked.c.tenant_id, ranked.c.id, ranked.c.benchmark_name, ranked.c.agent_filename, ranked.c.status, ranked.c.created_at
+        ).where(
+            ranked.c.archive_path.is_(None),
+            ranked.c.status.in_([int(status) for status in policy.statuses]),
+        )
+        if policy.older_than_days is not None:
+            stmt = stmt.where(ranked.c.created_at < datetime.now() - timedelta(days=policy.older_than_days))
+        if policy.keep_per_agent is not None:
+            stmt = stmt.where(ranked.c.rank > policy.keep_per_agent)
+        stmt = stmt.order_by(ranked.c.created_at)
+        engine = await self._engine()
+        async with engine.connect() as conn:
+            rows = [dict(row._mapping) for row in await conn.execute(stmt)]
+        for row in rows:
+            row["id"] = str(row["id"])
+            row["status"] = BenchmarkStatus(row["status"]).name
+        return rows
+
+    async def archive_run(self, tenant_id: str, exp_id: str, archive_dir: Path) -> Optional[Dict[str, Any]]:
+        """
+        Archive the per-experiment tables of a run to Parquet and drop them.
+
+        - **Description**:
+            - The tables are dropped and `archive_path` is set in one transaction, after the archive was written
+
+        - **Args**:
+            - `tenant_id` (str): Tenant ID of the run
+            - `exp_id` (str): Experiment ID
+            - `archive_dir` (Path): Directory of the archives, the run is archived to `<archive_dir>/<exp_id>`
+
+        - **Returns**:
+            - `Optional[Dict[str, Any]]`: The export manifest, None if the run has no tables
+        """
+        engine = await self._engine()
+        output_dir = Path(archive_dir).resolve() / str(exp_id)
+        manifest = await export_experiment(engine, exp_id, output_dir, compression="zstd")
+        if not manifest["tables"]:
+            (output_dir / EXPORT_MANIFEST).unlink(missing_ok=True)
+            try:
+                output_dir.rmdir()
+            except OSError:
+                pass
+            return None
+        async with engine.begin() as conn:
+            for table_type, table_info in manifest["tables"].items():
+                await conn.execute(text(f"DROP TABLE IF EXISTS {table_info['table']}"))
+            await conn.execute(
+                update(Benchmark)
+                .where(Benchmark.tenant_id == tenant_id, Benchmark.id == uuid.UUID(str(exp_id)))
+                .values(archive_path=str(output_dir))
+            )
+        return manifest
+
+    async def compact(self):
+        """
+        Give the space of dropped tables back to the file system and refresh the planner statistics.
+        """
+        engine = await self._engine()
+        async with engine.connect() as conn:
+            # VACUUM cannot run inside a transaction
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if engine.dialect.name == "sqlite":
+                await conn.exec_driver_sql("VACUUM")
+                await conn.exec_driver_sql("ANALYZE")
+            else:
+                await conn.exec_driver_sql("VACUUM ANALYZE")
+
+    async def apply(self,
+                    policy: RetentionPolicy,
+                    tenant_id: Optional[str] = None,
+                    dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Archive and drop the tables of every run selected by the policy, then compact the database.
+
+        - **Description**:
+            - Refuses a policy with neither `older_than_days` nor `keep_per_agent`, which would archive every
+              stopped run, including one that ended a minute ago; a dry run still lists what it selects
+
+        - **Args**:
+            - `policy` (RetentionPolicy): Retention policy
+            - `tenant_id` (Optional[str]): Only runs of this tenant
+            - `dry_run` (bool): Only select the runs
+
+        - **Returns**:
+            - `Dict[str, Any]`: `selected` runs, `archived` / `without_tables` run IDs, `tables` dropped,
+              and `errors` by run ID
+
+        - **Raises**:
+            - `ValueError`: The policy is not bounded and `dry_run` is not set
+        """
+        if not policy.is_bounded and not dry_run:
+            raise ValueError("The retention policy selects every stopped run, set older_than_days or keep_per_agent")
+        archive_dir = Path(policy.archive_dir) if policy.archive_dir else self._home_dir / "archive"
+        runs = await self.select_runs(policy, tenant_id=tenant_id)
+        summary: Dict[str, Any] = {"selected": runs, "archived": [], "without_tables": [], "tables": 0, "errors": {}}
+        if dry_run:
+            return summary
+        for run in runs:
+            try:
+                manifest = await self.archive_run(run["tenant_id"], run["id"], archive_dir)
+            except Exception as e:
+                summary["errors"][run["id"]] = str(e)
+                continue
+            if manifest is None:
+                summary["without_tables"].append(run["id"])
+            else:
+                summary["archived"].append(run["id"])
+                summary["tables"] += len(manifest["tables"])
+        if policy.vacuum and summary["tables"]:
+            await self.compact()
+        return summary
+
+    async def rehydrate(self, exp_id: str, tenant_id: Optional[str] = None, batch_size: int = 10_000) -> Dict[str, int]:
+        """
+        Load the archived tables of a run back into the database.
+
+        - **Description**:
+            - The archive is kept on disk; `archive_path` is cleared, so the retention policy may archive the run again
+
+        - **Args**:
+            - `exp_id` (str): Experiment ID
+            - `tenant_id` (Optional[str]): Tenant ID of the run, any tenant if not set
+            - `batch_size` (int): Rows per insert
+
+        - **Returns**:
+            - `Dict[str, int]`: Number of rows restored by table type
+        """
+        pa, _ = _import_pyarrow()
+        import pyarrow.dataset as ds
+
+        engine = await self._engine()
+        run_filter = [Benchmark.id == uuid.UUID(str(exp_id))]
+        if tenant_id is not None:
+            run_filter.append(Benchmark.tenant_id == tenant_id)
+        async with engine.connect() as conn:
+            archive_paths = (await conn.execute(select(Benchmark.archive_path).where(*run_filter))).scalars().all()
+        archive_paths = [path for path in archive_paths if path]
+        if not archive_paths:
+            raise ValueError(f"Run {exp_id} is not archived")
+        archive_dir = Path(archive_paths[0])
+        with open(archive_dir / EXPORT_MANIFEST) as f:
+            manifest = json.load(f)
+
+        async with engine.connect() as conn:
+            existing = set(await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()))
+        restored: Dict[str, int] = {}
+        async with engine.begin() as conn:
+            for table_type, table_info in manifest["tables"].items():
+                if table_type not in EXPERIMENT_TABLE_TYPES:
+                    continue
+                tablename = experiment_tablename(exp_id, table_type)
+                if tablename in existing:
+                    raise ValueError(f"Table {tablename} already exists")
+                table, _ = getattr(agentsociety_model, table_type)(tablename)
+                await conn.run_sync(table.create)
+                partitioning = None
+                if table_info.get("partitioned_by") == PARTITION_COLUMN:
+                    partitioning = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int64())]), flavor="hive")
+                dataset = ds.dataset(archive_dir / table_type, format="parquet", partitioning=partitioning)
+                json_columns = [column.name for column in table.columns if isinstance(column.type, JSON)]
+                uuid_columns = [column.name for column in table.columns if isinstance(column.type, Uuid)]
+                restored[table_type] = 0
+                for batch in dataset.to_batches(batch_size=batch_size):
+                    rows = batch.to_pylist()
+                    if not rows:
+                        continue
+                    for row in rows:
+                        for name in json_columns:
+                            if row.get(name) is not None:
+                                row[name] = json.loads(row[name])
+                        for name in uuid_columns:
+                            if row.get(name) is not None:
+                                row[name] = uuid.UUID(row[name])
+                    await conn.execute(table.insert(), rows)
+                    restored[table_type] += len(rows)
+            await conn.execute(update(Benchmark).where(*run_filter).values(archive_path=None))
+        return restored
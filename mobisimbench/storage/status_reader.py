@@ -0,0 +1,63 @@
+import bisect
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from agentsociety.storage.model import agent_status
+from mobisimbench.utils.status_columns import STATUS_COLUMNS, StatusColumns
+from .model import experiment_tablename
+
+__all__ = ["StatusReader"]
+
+
+class StatusReader:
+    def __init__(self, engine: AsyncEngine, exp_id: str, chunk_size: int = 50_000):
+        """
+        Initialize streaming status reader.
+
+        - **Description**:
+            - Pages through the per-experiment `agent_status` table (see `Benchmark.agent_status_tablename`)
+              ordered by agent, day and time, so gatherers can aggregate without materializing every row
+            - Uses a server-side cursor; chunks never split an agent, so peak memory is bounded by
+              `chunk_size` rows plus the rows of one agent
+
+        - **Args**:
+            - `engine` (AsyncEngine): Engine of the agentsociety database writer.
+            - `exp_id` (str): Experiment ID.
+            - `chunk_size` (int): Number of rows per chunk.
+        """
+        self.exp_id = exp_id
+        self.chunk_size = chunk_size
+        self._engine = engine
+        self._table, _ = agent_status(self.tablename)
+
+    @property
+    def tablename(self) -> str:
+        """Agent status table name"""
+        return experiment_tablename(self.exp_id, "agent_status")
+
+    async def iter_chunks(self) -> AsyncIterator[StatusColumns]:
+        """
+        Iterate over status rows in chunks.
+
+        - **Yields**:
+            - `StatusColumns`: Complete agents, ordered by (agent id, day, t, created_at); about `chunk_size` rows
+        """
+        table = self._table
+        stmt = select(*(table.c[column] for column in STATUS_COLUMNS))
+        stmt = stmt.order_by(table.c.id, table.c.day, table.c.t, table.c.created_at)
+        stmt = stmt.execution_options(yield_per=self.chunk_size)
+
+        # rows of the last agent of a partition, which may continue in the next one
+        carry = []
+        async with self._engine.connect() as conn:
+            result = await conn.stream(stmt)
+            async for rows in result.partitions(self.chunk_size):
+                rows = carry + list(rows)
+                last_agent_start = bisect.bisect_left(rows, rows[-1][0], key=lambda row: row[0])
+                carry = rows[last_agent_start:]
+                if last_agent_start > 0:
+                    yield StatusColumns.from_rows(rows[:last_agent_start])
+        if carry:
+            yield StatusColumns.from_rows(carry)
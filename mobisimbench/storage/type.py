@@ -1,21 +1,15 @@
-import enum
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .constants import EXPERIMENT_TABLE_TYPES, BenchmarkStatus
 
 __all__ = [
     "StorageBenchmark",
+    "BenchmarkStatus",
+    "EXPERIMENT_TABLE_TYPES",
 ]
 
-class BenchmarkStatus(enum.IntEnum):
-    """Benchmark status"""
-
-    NOT_STARTED = 0  # The benchmark is not started
-    RUNNING = 1  # The benchmark is running
-    FINISHED = 2  #  The benchmark is finished
-    EVALUATED = 3  # The benchmark has been evaluated
-    ERROR = 4  # The benchmark has error and stopped
-
-
 class StorageBenchmark(BaseModel):
     tenant_id: str
     id: str
@@ -24,11 +18,14 @@ class StorageBenchmark(BaseModel):
     agent: str
     agent_filename: str
     result_filename: str
+    result_hash: Optional[str] = None
     status: BenchmarkStatus
     result_info: str
+    metrics: Optional[Dict[str, Any]] = None
     final_score: float
     config: str
     error: str
     official_validated: bool
+    group_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
\ No newline at end of file
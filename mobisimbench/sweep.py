@@ -0,0 +1,324 @@
+"""
+Experiment matrix runner.
+
+This module expands a matrix of tasks x agents x LLM configs x seeds into
+independent benchmark runs and executes them in a process pool, collecting
+one manifest for the whole sweep.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+from agentsociety.configs import LLMConfig
+
+from mobisimbench.cli.config import BenchmarkConfig
+
+__all__ = ["SweepConfig", "SweepJob", "SweepRunner"]
+
+
+class SweepConfig(BaseModel):
+    """Configuration of an experiment matrix"""
+
+    tasks: List[str] = Field(..., min_length=1)
+    """Task names, e.g. DailyMobility"""
+
+    agents: List[str] = Field(..., min_length=1)
+    """Agent configuration files or .py files"""
+
+    llms: List[LLMConfig] = Field(default=[])
+    """LLM configurations, each one is a separate variant; if empty, the benchmark config's `llm` list is the only variant"""
+
+    seeds: List[int] = Field(default=[0], min_length=1)
+    """Random seeds, each combination is run once per seed"""
+
+    datasets: Dict[str, str] = Field(default={})
+    """Task name to datasets directory, defaults to `<home_dir>/datasets/<task>`"""
+
+    max_parallel: int = Field(default=1, ge=1)
+    """Maximum number of runs executed at the same time"""
+
+    mode: Literal["test", "inference"] = Field(default="inference")
+    """Execution mode of every run, must be supported by every task"""
+
+
+class SweepJob(BaseModel):
+    """One (task, agent, LLM config, seed) combination of a sweep"""
+
+    index: int
+    """Position in the expanded matrix"""
+
+    task_name: str
+    agent: str
+    llm: List[LLMConfig]
+    seed: int
+    datasets_path: str
+
+
+def _run_job(benchmark_config: BenchmarkConfig, job: SweepJob, mode: str, tenant_id: str) -> Dict[str, Any]:
+    """
+    Execute one sweep job in a worker process.
+
+    - **Returns**:
+        - `Dict[str, Any]`: Manifest entry of the run, the raw results stay in the result file
+    """
+    from mobisimbench.runner import BenchmarkRunner
+    from mobisimbench.storage.database import ENGINE_POOL
+
+    random.seed(job.seed)
+    np.random.seed(job.seed)
+
+    config = benchmark_config.model_copy(update={"llm": job.llm})
+    runner = BenchmarkRunner(config=config)
+    entry: Dict[str, Any] = {
+        "index": job.index,
+        "task_name": job.task_name,
+        "agent": job.agent,
+        "llm": job.llm[0].model,
+        "seed": job.seed,
+        "datasets_path": job.datasets_path,
+    }
+
+    async def run_job():
+        try:
+            return await runner.run(
+                tenant_id=tenant_id,
+                task_name=job.task_name,
+                agent_config=runner._load_agent_config(Path(job.agent)),
+                agent_filename=job.agent,
+                datasets_path=Path(job.datasets_path),
+                mode=mode,
+                save_results=True,
+            )
+        finally:
+            # workers run several jobs, each on its own event loop
+            await ENGINE_POOL.dispose()
+
+    start_time = time.perf_counter()
+    try:
+        result = asyncio.run(run_job())
+        evaluation = result.get("evaluation")
+        entry.update({
+            "success": True,
+            "exp_id": result.get("exp_id"),
+            "result_filename": result.get("result_filename"),
+            "evaluation": evaluation,
+            "final_score": evaluation.get("final_score") if isinstance(evaluation, dict) else None,
+        })
+    except Exception as e:
+        entry.update({"success": False, "error": str(e)})
+    entry["elapsed_seconds"] = time.perf_counter() - start_time
+    return entry
+
+
+class SweepRunner:
+    """
+    Runs an experiment matrix in a process pool.
+
+    - **Description**:
+        - Every job is a full `BenchmarkRunner.run` in its own process, so runs cannot share event loops,
+          database engines or agent class state
+        - Task datasets are prepared once in the parent before any worker starts: the map is parsed
+          into its `.cache` pickle and AOI table bundle, which workers then load instead of re-parsing
+        - Shared database tables are also created once in the parent
+        - The mode is checked against every task's `supported_modes` before any job starts, so that
+          no run is simulated only to fail at evaluation
+        - Finished runs are appended to a single JSON manifest, rewritten atomically after each run
+
+    - **Args**:
+        - `config` (BenchmarkConfig): Base benchmark configuration shared by all runs
+        - `sweep` (SweepConfig): Experiment matrix
+    """
+
+    def __init__(self,
+                 config: BenchmarkConfig,
+                 sweep: SweepConfig):
+        self.config = config
+        self.sweep = sweep
+        self.home_dir = Path(config.env.home_dir) if config.env.home_dir else Path.home() / ".mobisim-bench"
+
+    def datasets_path(self, task_name: str, default_datasets_dir: Path) -> Path:
+        """
+        Get the datasets directory of a task.
+
+        - **Args**:
+            - `task_name` (str): Name of the benchmark task
+            - `default_datasets_dir` (Path): Directory holding `<task>` dataset directories
+
+        - **Returns**:
+            - `Path`: Datasets directory of the task
+        """
+        if task_name in self.sweep.datasets:
+            return Path(self.sweep.datasets[task_name])
+        return default_datasets_dir / task_name
+
+    def jobs(self, default_datasets_dir: Path) -> List[SweepJob]:
+        """
+        Expand the matrix into jobs.
+
+        - **Args**:
+            - `default_datasets_dir` (Path): Directory holding `<task>` dataset directories
+
+        - **Returns**:
+            - `List[SweepJob]`: One job per (task, agent, LLM config, seed) combination
+        """
+        if self.sweep.llms:
+            llm_variants = [[llm] for llm in self.sweep.llms]
+        else:
+            assert self.config.llm is not None, "LLM is not provided, please provide LLM in the benchmark config or the sweep"
+            llm_variants = [self.config.llm]
+
+        jobs = []
+        for task_name, agent, llm, seed in itertools.product(
+            self.sweep.tasks, self.sweep.agents, llm_variants, self.sweep.seeds
+        ):
+            jobs.append(SweepJob(
+                index=len(jobs),
+                task_name=task_name,
+                agent=agent,
+                llm=llm,
+                seed=seed,
+                datasets_path=str(self.datasets_path(task_name, default_datasets_dir)),
+            ))
+        return jobs
+
+    def check_modes(self):
+        """
+        Check that every task supports the sweep's mode.
+
+        - **Raises**:
+            - `ValueError`: A task is unknown or does not support the mode
+        """
+        from mobisimbench.benchmarks import get_task_config
+
+        for task_name in self.sweep.tasks:
+            task_config = get_task_config(task_name)
+            if not task_config:
+                raise ValueError(f"Task '{task_name}' not found or invalid")
+            supported_modes = task_config.get("supported_modes", [])
+            if supported_modes and self.sweep.mode not in supported_modes:
+                raise ValueError(f"Task '{task_name}' does not support mode '{self.sweep.mode}', supported modes: {supported_modes}")
+
+    def prepare_datasets(self, jobs: List[SweepJob]):
+        """
+        Parse each task's map once so that workers only load the cached copies.
+
+        - **Args**:
+            - `jobs` (List[SweepJob]): Jobs of the sweep
+        """
+        from agentsociety.configs import MapConfig
+        from agentsociety.environment import MapData
+        from mobisimbench.benchmarks import get_task_config
+        from mobisimbench.utils.aoi_table import AoiTable
+
+        prepared = set()
+        for job in jobs:
+            task_config = get_task_config(job.task_name)
+            if not task_config:
+                raise ValueError(f"Task '{job.task_name}' not found or invalid")
+            if "map_filename" not in task_config:
+                continue
+            map_file_path = str(Path(job.datasets_path) / task_config["map_filename"])
+            if map_file_path in prepared or not os.path.exists(map_file_path):
+                continue
+            # MapData keeps its parsed copy in `<map>.cache`
+            try:
+                AoiTable.for_file(map_file_path)
+                needs_parse = not os.path.exists(map_file_path + ".cache")
+            except FileNotFoundError:
+                needs_parse = True
+            if needs_parse:
+                print(f"Preparing map {map_file_path}")
+                map = MapData(MapConfig(file_path=map_file_path), self.config.env.s3)
+                AoiTable.for_file(map_file_path, aois=map.aois)
+            prepared.add(map_file_path)
+
+    def prepare_database(self):
+        """
+        Create the shared database tables once, before the workers start writing in parallel.
+        """
+        from mobisimbench.storage.database import ENGINE_POOL, create_shared_tables
+
+        async def create():
+            try:
+                await create_shared_tables(self.config.env.db, self.home_dir / "sqlite.db")
+            finally:
+                await ENGINE_POOL.dispose()
+
+        if self.config.env.db.enabled:
+            asyncio.run(create())
+
+    def _write_manifest(self, manifest_path: Path, manifest: Dict[str, Any]):
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=manifest_path.name + ".", dir=manifest_path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, manifest_path)
+
+    def run(self,
+            default_datasets_dir: Path,
+            tenant_id: str = "",
+            manifest_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Run every job of the matrix.
+
+        - **Args**:
+            - `default_datasets_dir` (Path): Directory holding `<task>` dataset directories
+            - `tenant_id` (str): Tenant ID for database operations
+            - `manifest_path` (Optional[Path]): Manifest file, defaults to `<home_dir>/sweeps/sweep_<timestamp>.json`
+
+        - **Returns**:
+            - `Dict[str, Any]`: Manifest with one entry per run, ordered as the expanded matrix
+        """
+        self.check_modes()
+        jobs = self.jobs(default_datasets_dir)
+        if manifest_path is None:
+            manifest_path = self.home_dir / "sweeps" / f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+        self.prepare_datasets(jobs)
+        self.prepare_database()
+
+        manifest: Dict[str, Any] = {
+            "created_at": datetime.now().isoformat(),
+            "manifest_filename": str(manifest_path),
+            "sweep": self.sweep.model_dump(mode="json", exclude={"llms": {"__all__": {"api_key": True}}}),
+            "num_jobs": len(jobs),
+            "runs": [],
+        }
+        self._write_manifest(manifest_path, manifest)
+
+        max_workers = min(self.sweep.max_parallel, len(jobs))
+        # spawn: workers must not inherit the parent's event loop or database connections
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn")) as executor:
+            futures = {
+                executor.submit(_run_job, self.config, job, self.sweep.mode, tenant_id): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    # the worker process itself died
+                    entry = {"index": job.index, "task_name": job.task_name, "agent": job.agent,
+                             "llm": job.llm[0].model, "seed": job.seed, "success": False, "error": str(e)}
+                status = "finished" if entry["success"] else f"failed: {entry['error']}"
+                print(f"[{len(manifest['runs']) + 1}/{len(jobs)}] {job.task_name} {job.agent} {entry['llm']} seed={job.seed} {status}")
+                manifest["runs"].append(entry)
+                manifest["runs"].sort(key=lambda run: run["index"])
+                self._write_manifest(manifest_path, manifest)
+
+        manifest["finished_at"] = datetime.now().isoformat()
+        self._write_manifest(manifest_path, manifest)
+        return manifest
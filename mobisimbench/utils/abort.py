@@ -0,0 +1,144 @@
+"""
+Early abort of runs that are clearly failing
+"""
+import operator
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .accumulator import find_status_accumulator
+
+if TYPE_CHECKING:
+    from mobisimbench.cli.config import AbortRule
+
+__all__ = ["BenchmarkAborted", "AbortMonitor"]
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_AGGREGATES = {
+    "sum": np.sum,
+    "mean": np.mean,
+    "min": np.min,
+    "max": np.max,
+}
+
+
+class BenchmarkAborted(Exception):
+    """Raised when an abort rule stops a run"""
+
+
+def _lookup(source: Any, path: List[str]) -> Any:
+    """Follow a dotted path through dicts (keys) and lists / arrays (indices)"""
+    value = source
+    for part in path:
+        if isinstance(value, dict):
+            value = value[part]
+        else:
+            value = value[int(part)]
+    return value
+
+
+class AbortMonitor:
+    """
+    Simulation init function that checks abort rules while the simulation runs.
+
+    - **Description**:
+        - Wraps the engine's `write_statuses` after the task's status accumulator, so every rule is checked
+          right after the first step whose statuses reach its `after_hours`
+        - `results.*` metrics are read from the accumulator; other metrics from the task's evaluation of
+          the results so far, computed at most once per check
+        - A metric that cannot be computed yet is reported and does not abort the run
+        - When a rule holds, `reason` is set and `BenchmarkAborted` is raised, which ends the simulation
+        - Kept synchronous: the engine only awaits init functions that are coroutine functions
+
+    - **Args**:
+        - `config` (Any): Prepared simulation configuration, holding the status accumulator hook
+        - `rules` (List[AbortRule]): Rules to check
+        - `evaluate` (Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]): Evaluates partial results
+    """
+
+    def __init__(self,
+                 config: Any,
+                 rules: List["AbortRule"],
+                 evaluate: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        self.__name__ = type(self).__name__
+        self.config = config
+        self.rules = sorted(rules, key=lambda rule: rule.after_hours)
+        self.evaluate = evaluate
+        self.reason: Optional[str] = None
+        self._checked = 0
+        self._start: Optional[float] = None
+
+    def __call__(self, simulation: Any):
+        database_writer = simulation._database_writer
+        if database_writer is None:
+            print("Abort rules are not checked: the database is disabled, so no statuses are gathered")
+            return
+        self._start = self._seconds(simulation)
+        write_statuses = database_writer.write_statuses
+
+        async def write_and_check(rows):
+            await write_statuses(rows)
+            await self.check(simulation)
+
+        database_writer.write_statuses = write_and_check
+
+    @staticmethod
+    def _seconds(simulation: Any) -> float:
+        day, t = simulation.environment.get_datetime()
+        return day * 24 * 60 * 60 + t
+
+    def _elapsed_hours(self, simulation: Any) -> float:
+        now = self._seconds(simulation)
+        if self._start is None:
+            self._start = now
+        return (now - self._start) / (60 * 60)
+
+    async def check(self, simulation: Any):
+        """
+        Check the rules whose time has come.
+
+        - **Args**:
+            - `simulation` (Any): Running simulation engine
+        """
+        if self._checked == len(self.rules):
+            return
+        elapsed_hours = self._elapsed_hours(simulation)
+        accumulator = find_status_accumulator(self.config)
+        if accumulator is None:
+            return
+        results = None
+        evaluation = None
+        while self._checked < len(self.rules) and self.rules[self._checked].after_hours <= elapsed_hours:
+            rule = self.rules[self._checked]
+            self._checked += 1
+            try:
+                if results is None:
+                    results = accumulator.result()
+                path = rule.metric.split(".")
+                if path[0] == "results":
+                    value = _lookup(results, path[1:])
+                else:
+                    if evaluation is None:
+                        evaluation = await self.evaluate(results)
+                    value = _lookup(evaluation, path)
+                if rule.aggregate is not None:
+                    value = _AGGREGATES[rule.aggregate](np.asarray(value))
+                value = float(value)
+            except Exception as e:
+                print(f"Abort rule on {rule.metric} skipped after {elapsed_hours:.2f} simulated hours: {e}")
+                continue
+            if _OPERATORS[rule.op](value, rule.value):
+                self.reason = (
+                    f"{rule.description or 'abort rule'}: {rule.metric} = {value:.6g} {rule.op} {rule.value:g} "
+                    f"after {elapsed_hours:.2f} simulated hours"
+                )
+                print(f"Aborting run, {self.reason}")
+                raise BenchmarkAborted(self.reason)
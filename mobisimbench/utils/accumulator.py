@@ -0,0 +1,81 @@
+"""
+Incremental metric accumulation during the simulation
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+from .status_columns import StatusColumns
+
+__all__ = ["StatusAccumulator", "StatusAccumulatorHook", "find_status_accumulator"]
+
+
+class StatusAccumulator(ABC):
+    """
+    Base class of per-task metric accumulators.
+
+    - **Description**:
+        - `update` is called with batches of status rows; each agent's rows must arrive in time order,
+          which holds for per-step batches and for the chunks of `StatusReader` and `ExportedStatusReader`
+        - `result` returns the task results from the running counters, in O(agents)
+    """
+
+    @abstractmethod
+    def update(self, columns: StatusColumns):
+        ...
+
+    @abstractmethod
+    def result(self) -> dict:
+        ...
+
+
+class StatusAccumulatorHook:
+    """
+    Simulation init function that feeds every step's statuses to an accumulator.
+
+    - **Description**:
+        - Register it in `prepare_config` through `AgentsConfig.init_funcs`
+        - On init, it builds the accumulator from the simulation engine and wraps the engine's
+          `write_statuses`, so the accumulator sees exactly the rows persisted at each step
+        - Kept synchronous: the engine only awaits init functions that are coroutine functions
+        - Requires the database to be enabled, otherwise no statuses are saved
+
+    - **Args**:
+        - `factory` (Callable[[Any], StatusAccumulator]): Builds the accumulator from the simulation engine
+    """
+
+    def __init__(self, factory: Callable[[Any], StatusAccumulator]):
+        self.__name__ = type(self).__name__
+        self.factory = factory
+        self.accumulator: Optional[StatusAccumulator] = None
+
+    def __call__(self, simulation: Any):
+        database_writer = simulation._database_writer
+        if database_writer is None:
+            return
+        accumulator = self.factory(simulation)
+        write_statuses = database_writer.write_statuses
+
+        async def write_and_accumulate(rows):
+            await write_statuses(rows)
+            accumulator.update(StatusColumns.from_rows(
+                [(row.id, row.day, row.t, row.parent_id, row.action) for row in rows]
+            ))
+
+        database_writer.write_statuses = write_and_accumulate
+        self.accumulator = accumulator
+
+
+def find_status_accumulator(config: Any) -> Optional[StatusAccumulator]:
+    """
+    Get the accumulator registered in a simulation config, if any.
+
+    - **Args**:
+        - `config` (Config): Simulation configuration returned by `prepare_config`
+
+    - **Returns**:
+        - `Optional[StatusAccumulator]`: The initialized accumulator, None if no hook is registered or it did not run
+    """
+    for init_func in config.agents.init_funcs:
+        if isinstance(init_func, StatusAccumulatorHook):
+            return init_func.accumulator
+    return None
@@ -0,0 +1,289 @@
+"""
+Map-level AOI coordinate table shared by result gathering and agents
+"""
+import json
+import os
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from agentsociety.environment import MapData
+
+__all__ = ["AoiTable"]
+
+_BUNDLE_SUFFIX = ".aoi"
+_COLUMNS = ("ids", "cx", "cy", "land_use")
+
+# process-wide caches: bundle path -> table, MapData object -> table
+_TABLES_BY_PATH: Dict[str, "AoiTable"] = {}
+_TABLES_BY_MAP: "weakref.WeakKeyDictionary[Any, AoiTable]" = weakref.WeakKeyDictionary()
+
+
+class AoiTable:
+    """
+    Contiguous AOI id / centroid / land-use arrays for one map file.
+
+    - **Description**:
+        - `ids` is sorted, so the id -> row index is a binary search (`rows`)
+        - `cx`, `cy` hold the centroid of each AOI's `shapely_xy` geometry
+        - `land_use` holds an index into `land_use_names` (-1 if the AOI has no `urban_land_use`)
+        - Persisted as a directory of `.npy` files next to the map's `.pb.cache`,
+          loaded with `mmap_mode="r"` so every process shares the pages without parsing the map
+
+    - **Args**:
+        - `ids` (np.ndarray): Sorted AOI ids
+        - `cx` (np.ndarray): Centroid x of each AOI
+        - `cy` (np.ndarray): Centroid y of each AOI
+        - `land_use` (np.ndarray): Land-use code of each AOI
+        - `land_use_names` (list[str]): Land-use code to `urban_land_use` string
+    """
+
+    VERSION = 1
+
+    def __init__(self,
+                 ids: np.ndarray,
+                 cx: np.ndarray,
+                 cy: np.ndarray,
+                 land_use: np.ndarray,
+                 land_use_names: list[str]):
+        self.ids = ids
+        self.cx = cx
+        self.cy = cy
+        self.land_use = land_use
+        self.land_use_names = land_use_names
+        self._index: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ==================== BUILD / PERSIST ====================
+
+    @classmethod
+    def from_aois(cls, aois: Dict[int, dict]) -> "AoiTable":
+        """
+        Build the table from `MapData.aois`.
+
+        - **Args**:
+            - `aois` (Dict[int, dict]): AOI id to AOI dict with `shapely_xy` and optional `urban_land_use`
+
+        - **Returns**:
+            - `AoiTable`: Table sorted by AOI id
+        """
+        import shapely
+
+        ids = np.sort(np.fromiter(aois.keys(), dtype=np.int64, count=len(aois)))
+        geometries = np.array([aois[aoi_id]["shapely_xy"] for aoi_id in ids.tolist()], dtype=object)
+        centroids = shapely.centroid(geometries)
+        land_use_raw = [aois[aoi_id].get("urban_land_use") or "" for aoi_id in ids.tolist()]
+        land_use_names = sorted({name for name in land_use_raw if name})
+        name_to_code = {name: code for code, name in enumerate(land_use_names)}
+        land_use = np.fromiter(
+            (name_to_code.get(name, -1) for name in land_use_raw),
+            dtype=np.int32,
+            count=len(land_use_raw),
+        )
+        return cls(
+            ids=ids,
+            cx=np.ascontiguousarray(shapely.get_x(centroids), dtype=np.float64),
+            cy=np.ascontiguousarray(shapely.get_y(centroids), dtype=np.float64),
+            land_use=land_use,
+            land_use_names=land_use_names,
+        )
+
+    @staticmethod
+    def bundle_path(map_file_path: Union[str, Path]) -> Path:
+        """
+        Get the bundle directory for a map file, e.g. `beijing.pb` -> `beijing.pb.aoi/`.
+        """
+        return Path(str(map_file_path) + _BUNDLE_SUFFIX)
+
+    @staticmethod
+    def _source_stamp(map_file_path: Union[str, Path]) -> Dict[str, int]:
+        stat = os.stat(map_file_path)
+        return {"source_mtime_ns": stat.st_mtime_ns, "source_size": stat.st_size}
+
+    def save(self, bundle_path: Union[str, Path], meta: Optional[Dict[str, Any]] = None):
+        """
+        Write the table as `.npy` files plus `meta.json`, replacing any existing bundle atomically.
+
+        - **Args**:
+            - `bundle_path` (Union[str, Path]): Bundle directory
+            - `meta` (Optional[Dict[str, Any]]): Extra metadata, e.g. the source map stamp
+        """
+        bundle_path = Path(bundle_path)
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=bundle_path.name + ".", dir=bundle_path.parent))
+        try:
+            for column in _COLUMNS:
+                np.save(tmp_dir / f"{column}.npy", getattr(self, column))
+            with open(tmp_dir / "meta.json", "w") as f:
+                json.dump({
+                    "version": self.VERSION,
+                    "land_use_names": self.land_use_names,
+                    **(meta or {}),
+                }, f)
+            if bundle_path.exists():
+                shutil.rmtree(bundle_path, ignore_errors=True)
+            os.replace(tmp_dir, bundle_path)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, bundle_path: Union[str, Path]) -> "AoiTable":
+        """
+        Load a persisted bundle with memory-mapped columns.
+
+        - **Args**:
+            - `bundle_path` (Union[str, Path]): Bundle directory
+
+        - **Returns**:
+            - `AoiTable`: Read-only, memory-mapped table
+        """
+        bundle_path = Path(bundle_path)
+        meta = cls._read_meta(bundle_path)
+        if meta is None:
+            raise FileNotFoundError(f"AOI table bundle {bundle_path} does not exist or is invalid")
+        columns = {column: np.load(bundle_path / f"{column}.npy", mmap_mode="r") for column in _COLUMNS}
+        return cls(land_use_names=meta["land_use_names"], **columns)
+
+    @classmethod
+    def _read_meta(cls, bundle_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(bundle_path / "meta.json", "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != cls.VERSION:
+            return None
+        return meta
+
+    @classmethod
+    def from_map(cls, map: "MapData", map_file_path: Optional[Union[str, Path]] = None) -> "AoiTable":
+        """
+        Get the AOI table of a map, building it at most once per map file.
+
+        - **Description**:
+            - Returns the process-wide cached table if available
+            - With `map_file_path`, loads the persisted bundle if it matches the map file, otherwise
+              builds it from `map` and persists it for the next run / process
+            - Without `map_file_path`, builds from `map` and caches it for the lifetime of `map`
+
+        - **Args**:
+            - `map` (MapData): Loaded map data
+            - `map_file_path` (Optional[Union[str, Path]]): Path of the `.pb` map file
+
+        - **Returns**:
+            - `AoiTable`: AOI table
+        """
+        table = _TABLES_BY_MAP.get(map)
+        if table is not None:
+            return table
+        if map_file_path is None:
+            table = cls.from_aois(map.aois)
+        else:
+            table = cls.for_file(map_file_path, aois=map.aois)
+        _TABLES_BY_MAP[map] = table
+        return table
+
+    @classmethod
+    def for_file(cls, map_file_path: Union[str, Path], aois: Optional[Dict[int, dict]] = None) -> "AoiTable":
+        """
+        Get the AOI table persisted next to a map file.
+
+        - **Args**:
+            - `map_file_path` (Union[str, Path]): Path of the `.pb` map file
+            - `aois` (Optional[Dict[int, dict]]): `MapData.aois` used to (re)build a missing or stale bundle
+
+        - **Returns**:
+            - `AoiTable`: AOI table
+        """
+        bundle_path = cls.bundle_path(map_file_path)
+        key = str(bundle_path.resolve())
+        table = _TABLES_BY_PATH.get(key)
+        if table is not None:
+            return table
+
+        try:
+            stamp = cls._source_stamp(map_file_path)
+        except OSError:
+            stamp = {}
+        meta = cls._read_meta(bundle_path)
+        if meta is not None and all(meta.get(k) == v for k, v in stamp.items()):
+            table = cls.load(bundle_path)
+        elif aois is not None:
+            table = cls.from_aois(aois)
+            try:
+                table.save(bundle_path, meta=stamp)
+            except OSError as e:
+                print(f"Failed to save AOI table to {bundle_path}: {e}")
+        else:
+            raise FileNotFoundError(f"No up-to-date AOI table for {map_file_path}, load the map once to build it")
+        _TABLES_BY_PATH[key] = table
+        return table
+
+    # ==================== LOOKUP ====================
+
+    @property
+    def index(self) -> Dict[int, int]:
+        """AOI id to row dict, built lazily for scalar lookups"""
+        if self._index is None:
+            self._index = {aoi_id: row for row, aoi_id in enumerate(self.ids.tolist())}
+        return self._index
+
+    def rows(self, aoi_ids: Any) -> np.ndarray:
+        """
+        Vectorized id -> row lookup.
+
+        - **Args**:
+            - `aoi_ids` (array-like): AOI ids (any parent id is accepted)
+
+        - **Returns**:
+            - `np.ndarray`: Row of each id, -1 where the id is not an AOI of this map
+        """
+        aoi_ids = np.asarray(aoi_ids, dtype=np.int64)
+        if len(self.ids) == 0:
+            return np.full(aoi_ids.shape, -1, dtype=np.int64)
+        rows = np.searchsorted(self.ids, aoi_ids)
+        rows[rows == len(self.ids)] = 0
+        return np.where(self.ids[rows] == aoi_ids, rows, -1)
+
+    def xy(self, aoi_id: int) -> Tuple[float, float]:
+        """
+        Centroid of one AOI.
+
+        - **Args**:
+            - `aoi_id` (int): AOI id
+
+        - **Returns**:
+            - `Tuple[float, float]`: (x, y) centroid
+        """
+        row = self.index[aoi_id]
+        return float(self.cx[row]), float(self.cy[row])
+
+    def within(self, x: float, y: float, radius: float) -> np.ndarray:
+        """
+        AOI ids whose centroid lies strictly within `radius` of (x, y).
+
+        - **Args**:
+            - `x` (float): Center x
+            - `y` (float): Center y
+            - `radius` (float): Radius in meters
+
+        - **Returns**:
+            - `np.ndarray`: Matching AOI ids in ascending order
+        """
+        mask = (self.cx - x) ** 2 + (self.cy - y) ** 2 < radius * radius
+        return self.ids[mask]
+
+    def land_use_of(self, aoi_id: int) -> str:
+        """
+        `urban_land_use` string of one AOI ("" if unset).
+        """
+        code = int(self.land_use[self.index[aoi_id]])
+        return self.land_use_names[code] if code >= 0 else ""
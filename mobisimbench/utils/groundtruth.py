@@ -0,0 +1,94 @@
+"""
+Per-process registry of task ground truth
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+__all__ = ["GroundTruthRegistry", "GROUNDTRUTH_REGISTRY", "load_npy", "load_json"]
+
+
+def load_npy(path: str) -> np.ndarray:
+    """
+    Load a ground truth `.npy` file as a read-only memory map.
+    """
+    return np.load(path, mmap_mode="r", allow_pickle=False)
+
+
+def load_json(path: str) -> Any:
+    """
+    Load a ground truth JSON file.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class GroundTruthRegistry:
+    """
+    Loads each task's ground truth once per process and keeps it until its files change.
+
+    - **Description**:
+        - Entries are keyed by (task, datasets path, modification time of every ground truth file),
+          so replacing a file on disk makes the next lookup reload it
+        - `.npy` files are memory-mapped read-only, JSON files are parsed once
+        - A task can derive values from its ground truth (e.g. histograms), they are computed once
+          together with the load and stored in the same entry under `derived`
+        - The returned dicts are shared by all callers and must not be modified
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[Tuple[float, ...], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self,
+            task_name: str,
+            datasets_path: str,
+            files: Dict[str, str],
+            derive: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Get the ground truth of a task, loading it if needed.
+
+        - **Args**:
+            - `task_name` (str): Name of the benchmark task
+            - `datasets_path` (str): Path to the task's datasets directory
+            - `files` (Dict[str, str]): Ground truth name to file path relative to `datasets_path`;
+              `.npy` files are memory-mapped, `.json` files are parsed
+            - `derive` (Optional[Callable]): Computes derived values from the loaded ground truth
+
+        - **Returns**:
+            - `Dict[str, Any]`: Ground truth name to value, plus `derived` if `derive` is given
+        """
+        paths = {name: os.path.join(datasets_path, relative_path) for name, relative_path in files.items()}
+        mtimes = tuple(os.stat(path).st_mtime for path in paths.values())
+        key = (task_name, str(Path(datasets_path).resolve()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtimes:
+                return entry[1]
+            groundtruth: Dict[str, Any] = {}
+            for name, path in paths.items():
+                if path.endswith(".npy"):
+                    groundtruth[name] = load_npy(path)
+                elif path.endswith(".json"):
+                    groundtruth[name] = load_json(path)
+                else:
+                    raise ValueError(f"Unsupported ground truth file format: {path}")
+            if derive is not None:
+                groundtruth["derived"] = derive(groundtruth)
+            self._entries[key] = (mtimes, groundtruth)
+            return groundtruth
+
+    def clear(self):
+        """
+        Drop every loaded ground truth.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+GROUNDTRUTH_REGISTRY = GroundTruthRegistry()
+"""Process-wide registry used by the task evaluation functions"""
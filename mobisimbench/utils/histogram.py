@@ -0,0 +1,174 @@
+"""
+Fixed-bin histograms for distribution metrics
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["FixedBinHistogram", "jensenshannon_batch"]
+
+# added to every bin probability so that empty bins do not make the divergence infinite
+_EPSILON = 1e-10
+
+
+class FixedBinHistogram:
+    """
+    Histogram of a reference distribution with canonical bin edges.
+
+    - **Description**:
+        - The edges are fixed once, from a configured range or the reference data's range
+          (like `np.histogram`), and every other distribution is binned against the same edges,
+          so scores of different runs are comparable
+        - Binning is one `np.searchsorted` plus `np.bincount`; values outside the edges are counted in
+          the first / last bin instead of being dropped, non-finite values are dropped
+
+    - **Args**:
+        - `edges` (np.ndarray): Increasing bin edges, length `bins + 1`
+        - `reference` (np.ndarray): Bin probabilities of the reference distribution
+    """
+
+    def __init__(self, edges: np.ndarray, reference: np.ndarray):
+        self.edges = edges
+        self.reference = reference
+
+    @property
+    def bins(self) -> int:
+        return len(self.edges) - 1
+
+    @classmethod
+    def from_reference(cls,
+                       data: np.ndarray,
+                       bins: int = 50,
+                       range: Optional[Tuple[float, float]] = None) -> "FixedBinHistogram":
+        """
+        Fix the bin edges and the reference probabilities.
+
+        - **Args**:
+            - `data` (np.ndarray): Reference data, flattened
+            - `bins` (int): Number of bins
+            - `range` (Optional[Tuple[float, float]]): Range of the edges, defaults to the data's min / max
+
+        - **Returns**:
+            - `FixedBinHistogram`: Histogram of the reference data
+        """
+        data = np.asarray(data, dtype=np.float64).reshape(-1)
+        edges = np.histogram_bin_edges(data[np.isfinite(data)], bins=bins, range=range)
+        histogram = cls(edges, np.empty(0))
+        histogram.reference = histogram.probabilities(data)
+        return histogram
+
+    def counts(self, data: np.ndarray) -> np.ndarray:
+        """
+        Count the values of `data` (flattened) in each bin.
+
+        - **Args**:
+            - `data` (np.ndarray): Values to bin
+
+        - **Returns**:
+            - `np.ndarray`: Count of each bin, length `bins`
+        """
+        return self.counts_batch([data])[0]
+
+    def probabilities(self, data: np.ndarray) -> np.ndarray:
+        """
+        Smoothed bin probabilities of `data`, summing to 1.
+
+        - **Args**:
+            - `data` (np.ndarray): Values to bin
+
+        - **Returns**:
+            - `np.ndarray`: Probability of each bin, length `bins`
+        """
+        return self.probabilities_batch([data])[0]
+
+    def counts_batch(self, data: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Count the values of several runs in each bin with a single `np.searchsorted` and `np.bincount`.
+
+        - **Args**:
+            - `data` (Sequence[np.ndarray]): Values of each run, runs may have different lengths
+
+        - **Returns**:
+            - `np.ndarray`: Shape (n_runs, bins)
+        """
+        num_runs = len(data)
+        runs = [np.asarray(values, dtype=np.float64).reshape(-1) for values in data]
+        values = np.concatenate(runs) if runs else np.empty(0)
+        run_ids = np.repeat(np.arange(num_runs), [len(run) for run in runs])
+        finite = np.isfinite(values)
+        values, run_ids = values[finite], run_ids[finite]
+        # bins are closed on the left, the last one also on the right, like np.histogram
+        indices = np.clip(np.searchsorted(self.edges, values, side="right") - 1, 0, self.bins - 1)
+        return np.bincount(run_ids * self.bins + indices, minlength=num_runs * self.bins).reshape(num_runs, self.bins)
+
+    def probabilities_batch(self, data: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Smoothed bin probabilities of several runs, each row summing to 1.
+
+        - **Args**:
+            - `data` (Sequence[np.ndarray]): Values of each run
+
+        - **Returns**:
+            - `np.ndarray`: Shape (n_runs, bins)
+        """
+        return self.probabilities_from_counts(self.counts_batch(data))
+
+    def counts_by_row(self, data: np.ndarray) -> np.ndarray:
+        """
+        Count the values of each row of `data` in each bin, e.g. one row per agent.
+
+        - **Description**:
+            - Histograms of any combination of rows are sums of these rows, which is how bootstrap
+              resamples of agents are histogrammed without binning the data again
+
+        - **Args**:
+            - `data` (np.ndarray): Shape (n_rows,) or (n_rows, n_values)
+
+        - **Returns**:
+            - `np.ndarray`: Shape (n_rows, bins)
+        """
+        data = np.asarray(data, dtype=np.float64)
+        return self.counts_batch(data.reshape(len(data), -1))
+
+    @staticmethod
+    def probabilities_from_counts(counts: np.ndarray) -> np.ndarray:
+        """
+        Smoothed bin probabilities from bin counts, along the last axis.
+
+        - **Args**:
+            - `counts` (np.ndarray): Shape (..., bins)
+
+        - **Returns**:
+            - `np.ndarray`: Same shape, summing to 1 along the last axis
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        totals = counts.sum(axis=-1, keepdims=True)
+        probabilities = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0) + _EPSILON
+        return probabilities / probabilities.sum(axis=-1, keepdims=True)
+
+
+def jensenshannon_batch(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Jensen-Shannon distance along the last axis, same as `scipy.spatial.distance.jensenshannon`
+    (natural logarithm) applied to every row.
+
+    - **Args**:
+        - `p` (np.ndarray): Shape (..., bins), broadcast against `q`, e.g. one reference histogram
+        - `q` (np.ndarray): Shape (..., bins), e.g. one histogram per run
+
+    - **Returns**:
+        - `np.ndarray`: Distances, shape of the broadcast leading axes
+    """
+    p = np.asarray(p, dtype=np.float64)
+    q = np.asarray(q, dtype=np.float64)
+    p = p / p.sum(axis=-1, keepdims=True)
+    q = q / q.sum(axis=-1, keepdims=True)
+    p, q = np.broadcast_arrays(p, q)
+    m = (p + q) / 2
+
+    def relative_entropy(x):
+        # x * log(x / m), defined as 0 where x is 0
+        return np.where(x > 0, x * np.log(np.where(x > 0, x, 1) / np.where(x > 0, m, 1)), 0.0)
+
+    divergence = (relative_entropy(p) + relative_entropy(q)).sum(axis=-1) / 2
+    return np.sqrt(np.maximum(divergence, 0.0))
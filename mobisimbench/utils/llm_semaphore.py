@@ -0,0 +1,34 @@
+"""
+LLM request limits shared by several simulations in one process
+"""
+import asyncio
+from typing import Any, List
+
+__all__ = ["ShareLLMSemaphores"]
+
+
+class ShareLLMSemaphores:
+    """
+    Simulation init function that makes the simulation's LLM use shared semaphores.
+
+    - **Description**:
+        - Each simulation builds its own `LLM` with one semaphore per LLM config, so N concurrent
+          simulations would send up to N times `concurrency` requests; with this init function all of
+          them draw from the same semaphores instead
+        - Register it through `AgentsConfig.init_funcs`; the semaphores must match the LLM configs one to one
+
+    - **Args**:
+        - `semaphores` (List[asyncio.Semaphore]): One semaphore per LLM config
+    """
+
+    def __init__(self, semaphores: List[asyncio.Semaphore]):
+        self.__name__ = type(self).__name__
+        self.semaphores = semaphores
+
+    def __call__(self, simulation: Any):
+        llm = simulation._llm
+        if llm is None:
+            return
+        if len(llm._semaphores) != len(self.semaphores):
+            raise ValueError(f"Expected {len(llm._semaphores)} shared LLM semaphores, got {len(self.semaphores)}")
+        llm._semaphores = self.semaphores
@@ -0,0 +1,241 @@
+"""
+Columnar results file: one array per result metric plus JSON metadata
+"""
+import hashlib
+import io
+import json
+import os
+import pickle
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Tuple, Union
+
+import numpy as np
+
+__all__ = [
+    "RESULTS_FORMAT",
+    "RESULTS_FORMAT_VERSION",
+    "RESULTS_SUFFIX",
+    "LEGACY_RESULTS_SUFFIX",
+    "save_results",
+    "load_results",
+    "load_results_from_file_object",
+    "load_results_metadata",
+    "metadata_sidecar_path",
+    "file_sha256",
+]
+
+RESULTS_FORMAT = "mobisimbench-results"
+RESULTS_FORMAT_VERSION = 1
+RESULTS_SUFFIX = ".npz"
+LEGACY_RESULTS_SUFFIX = ".pkl"
+
+_METADATA_KEY = "__metadata__"
+_ZIP_MAGIC = b"PK\x03\x04"
+
+
+def metadata_sidecar_path(results_path: Union[str, Path]) -> Path:
+    """
+    Get the JSON metadata sidecar of a results file, e.g. `x_results.npz` -> `x_results.json`.
+    """
+    return Path(results_path).with_suffix(".json")
+
+
+def save_results(results_path: Union[str, Path], results: Dict[str, Any], metadata: Dict[str, Any]) -> Path:
+    """
+    Save task results as an uncompressed `.npz` archive plus a JSON metadata sidecar.
+
+    - **Description**:
+        - Every result metric is stored as its own array, so readers can memory-map it
+        - The metadata is stored both inside the archive (`__metadata__`, so a single file is
+          self-contained) and as `<name>.json` next to it for inspection without opening the archive
+        - Both files are replaced atomically
+
+    - **Args**:
+        - `results_path` (Union[str, Path]): Output `.npz` path
+        - `results` (Dict[str, Any]): Task results, metric name to list / array / number
+        - `metadata` (Dict[str, Any]): Run metadata, must be JSON serializable (paths are stored as strings)
+
+    - **Returns**:
+        - `Path`: Path of the written archive
+    """
+    results_path = Path(results_path)
+    arrays = {}
+    for name, value in results.items():
+        if name == _METADATA_KEY:
+            raise ValueError(f"Result metric name {_METADATA_KEY} is reserved")
+        try:
+            array = np.asarray(value)
+        except ValueError:
+            array = np.empty(0, dtype=object)
+        if array.dtype.hasobject:
+            raise ValueError(f"Result metric {name} is not a rectangular numeric array")
+        arrays[name] = array
+    metadata = {**metadata, "format": RESULTS_FORMAT, "format_version": RESULTS_FORMAT_VERSION}
+    metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2, default=str)
+    arrays[_METADATA_KEY] = np.frombuffer(metadata_json.encode("utf-8"), dtype=np.uint8)
+
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    sidecar_path = metadata_sidecar_path(results_path)
+    for path, write in (
+        (results_path, lambda f: np.savez(f, **arrays)),
+        (sidecar_path, lambda f: f.write(metadata_json.encode("utf-8"))),
+    ):
+        fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    return results_path
+
+
+def _mmap_npz(results_path: Path) -> Dict[str, np.ndarray]:
+    """Memory-map the members of an uncompressed `.npz` archive without copying"""
+    arrays = {}
+    with zipfile.ZipFile(results_path) as archive, open(results_path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                # compressed members cannot be mapped, decode them instead
+                with archive.open(info) as member:
+                    arrays[info.filename[:-4]] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+            name = info.filename[:-4]
+            # local file header: 30 bytes + file name + extra field, then the stored .npy bytes
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_length = int.from_bytes(header[26:28], "little")
+            extra_length = int.from_bytes(header[28:30], "little")
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"Results member {info.filename} holds Python objects")
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    results_path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                    order="F" if fortran_order else "C",
+                )
+    return arrays
+
+
+def _split_metadata(arrays: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    if _METADATA_KEY not in arrays:
+        raise ValueError("Invalid results file format: missing metadata")
+    metadata = json.loads(bytes(np.asarray(arrays.pop(_METADATA_KEY))).decode("utf-8"))
+    if metadata.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"Invalid results file format: {metadata.get('format')}")
+    if metadata.get("format_version", 0) > RESULTS_FORMAT_VERSION:
+        raise ValueError(f"Results format version {metadata['format_version']} is newer than supported ({RESULTS_FORMAT_VERSION})")
+    return arrays, metadata
+
+
+class _CrossPlatformUnpickler(pickle.Unpickler):
+    """
+    Unpickler for legacy results files that handles cross-platform path objects
+    """
+    def find_class(self, module, name):
+        # Handle WindowsPath objects by converting them to the current platform's Path
+        if module == 'pathlib' and name in ('WindowsPath', 'PosixPath'):
+            return Path
+        return super().find_class(module, name)
+
+
+def _load_legacy_pickle(file_object: BinaryIO) -> Tuple[Any, Dict[str, Any]]:
+    data = _CrossPlatformUnpickler(file_object).load()
+    if not isinstance(data, dict) or "results" not in data or "metadata" not in data:
+        raise ValueError("Invalid results file format: missing 'results' or 'metadata' keys")
+    return data["results"], data["metadata"]
+
+
+def load_results(results_path: Union[str, Path]) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Load a results file.
+
+    - **Description**:
+        - `.npz` (or its `.json` sidecar): columnar format, metrics are read-only memory-mapped arrays
+        - `.pkl`: legacy pickle format, read for compatibility with older runs
+
+    - **Args**:
+        - `results_path` (Union[str, Path]): Path to the results file
+
+    - **Returns**:
+        - `Tuple[Any, Dict[str, Any]]`: (results, metadata)
+    """
+    results_path = Path(results_path)
+    if results_path.suffix == ".json":
+        results_path = results_path.with_suffix(RESULTS_SUFFIX)
+    with open(results_path, "rb") as f:
+        is_columnar = f.read(4) == _ZIP_MAGIC
+        if not is_columnar:
+            f.seek(0)
+            return _load_legacy_pickle(f)
+    return _split_metadata(_mmap_npz(results_path))
+
+
+def load_results_metadata(results_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load only the metadata of a results file.
+
+    - **Description**:
+        - `.npz`: reads the `__metadata__` member, without mapping the metric arrays
+        - `.pkl`: the legacy format has to be unpickled entirely
+
+    - **Args**:
+        - `results_path` (Union[str, Path]): Path to the results file
+
+    - **Returns**:
+        - `Dict[str, Any]`: Run metadata
+    """
+    results_path = Path(results_path)
+    if results_path.suffix == ".json":
+        results_path = results_path.with_suffix(RESULTS_SUFFIX)
+    with open(results_path, "rb") as f:
+        if f.read(4) != _ZIP_MAGIC:
+            f.seek(0)
+            return _load_legacy_pickle(f)[1]
+    with zipfile.ZipFile(results_path) as archive, archive.open(_METADATA_KEY + ".npy") as member:
+        metadata_array = np.lib.format.read_array(member, allow_pickle=False)
+    return _split_metadata({_METADATA_KEY: metadata_array})[1]
+
+
+def file_sha256(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Hash a file in chunks, e.g. to recognize results files that were already imported.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_results_from_file_object(file_object: Union[bytes, BinaryIO]) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Load results from file content, in the columnar or the legacy pickle format.
+
+    - **Args**:
+        - `file_object` (bytes or file-like): File content
+
+    - **Returns**:
+        - `Tuple[Any, Dict[str, Any]]`: (results, metadata)
+    """
+    if isinstance(file_object, bytes):
+        content = file_object
+    elif hasattr(file_object, "read"):
+        content = file_object.read()
+    else:
+        raise ValueError("file_object must be bytes or a file-like object")
+    if content[:4] != _ZIP_MAGIC:
+        return _load_legacy_pickle(io.BytesIO(content))
+    with np.load(io.BytesIO(content), allow_pickle=False) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+    return _split_metadata(arrays)
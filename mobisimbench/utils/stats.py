@@ -0,0 +1,163 @@
+"""
+Aggregation of evaluation results over replicated runs
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+__all__ = [
+    "flatten_metrics",
+    "bootstrap_mean_ci",
+    "summarize_replicates",
+    "bootstrap_multiplicities",
+    "summarize_bootstrap",
+]
+
+
+def flatten_metrics(evaluation: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """
+    Collect the scalar numeric metrics of an evaluation result.
+
+    - **Description**:
+        - Nested dicts are flattened with dotted keys, e.g. `detailed_metrics.change_rate_error.during_vs_before`
+        - Lists / arrays (raw counts) and non-numeric values are skipped
+
+    - **Args**:
+        - `evaluation` (Dict[str, Any]): Evaluation result returned by a task's evaluation function
+        - `prefix` (str): Key prefix of nested metrics
+
+    - **Returns**:
+        - `Dict[str, float]`: Metric name to value
+    """
+    metrics = {}
+    for key, value in evaluation.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, prefix=f"{name}."))
+        elif isinstance(value, (bool, np.bool_)):
+            continue
+        elif isinstance(value, (int, float, np.integer, np.floating)):
+            metrics[name] = float(value)
+    return metrics
+
+
+def bootstrap_mean_ci(values: np.ndarray,
+                      n_bootstrap: int = 1000,
+                      confidence: float = 0.95,
+                      seed: Optional[int] = 0) -> np.ndarray:
+    """
+    Percentile bootstrap confidence interval of the mean, for several metrics at once.
+
+    - **Args**:
+        - `values` (np.ndarray): Shape (n_metrics, n_replicates)
+        - `n_bootstrap` (int): Number of bootstrap resamples
+        - `confidence` (float): Confidence level of the interval
+        - `seed` (Optional[int]): Seed of the resampling generator
+
+    - **Returns**:
+        - `np.ndarray`: Shape (n_metrics, 2), lower and upper bound of each metric's mean
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[-1]
+    rng = np.random.default_rng(seed)
+    # the same resample indices for every metric, so the intervals are jointly consistent
+    indices = rng.integers(0, n, size=(n_bootstrap, n))
+    means = values[:, indices].mean(axis=-1)
+    alpha = (1 - confidence) / 2
+    return np.quantile(means, [alpha, 1 - alpha], axis=-1).T
+
+
+def summarize_replicates(evaluations: List[Dict[str, Any]],
+                         n_bootstrap: int = 1000,
+                         confidence: float = 0.95,
+                         seed: Optional[int] = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Mean, standard deviation and bootstrap CI of every metric over replicates.
+
+    - **Args**:
+        - `evaluations` (List[Dict[str, Any]]): Evaluation result of each replicate
+        - `n_bootstrap` (int): Number of bootstrap resamples
+        - `confidence` (float): Confidence level of the interval
+        - `seed` (Optional[int]): Seed of the resampling generator
+
+    - **Returns**:
+        - `Dict[str, Dict[str, float]]`: Metric name to `n`, `mean`, `std`, `ci_low` and `ci_high`;
+          only metrics present in every replicate are reported
+    """
+    if not evaluations:
+        return {}
+    flat = [flatten_metrics(evaluation) for evaluation in evaluations]
+    names = [name for name in flat[0] if all(name in metrics for metrics in flat[1:])]
+    if not names:
+        return {}
+    values = np.array([[metrics[name] for metrics in flat] for name in names], dtype=np.float64)
+    n = values.shape[1]
+    means = values.mean(axis=1)
+    stds = values.std(axis=1, ddof=1) if n > 1 else np.zeros(len(names))
+    ci = bootstrap_mean_ci(values, n_bootstrap=n_bootstrap, confidence=confidence, seed=seed)
+    return {
+        name: {
+            "n": n,
+            "mean": float(means[i]),
+            "std": float(stds[i]),
+            "ci_low": float(ci[i, 0]),
+            "ci_high": float(ci[i, 1]),
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def bootstrap_multiplicities(n: int, n_bootstrap: int = 1000, seed: Optional[int] = 0) -> np.ndarray:
+    """
+    How often each of `n` items is drawn in each bootstrap resample.
+
+    - **Description**:
+        - The resamples are drawn as one (n_bootstrap, n) index matrix and turned into counts with a
+          single `np.bincount`, so a statistic that is a sum over items (e.g. histogram counts) of all
+          resamples is one matrix product `multiplicities @ per_item_values`
+
+    - **Args**:
+        - `n` (int): Number of items, e.g. agents
+        - `n_bootstrap` (int): Number of bootstrap resamples
+        - `seed` (Optional[int]): Seed of the resampling generator
+
+    - **Returns**:
+        - `np.ndarray`: Shape (n_bootstrap, n), each row sums to `n`
+    """
+    if n <= 0:
+        raise ValueError("Cannot bootstrap an empty sample")
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, n, size=(n_bootstrap, n))
+    offsets = np.arange(n_bootstrap)[:, None] * n
+    return np.bincount((indices + offsets).reshape(-1), minlength=n_bootstrap * n).reshape(n_bootstrap, n)
+
+
+def summarize_bootstrap(replicates: Dict[str, np.ndarray], confidence: float = 0.95) -> Dict[str, Dict[str, float]]:
+    """
+    Mean, standard deviation and percentile interval of bootstrap replicates of each metric.
+
+    - **Args**:
+        - `replicates` (Dict[str, np.ndarray]): Metric name to its value in each resample
+        - `confidence` (float): Confidence level of the interval
+
+    - **Returns**:
+        - `Dict[str, Dict[str, float]]`: Metric name to `n`, `mean`, `std`, `ci_low` and `ci_high`;
+          non-finite replicates (e.g. a resample with a zero denominator) are left out and not counted in `n`
+    """
+    alpha = (1 - confidence) / 2
+    summary = {}
+    for name, values in replicates.items():
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            summary[name] = {"n": 0, "mean": float("nan"), "std": float("nan"), "ci_low": float("nan"), "ci_high": float("nan")}
+            continue
+        ci_low, ci_high = np.quantile(values, [alpha, 1 - alpha])
+        summary[name] = {
+            "n": int(values.size),
+            "mean": float(values.mean()),
+            "std": float(values.std(ddof=1)) if values.size > 1 else 0.0,
+            "ci_low": float(ci_low),
+            "ci_high": float(ci_high),
+        }
+    return summary
@@ -0,0 +1,135 @@
+"""
+Columnar view of agentsociety status rows for vectorized result gathering
+"""
+from typing import Any, Dict, Iterable, Sequence
+
+import numpy as np
+
+__all__ = ["STATUS_COLUMNS", "StatusColumns", "AgentSlots"]
+
+STATUS_COLUMNS = ("id", "day", "t", "parent_id", "action")
+"""Status table columns used for result gathering, in `from_rows` order"""
+
+
+class StatusColumns:
+    """
+    Status rows stored as contiguous NumPy columns.
+
+    - **Description**:
+        - Converts the list of status dicts returned by `read_statuses()` into one array per column
+        - Row order is preserved, so per-agent sequences keep the order of the database read
+
+    - **Args**:
+        - `agent_id` (np.ndarray): Agent id of each row
+        - `day` (np.ndarray): Simulated day of each row
+        - `t` (np.ndarray): Simulated time of day (seconds) of each row
+        - `parent_id` (np.ndarray): Parent (AOI / lane) id of each row
+        - `action` (np.ndarray): Action string of each row (object array)
+    """
+
+    def __init__(self,
+                 agent_id: np.ndarray,
+                 day: np.ndarray,
+                 t: np.ndarray,
+                 parent_id: np.ndarray,
+                 action: np.ndarray):
+        self.agent_id = agent_id
+        self.day = day
+        self.t = t
+        self.parent_id = parent_id
+        self.action = action
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "StatusColumns":
+        """
+        Build columns from status row dicts.
+
+        - **Args**:
+            - `records` (Iterable[Dict[str, Any]]): Status rows with `id`, `day`, `t`, `parent_id` and `action` keys
+
+        - **Returns**:
+            - `StatusColumns`: Columnar status table
+        """
+        return cls.from_rows([tuple(r[column] for column in STATUS_COLUMNS) for r in records])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "StatusColumns":
+        """
+        Build columns from status row tuples.
+
+        - **Args**:
+            - `rows` (Sequence[Sequence[Any]]): Status rows with values in `STATUS_COLUMNS` order
+
+        - **Returns**:
+            - `StatusColumns`: Columnar status table
+        """
+        n = len(rows)
+        agent_id = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        day = np.fromiter((r[1] for r in rows), dtype=np.int64, count=n)
+        t = np.fromiter((r[2] for r in rows), dtype=np.float64, count=n)
+        parent_id = np.fromiter(
+            (r[3] if r[3] is not None else -1 for r in rows),
+            dtype=np.int64,
+            count=n,
+        )
+        action = np.empty(n, dtype=object)
+        action[:] = [r[4] for r in rows]
+        return cls(agent_id, day, t, parent_id, action)
+
+    def __len__(self) -> int:
+        return len(self.agent_id)
+
+    def action_codes(self, mapping: Dict[str, int], default: int) -> np.ndarray:
+        """
+        Encode the action column with a lookup table.
+
+        - **Args**:
+            - `mapping` (Dict[str, int]): Action string to code mapping
+            - `default` (int): Code used for actions missing from the mapping
+
+        - **Returns**:
+            - `np.ndarray`: Integer code of each row
+        """
+        return np.fromiter(
+            (mapping.get(a, default) for a in self.action),
+            dtype=np.int64,
+            count=len(self.action),
+        )
+
+
+class AgentSlots:
+    """
+    Stable agent id -> slot mapping.
+
+    - **Description**:
+        - Slots are dense indices assigned in order of first appearance, across any number of `lookup` calls
+        - Lets accumulators keep per-agent state in plain arrays indexed by slot
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        """Agent id of each slot"""
+        self._sorted_ids = np.empty(0, dtype=np.int64)
+        self._sorted_slots = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def lookup(self, agent_ids: np.ndarray) -> np.ndarray:
+        """
+        Map agent ids to slots, assigning new slots to unseen agents.
+
+        - **Args**:
+            - `agent_ids` (np.ndarray): Agent id of each row
+
+        - **Returns**:
+            - `np.ndarray`: Slot of each row
+        """
+        uniq, first = np.unique(agent_ids, return_index=True)
+        unseen = ~np.isin(uniq, self._sorted_ids, assume_unique=True)
+        if unseen.any():
+            new_ids = uniq[unseen][np.argsort(first[unseen], kind="stable")]
+            self.ids = np.concatenate([self.ids, new_ids])
+            self._sorted_slots = np.argsort(self.ids, kind="stable")
+            self._sorted_ids = self.ids[self._sorted_slots]
+        return self._sorted_slots[np.searchsorted(self._sorted_ids, agent_ids)]
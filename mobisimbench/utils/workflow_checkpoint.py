@@ -0,0 +1,58 @@
+"""
+Callbacks between the workflow steps of a simulation
+"""
+from typing import Any, Awaitable, Callable
+
+from agentsociety.configs import Config, WorkflowStepConfig, WorkflowType
+
+__all__ = ["WorkflowCheckpoint", "add_workflow_checkpoints"]
+
+
+class WorkflowCheckpoint:
+    """
+    Workflow `FUNCTION` step that calls back with the index of the step it follows.
+
+    - **Description**:
+        - The engine awaits `func(simulation)` of FUNCTION steps, so the callback runs inside the
+          simulation, after every status of the preceding step has been written
+        - `__name__` is set because the workflow config serializes functions by name
+
+    - **Args**:
+        - `step_index` (int): Index of the preceding step in the original workflow
+        - `callback` (Callable[[int, Any], Awaitable[None]]): Called with the step index and the simulation engine
+    """
+
+    def __init__(self, step_index: int, callback: Callable[[int, Any], Awaitable[None]]):
+        self.__name__ = type(self).__name__
+        self.step_index = step_index
+        self.callback = callback
+
+    async def __call__(self, simulation: Any):
+        await self.callback(self.step_index, simulation)
+
+
+def add_workflow_checkpoints(config: Config, callback: Callable[[int, Any], Awaitable[None]]) -> int:
+    """
+    Insert a checkpoint after every RUN and STEP step of the workflow.
+
+    - **Args**:
+        - `config` (Config): Simulation configuration returned by `prepare_config`, modified in place
+        - `callback` (Callable[[int, Any], Awaitable[None]]): Called with the index of the finished step
+          and the simulation engine
+
+    - **Returns**:
+        - `int`: Number of checkpoints inserted
+    """
+    workflow = []
+    num_checkpoints = 0
+    for step_index, step in enumerate(config.exp.workflow):
+        workflow.append(step)
+        if step.type in (WorkflowType.RUN, WorkflowType.STEP):
+            workflow.append(WorkflowStepConfig(
+                type=WorkflowType.FUNCTION,
+                func=WorkflowCheckpoint(step_index, callback),
+                description=f"checkpoint after workflow step {step_index}",
+            ))
+            num_checkpoints += 1
+    config.exp.workflow = workflow
+    return num_checkpoints
@@ -0,0 +1,93 @@
+"""
+Import-time regression check of the mbbench CLI
+
+Runs CLI invocations that must stay fast under `python -X importtime` and fails when
+- the imports of an invocation take longer than the budget, or
+- an invocation imports one of the heavy dependencies (agentsociety, sqlalchemy, scipy, ...),
+  which the commands import only when they run
+
+Usage:
+    python scripts/check_import_time.py [--budget-ms 150] [--repeats 5]
+"""
+import argparse
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+SCENARIOS: Dict[str, List[str]] = {
+    "import": [],
+    "mbbench --help": ["--help"],
+    "mbbench list-tasks": ["list-tasks"],
+    "mbbench leaderboard --help": ["leaderboard", "--help"],
+}
+"""Invocation name -> CLI arguments; `import` only imports the CLI entry point"""
+
+HEAVY_MODULES = ("agentsociety", "sqlalchemy", "scipy", "numpy", "pyarrow", "git", "requests")
+"""Top-level packages that must not be imported by the scenarios"""
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(args: List[str], home_dir: str) -> Tuple[float, Dict[str, int], List[str]]:
+    """
+    Run one invocation under `-X importtime`
+
+    Args:
+        args (List[str]): CLI arguments, empty to only import the entry point
+        home_dir (str): Value of --home-dir, the CLI creates it
+
+    Returns:
+        tuple: (total import time in ms, cumulative time in us by top-level module, all imported modules)
+    """
+    code = "import mobisimbench.cli.main"
+    if args:
+        code += f"; mobisimbench.cli.main.cli({['--home-dir', home_dir] + args!r}, standalone_mode=False)"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, cwd=home_dir
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{args} failed:\n{completed.stderr[-2000:]}")
+    top_level: Dict[str, int] = {}
+    modules: List[str] = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, module = match.groups()
+        modules.append(module)
+        if len(indent) == 1:
+            top_level[module] = int(cumulative)
+    # the interpreter's own startup is the same for every program
+    startup = sum(us for module, us in top_level.items() if module in ("site", "encodings", "_frozen_importlib_external"))
+    total = sum(top_level.values()) - startup
+    return total / 1000, top_level, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Import time budget of each invocation")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs of each invocation, the fastest one is kept")
+    options = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as home_dir:
+        for name, args in SCENARIOS.items():
+            runs = [measure(args, home_dir) for _ in range(options.repeats)]
+            total, top_level, modules = min(runs, key=lambda run: run[0])
+            heavy = sorted({module.split(".")[0] for module in modules} & set(HEAVY_MODULES))
+            ok = total <= options.budget_ms and not heavy
+            failed |= not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name:<28} {total:7.1f} ms (budget {options.budget_ms:.0f} ms)")
+            if heavy:
+                print(f"     imports {', '.join(heavy)}")
+            if not ok:
+                slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:10]
+                for module, us in slowest:
+                    print(f"     {us / 1000:7.1f} ms  {module}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())